@@ -7,72 +7,83 @@ and primitive components that form the basis of our application.
 
 This module contains utility functions for file path handling, input validation,
 type detection, and error handling.
+
+Names are resolved lazily (PEP 562): a submodule is only imported the first
+time one of its names is accessed, so callers that only need path utilities
+do not pay for importing the validation chain.
 """
 
-# Import and expose key utility functions
-from kb_for_prompt.atoms.error_utils import (
-    KbForPromptError,
-    ValidationError,
-    ConversionError,
-    FileIOError,
-    format_error_message,
-    create_error_details
-)
-
-from kb_for_prompt.atoms.path_utils import (
-    resolve_path,
-    create_file_url,
-    ensure_directory_exists,
-    generate_output_filename,
-    is_same_file
-)
-
-from kb_for_prompt.atoms.type_detector import (
-    detect_input_type,
-    detect_file_type,
-    get_supported_extensions,
-    is_url,
-    is_file_path,
-    is_supported_file_type
-)
-
-from kb_for_prompt.atoms.input_validator import (
-    validate_url,
-    validate_file_path,
-    validate_file_type,
-    validate_directory_path,
-    validate_input_item
-)
+import importlib
+from typing import Any
 
-# For convenience, expose all functions in the public API
-__all__ = [
+# Map each public name to the submodule that defines it
+_LAZY_IMPORTS = {
     # Error utilities
-    'KbForPromptError',
-    'ValidationError',
-    'ConversionError',
-    'FileIOError',
-    'format_error_message',
-    'create_error_details',
-    
+    'KbForPromptError': 'kb_for_prompt.atoms.error_utils',
+    'ValidationError': 'kb_for_prompt.atoms.error_utils',
+    'ConversionError': 'kb_for_prompt.atoms.error_utils',
+    'FileIOError': 'kb_for_prompt.atoms.error_utils',
+    'format_error_message': 'kb_for_prompt.atoms.error_utils',
+    'create_error_details': 'kb_for_prompt.atoms.error_utils',
+    'is_retryable_error': 'kb_for_prompt.atoms.error_utils',
+
     # Path utilities
-    'resolve_path',
-    'create_file_url',
-    'ensure_directory_exists',
-    'generate_output_filename',
-    'is_same_file',
-    
+    'resolve_path': 'kb_for_prompt.atoms.path_utils',
+    'create_file_url': 'kb_for_prompt.atoms.path_utils',
+    'ensure_directory_exists': 'kb_for_prompt.atoms.path_utils',
+    'generate_output_filename': 'kb_for_prompt.atoms.path_utils',
+    'is_same_file': 'kb_for_prompt.atoms.path_utils',
+    'clear_path_caches': 'kb_for_prompt.atoms.path_utils',
+
     # Type detection
-    'detect_input_type',
-    'detect_file_type',
-    'get_supported_extensions',
-    'is_url',
-    'is_file_path',
-    'is_supported_file_type',
-    
+    'SUPPORTED_EXTENSIONS': 'kb_for_prompt.atoms.type_detector',
+    'SUPPORTED_EXTENSIONS_SET': 'kb_for_prompt.atoms.type_detector',
+    'detect_input_type': 'kb_for_prompt.atoms.type_detector',
+    'detect_file_type': 'kb_for_prompt.atoms.type_detector',
+    'detect_file_type_by_content': 'kb_for_prompt.atoms.type_detector',
+    'get_supported_extensions': 'kb_for_prompt.atoms.type_detector',
+    'is_url': 'kb_for_prompt.atoms.type_detector',
+    'is_file_path': 'kb_for_prompt.atoms.type_detector',
+    'is_supported_file_type': 'kb_for_prompt.atoms.type_detector',
+
     # Input validation
-    'validate_url',
-    'validate_file_path',
-    'validate_file_type',
-    'validate_directory_path',
-    'validate_input_item'
-]
\ No newline at end of file
+    'validate_url': 'kb_for_prompt.atoms.input_validator',
+    'validate_file_path': 'kb_for_prompt.atoms.input_validator',
+    'validate_file_type': 'kb_for_prompt.atoms.input_validator',
+    'validate_directory_path': 'kb_for_prompt.atoms.input_validator',
+    'validate_input_item': 'kb_for_prompt.atoms.input_validator',
+    'validate_input_items': 'kb_for_prompt.atoms.input_validator',
+    'clear_url_cache': 'kb_for_prompt.atoms.input_validator',
+}
+
+# For convenience, expose all functions in the public API
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the submodule defining a public name on first access.
+
+    Args:
+        name: The attribute being looked up on the package
+
+    Returns:
+        The object exported under that name
+
+    Raises:
+        AttributeError: If the name is not part of the public API
+    """
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """Include the lazily loaded public names in dir() output."""
+    return sorted(set(globals()) | set(__all__))
@@ -8,6 +8,13 @@ for consistent error reporting across the application.
 from typing import Optional, Any, Dict
 
 
+# HTTP status codes that will not change if the same request is retried
+PERMANENT_HTTP_STATUSES = frozenset({400, 401, 403, 404, 410, 422})
+
+# Docling conversion statuses that indicate the parser rejected the input
+_PERMANENT_CONVERSION_STATUSES = frozenset({"failure", "skipped"})
+
+
 class KbForPromptError(Exception):
     """Base exception class for all kb-for-prompt errors."""
     
@@ -20,7 +27,8 @@ class KbForPromptError(Exception):
             details: Optional dictionary with additional error details
         """
         self.message = message
-        self.details = details or {}
+        # Keep a caller-supplied dict (even an empty one) rather than replacing it
+        self.details = details if details is not None else {}
         super().__init__(message)
 
 
@@ -144,4 +152,38 @@ def create_error_details(
     if additional_info:
         details.update(additional_info)
     
-    return details
\ No newline at end of file
+    return details
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Decide whether retrying the operation that raised an error could succeed.
+    
+    Validation failures, permanent HTTP statuses (e.g. 404, 410) and hard docling
+    parser failures are not retryable; anything else is assumed to be transient.
+    The HTTP status is read from ``error.response.status_code`` or, for wrapped
+    errors, from a ``status_code`` entry in ``error.details``.
+    
+    Args:
+        error: The exception raised by the failed attempt
+    
+    Returns:
+        True if another attempt may succeed, False otherwise
+    """
+    if isinstance(error, ValidationError):
+        return False
+    
+    details = getattr(error, "details", None) or {}
+    
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None) or details.get("status_code")
+    if status_code in PERMANENT_HTTP_STATUSES:
+        return False
+    
+    if isinstance(error, ConversionError) and "status" in details:
+        # Accept both "failure" and "ConversionStatus.FAILURE" spellings
+        status = str(details["status"]).rsplit(".", 1)[-1].lower()
+        if status in _PERMANENT_CONVERSION_STATUSES:
+            return False
+    
+    return True
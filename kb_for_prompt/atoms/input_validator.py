@@ -5,17 +5,73 @@ This module provides functions to validate URLs, file paths,
 and file types based on extensions.
 """
 
+import errno
 import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union, Optional, Tuple, List
-from urllib.parse import urlparse
-import requests
-import re
+from typing import TYPE_CHECKING, Any, Collection, Dict, Union, Optional, Tuple, List, NamedTuple
+from urllib.parse import urlparse, ParseResult
 
 from kb_for_prompt.atoms.error_utils import ValidationError
-from kb_for_prompt.atoms.type_detector import detect_file_type, is_url, is_file_path
+from kb_for_prompt.atoms.type_detector import (
+    SUPPORTED_EXTENSIONS,
+    SUPPORTED_EXTENSIONS_SET,
+    detect_file_type,
+    is_url,
+    _detect_input_type_parsed
+)
 from kb_for_prompt.atoms.path_utils import resolve_path
 
+# requests is imported lazily where connection checks happen, since it is slow to
+# import and most validation never touches the network
+if TYPE_CHECKING:
+    import requests
+
+# How long (in seconds) a URL connection check result is reused
+URL_CHECK_CACHE_TTL = 300
+
+# Number of file paths validated per task in validate_input_items
+FILE_VALIDATION_CHUNK_SIZE = 64
+
+# Connection check results keyed by URL: (monotonic timestamp, HTTP status code)
+_url_head_cache: Dict[str, Tuple[float, int]] = {}
+
+# Upper bound on concurrent validation tasks in validate_input_items
+MAX_VALIDATION_WORKERS = 32
+
+# Shared session so repeated checks against the same host reuse connections
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+
+class _ClassifiedInput(NamedTuple):
+    """An input item classified once, with its parsed form for reuse by validators."""
+    
+    kind: str
+    parsed: Optional[ParseResult]
+    path_obj: Optional[Path]
+
+
+def _classify(input_item: str) -> _ClassifiedInput:
+    """
+    Classify an input item as a URL or file path, parsing it only once.
+    
+    Args:
+        input_item: The input item to classify
+    
+    Returns:
+        A _ClassifiedInput carrying the parsed URL (for URLs) or the
+        resolved Path (for files)
+    """
+    input_type, parsed = _detect_input_type_parsed(input_item)
+    if input_type == "url":
+        # Scheme-less URLs (e.g. "example.com") were classified without parsing
+        return _ClassifiedInput("url", parsed or urlparse(input_item), None)
+    return _ClassifiedInput("file", None, resolve_path(input_item))
+
 
 def validate_url(url: str, check_connection: bool = False, timeout: int = 5) -> bool:
     """
@@ -48,54 +104,176 @@ def validate_url(url: str, check_connection: bool = False, timeout: int = 5) ->
         )
     
     # Parse the URL to check its components
-    parsed = urlparse(url)
+    return _validate_url(url, urlparse(url), check_connection, timeout)
+
+
+def _validate_url(url: str, parsed: ParseResult, check_connection: bool = False, timeout: int = 5) -> bool:
+    """
+    Validate the components of an already-parsed URL.
+    
+    Args:
+        url: The original URL string
+        parsed: The result of parsing the URL with urlparse
+        check_connection: If True, attempts to connect to the URL to verify it's accessible
+        timeout: Timeout in seconds for connection check (only used if check_connection is True)
+    
+    Returns:
+        True if the URL is valid
+    
+    Raises:
+        ValidationError: If the URL is invalid
+    """
+    ok, error_info = _try_validate_url(url, parsed, check_connection, timeout)
+    if not ok:
+        raise ValidationError(**error_info)
+    return True
+
+
+def _try_validate_url(
+    url: str,
+    parsed: ParseResult,
+    check_connection: bool = False,
+    timeout: int = 5
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Validate the components of an already-parsed URL without raising.
+    
+    Args:
+        url: The original URL string
+        parsed: The result of parsing the URL with urlparse
+        check_connection: If True, attempts to connect to the URL to verify it's accessible
+        timeout: Timeout in seconds for connection check (only used if check_connection is True)
     
+    Returns:
+        A tuple of (ok, error_info) where error_info holds the ValidationError
+        keyword arguments when ok is False, and None otherwise
+    """
     # file:// URLs are a special case
     if parsed.scheme == "file":
         # For file URLs, we don't need to check connection
         # Just make sure it has a path component
         if not parsed.path:
-            raise ValidationError(
-                message="Invalid file URL: missing path component",
-                input_value=url,
-                validation_type="file_url"
-            )
-        return True
+            return False, {
+                "message": "Invalid file URL: missing path component",
+                "input_value": url,
+                "validation_type": "file_url"
+            }
+        return True, None
     
     # For http/https URLs, ensure scheme and netloc are present
     if parsed.scheme not in ("http", "https"):
-        raise ValidationError(
-            message=f"Unsupported URL scheme: {parsed.scheme}",
-            input_value=url,
-            validation_type="url_scheme"
-        )
+        return False, {
+            "message": f"Unsupported URL scheme: {parsed.scheme}",
+            "input_value": url,
+            "validation_type": "url_scheme"
+        }
     
     if not parsed.netloc:
-        raise ValidationError(
-            message="Invalid URL: missing domain",
-            input_value=url,
-            validation_type="url"
-        )
+        return False, {
+            "message": "Invalid URL: missing domain",
+            "input_value": url,
+            "validation_type": "url"
+        }
     
     # Optional: check if the URL is accessible
     if check_connection:
-        try:
-            response = requests.head(url, timeout=timeout, allow_redirects=True)
-            if response.status_code >= 400:
-                raise ValidationError(
-                    message=f"URL returned error status: {response.status_code}",
-                    input_value=url,
-                    validation_type="url_connection",
-                    details={"status_code": response.status_code}
-                )
-        except requests.RequestException as e:
-            raise ValidationError(
-                message=f"Failed to connect to URL: {str(e)}",
-                input_value=url,
-                validation_type="url_connection"
-            )
+        status_code, error_info = _check_url_status(url, timeout)
+        if error_info is not None:
+            return False, error_info
+        
+        if status_code >= 400:
+            return False, {
+                "message": f"URL returned error status: {status_code}",
+                "input_value": url,
+                "validation_type": "url_connection",
+                "details": {"status_code": status_code}
+            }
+    
+    return True, None
+
+
+def _get_session() -> "requests.Session":
+    """
+    Get the shared requests session, creating it on first use.
     
-    return True
+    The adapter keeps as many connections per host as validate_input_items
+    runs concurrent checks, so parallel HEAD requests to one host all return
+    their connections to the pool instead of discarding them.
+    
+    Returns:
+        The process-wide requests.Session used for connection checks
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=MAX_VALIDATION_WORKERS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _check_url_status(url: str, timeout: int) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """
+    Issue a HEAD request for a URL, reusing a recent result if one is cached.
+    
+    Args:
+        url: The URL to check
+        timeout: Timeout in seconds for the request
+    
+    Returns:
+        A tuple of (status_code, error_info); error_info holds the
+        ValidationError keyword arguments if the connection failed
+    """
+    now = time.monotonic()
+    cached = _url_head_cache.get(url)
+    if cached is not None and now - cached[0] < URL_CHECK_CACHE_TTL:
+        return cached[1], None
+    
+    import requests
+    
+    try:
+        response = _get_session().head(url, timeout=timeout, allow_redirects=True)
+    except requests.RequestException as e:
+        return None, {
+            "message": f"Failed to connect to URL: {str(e)}",
+            "input_value": url,
+            "validation_type": "url_connection"
+        }
+    
+    _url_head_cache[url] = (now, response.status_code)
+    return response.status_code, None
+
+
+def clear_url_cache() -> None:
+    """Clear the cached URL connection check results."""
+    _url_head_cache.clear()
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """
+    Stat a path, following symlinks, treating missing paths as None.
+    
+    Args:
+        path: The path to stat
+    
+    Returns:
+        The os.stat_result for the path, or None if it does not exist
+    """
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError as e:
+        # Symlink loops and similar errors mean the path cannot be used
+        if e.errno == errno.ELOOP:
+            return None
+        raise
 
 
 def validate_file_path(file_path: Union[str, Path], must_exist: bool = True) -> Path:
@@ -128,42 +306,80 @@ def validate_file_path(file_path: Union[str, Path], must_exist: bool = True) ->
         )
     
     # Resolve the path
-    resolved_path = resolve_path(file_path)
+    return _validate_file_path(resolve_path(file_path), must_exist)
+
+
+def _validate_file_path(resolved_path: Path, must_exist: bool = True) -> Path:
+    """
+    Validate an already-resolved file path.
+    
+    Args:
+        resolved_path: The resolved Path object to validate
+        must_exist: If True, checks that the file exists and is readable
     
+    Returns:
+        The resolved Path object for the file
+    
+    Raises:
+        ValidationError: If the file path is invalid
+    """
+    ok, error_info = _try_validate_file_path(resolved_path, must_exist)
+    if not ok:
+        raise ValidationError(**error_info)
+    return resolved_path
+
+
+def _try_validate_file_path(
+    resolved_path: Path,
+    must_exist: bool = True
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Validate an already-resolved file path without raising.
+    
+    Args:
+        resolved_path: The resolved Path object to validate
+        must_exist: If True, checks that the file exists and is readable
+    
+    Returns:
+        A tuple of (ok, error_info) where error_info holds the ValidationError
+        keyword arguments when ok is False, and None otherwise
+    """
     # If must_exist is True, check that the file exists and is readable
     if must_exist:
-        if not resolved_path.exists():
-            raise ValidationError(
-                message="File does not exist",
-                input_value=str(resolved_path),
-                validation_type="file_existence"
-            )
+        # A single stat call answers both the existence and the type checks
+        path_stat = _stat_or_none(resolved_path)
+        if path_stat is None:
+            return False, {
+                "message": "File does not exist",
+                "input_value": str(resolved_path),
+                "validation_type": "file_existence"
+            }
         
-        if not resolved_path.is_file():
-            raise ValidationError(
-                message="Path exists but is not a file",
-                input_value=str(resolved_path),
-                validation_type="file_type"
-            )
+        if not stat.S_ISREG(path_stat.st_mode):
+            return False, {
+                "message": "Path exists but is not a file",
+                "input_value": str(resolved_path),
+                "validation_type": "file_type"
+            }
         
         if not os.access(resolved_path, os.R_OK):
-            raise ValidationError(
-                message="File exists but is not readable",
-                input_value=str(resolved_path),
-                validation_type="file_permissions"
-            )
+            return False, {
+                "message": "File exists but is not readable",
+                "input_value": str(resolved_path),
+                "validation_type": "file_permissions"
+            }
     
-    return resolved_path
+    return True, None
 
 
-def validate_file_type(file_path: Union[str, Path], allowed_types: Optional[List[str]] = None) -> str:
+def validate_file_type(file_path: Union[str, Path], allowed_types: Optional[Collection[str]] = None) -> str:
     """
     Validate that a file is of an allowed type based on its extension.
     
     Args:
         file_path: The file path to validate
-        allowed_types: List of allowed file types (extensions without the dot).
-                       If None, defaults to ["doc", "docx", "pdf"]
+        allowed_types: Collection of allowed file types (extensions without the dot).
+                       If None, defaults to the supported types ("doc", "docx", "pdf")
     
     Returns:
         The detected file type
@@ -178,14 +394,16 @@ def validate_file_type(file_path: Union[str, Path], allowed_types: Optional[List
         >>> validate_file_type("image.jpg", allowed_types=["jpg", "png"])
         'jpg'
     """
+    # Check membership against the shared set, but report the ordered tuple
     if allowed_types is None:
-        allowed_types = ["doc", "docx", "pdf"]
-    
-    # Resolve and validate file path
-    path = Path(file_path)
+        allowed_lookup = SUPPORTED_EXTENSIONS_SET
+        allowed_types = SUPPORTED_EXTENSIONS
+    else:
+        allowed_lookup = allowed_types
     
-    # Get file extension without the dot
-    extension = path.suffix.lower().lstrip('.')
+    # Get file extension without the dot, splitting the string instead of building a Path
+    _, ext = os.path.splitext(os.fspath(file_path))
+    extension = ext[1:].lower()
     
     if not extension:
         raise ValidationError(
@@ -194,7 +412,7 @@ def validate_file_type(file_path: Union[str, Path], allowed_types: Optional[List
             validation_type="file_extension"
         )
     
-    if extension not in allowed_types:
+    if extension not in allowed_lookup:
         raise ValidationError(
             message=f"Unsupported file type: .{extension}. Allowed types: {', '.join(allowed_types)}",
             input_value=str(file_path),
@@ -239,14 +457,16 @@ def validate_directory_path(directory_path: Union[str, Path], must_exist: bool =
     
     # If must_exist is True, check that the directory exists
     if must_exist:
-        if not resolved_path.exists():
+        # A single stat call answers both the existence and the type checks
+        path_stat = _stat_or_none(resolved_path)
+        if path_stat is None:
             raise ValidationError(
                 message="Directory does not exist",
                 input_value=str(resolved_path),
                 validation_type="directory_existence"
             )
         
-        if not resolved_path.is_dir():
+        if not stat.S_ISDIR(path_stat.st_mode):
             raise ValidationError(
                 message="Path exists but is not a directory",
                 input_value=str(resolved_path),
@@ -263,12 +483,13 @@ def validate_directory_path(directory_path: Union[str, Path], must_exist: bool =
     return resolved_path
 
 
-def validate_input_item(input_item: str) -> Tuple[str, str]:
+def validate_input_item(input_item: str, check_connection: bool = False) -> Tuple[str, str]:
     """
     Validate an input item as either a URL or a file path.
     
     Args:
         input_item: The input item to validate
+        check_connection: If True, verifies that URL inputs are accessible
     
     Returns:
         A tuple of (type, validated_item) where type is either "url" or "file"
@@ -283,22 +504,141 @@ def validate_input_item(input_item: str) -> Tuple[str, str]:
         >>> validate_input_item("/path/to/document.pdf")
         ('file', '/path/to/document.pdf')
     """
-    # Detect input type
-    input_type = "url" if is_url(input_item) else "file"
+    # Detect input type once and reuse the parsed form in the validators
+    return _validate_classified(input_item, _classify(input_item), check_connection)
+
+
+def _validate_classified(
+    input_item: str,
+    classified: _ClassifiedInput,
+    check_connection: bool = False
+) -> Tuple[str, str]:
+    """
+    Validate an input item that has already been classified.
+    
+    Args:
+        input_item: The original input item
+        classified: The classification produced by _classify
+        check_connection: If True, verifies that URL inputs are accessible
     
+    Returns:
+        A tuple of (type, validated_item) where type is either "url" or "file"
+    
+    Raises:
+        ValidationError: If the input item is invalid
+    """
+    ok, result, _ = _try_validate_classified(input_item, classified, check_connection)
+    if not ok:
+        raise ValidationError(**result)
+    return (classified.kind, result)
+
+
+def _try_validate_classified(
+    input_item: str,
+    classified: _ClassifiedInput,
+    check_connection: bool = False
+) -> Tuple[bool, Union[str, Dict[str, Any]], str]:
+    """
+    Validate an input item that has already been classified, without raising.
+    
+    Invalid items are expected in batch input lists, so this reports failures
+    as data instead of paying for exception construction and unwinding.
+    
+    Args:
+        input_item: The original input item
+        classified: The classification produced by _classify
+        check_connection: If True, verifies that URL inputs are accessible
+    
+    Returns:
+        A tuple of (ok, result, input_type) where result is the validated item
+        when ok is True, and the ValidationError keyword arguments otherwise.
+        input_type is "url", the detected file type of a valid file, or "file"
+        for a file that failed validation.
+    """
     # Validate based on type
-    if input_type == "url":
-        validate_url(input_item)
-        return ("url", input_item)
-    else:
-        file_path = validate_file_path(input_item)
-        file_type = detect_file_type(file_path)
-        
-        if file_type is None:
-            raise ValidationError(
-                message="Unsupported file type. Supported types: doc, docx, pdf",
-                input_value=str(file_path),
-                validation_type="file_type"
-            )
-        
-        return ("file", str(file_path))
\ No newline at end of file
+    if classified.kind == "url":
+        ok, error_info = _try_validate_url(input_item, classified.parsed, check_connection)
+        return (True, input_item, "url") if ok else (False, error_info, "url")
+    
+    file_path = classified.path_obj
+    ok, error_info = _try_validate_file_path(file_path)
+    if not ok:
+        return False, error_info, "file"
+    
+    file_type = detect_file_type(file_path)
+    if file_type is None:
+        return False, {
+            "message": f"Unsupported file type. Supported types: {', '.join(SUPPORTED_EXTENSIONS)}",
+            "input_value": str(file_path),
+            "validation_type": "file_type"
+        }, "file"
+    
+    return True, str(file_path), file_type
+
+
+def validate_input_items(
+    input_items: List[str],
+    check_connection: bool = False,
+    max_workers: Optional[int] = None
+) -> List[Tuple[str, Union[str, ValidationError]]]:
+    """
+    Validate a list of input items, overlapping their filesystem and network checks.
+    
+    Items are classified in a single pass. File paths are validated in chunks
+    of FILE_VALIDATION_CHUNK_SIZE so that per-task overhead is amortized over
+    many stat calls, and when check_connection is True each URL check runs as
+    its own task so network latency overlaps. Small inputs that produce a
+    single task are validated on the calling thread.
+    
+    Args:
+        input_items: The input items to validate
+        check_connection: If True, verifies that URL inputs are accessible
+        max_workers: Maximum number of concurrent validation tasks.
+                     If None, uses one worker per task, up to MAX_VALIDATION_WORKERS.
+    
+    Returns:
+        A list with one (type, result) tuple per input item, in input order,
+        where result is either the validated item or a ValidationError
+        describing why it is invalid, and type is "url", the detected file
+        type ("pdf", "doc" or "docx") of a valid file, or "file" for a file
+        that failed validation
+    
+    Example:
+        >>> validate_input_items(["https://example.com", "/path/to/document.pdf"])
+        [('url', 'https://example.com'), ('pdf', '/path/to/document.pdf')]
+    """
+    classified_items = [_classify(item) for item in input_items]
+    results: List[Tuple[str, Union[str, ValidationError]]] = [None] * len(input_items)
+    
+    def validate_indices(indices: List[int]) -> None:
+        for index in indices:
+            classified = classified_items[index]
+            ok, result, input_type = _try_validate_classified(input_items[index], classified, check_connection)
+            # Failures are reported as ValidationError instances that are never raised
+            results[index] = (input_type, result if ok else ValidationError(**result))
+    
+    # URLs without a connection check need no I/O, so validate them right away
+    tasks: List[List[int]] = []
+    file_indices: List[int] = []
+    for index, classified in enumerate(classified_items):
+        if classified.kind == "file":
+            file_indices.append(index)
+        elif check_connection:
+            tasks.append([index])
+        else:
+            validate_indices([index])
+    
+    tasks.extend(
+        file_indices[start:start + FILE_VALIDATION_CHUNK_SIZE]
+        for start in range(0, len(file_indices), FILE_VALIDATION_CHUNK_SIZE)
+    )
+    
+    if len(tasks) == 1:
+        validate_indices(tasks[0])
+    elif tasks:
+        workers = max_workers or min(MAX_VALIDATION_WORKERS, len(tasks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(validate_indices, task) for task in tasks]:
+                future.result()
+    
+    return results
@@ -7,12 +7,30 @@ managing output directories.
 """
 
 import os
+import re
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional
-from urllib.parse import urlparse, urljoin
+from typing import Dict, Set, Union, Optional
+from urllib.parse import urlparse
 
 from kb_for_prompt.atoms.error_utils import FileIOError
 
+# Runs of characters (including underscores) collapsed to a single underscore in
+# generated output filenames; Unicode letters and digits are kept
+_SANITIZE_RE = re.compile(r"[\W_]+")
+# Common web page extensions stripped from URL-derived filenames
+_URL_EXT_RE = re.compile(r"\.(?:html?|php)$", re.IGNORECASE)
+
+# Output filenames already taken per output directory, seeded from one directory
+# listing and extended as names are handed out (guarded for worker threads);
+# cleared by clear_path_caches, which batch callers do at the start of each batch
+_reserved_names: Dict[str, Set[str]] = {}
+_reserved_names_lock = threading.Lock()
+
+# Directories already created (or confirmed to exist) during this process
+_ensured_dirs: Set[str] = set()
+
 
 def resolve_path(path: Union[str, Path], base_path: Optional[Union[str, Path]] = None) -> Path:
     """
@@ -32,16 +50,66 @@ def resolve_path(path: Union[str, Path], base_path: Optional[Union[str, Path]] =
         >>> resolve_path("docs/file.txt", "/base/path")
         PosixPath('/base/path/docs/file.txt')
     """
-    if isinstance(path, str):
-        path = Path(path)
+    path_str = os.fspath(path)
+    
+    # Relative paths resolve against base_path or the current working directory;
+    # absolute paths ignore the base, so avoid querying the cwd for them
+    if os.path.isabs(path_str):
+        base_str = ""
+    else:
+        base_str = os.fspath(base_path) if base_path else str(Path.cwd())
+    
+    return Path(_resolve_cached(path_str, base_str))
+
+
+@lru_cache(maxsize=1024)
+def _resolve_cached(path_str: str, base_str: str) -> str:
+    """
+    Join a path onto its base, memoized on the string arguments.
+    
+    Args:
+        path_str: The path to resolve (absolute or relative)
+        base_str: The base path to resolve against (ignored for absolute paths)
+    
+    Returns:
+        The resolved path as a string
+    """
+    path = Path(path_str)
     
     # If the path is already absolute, just return it
     if path.is_absolute():
-        return path
+        return str(path)
+    
+    return str(Path(base_str) / path)
+
+
+@lru_cache(maxsize=1024)
+def _canonical(path_str: str) -> str:
+    """
+    Return the canonical (symlink-free, absolute) form of a path, memoized.
+    
+    Args:
+        path_str: The path to canonicalize
+    
+    Returns:
+        The result of Path.resolve() as a string
+    """
+    return str(Path(path_str).resolve())
+
+
+def clear_path_caches() -> None:
+    """
+    Clear the memoized path resolution results, reserved output filenames
+    and the record of directories already ensured to exist.
     
-    # Resolve against base_path or current working directory
-    base = Path(base_path) if base_path else Path.cwd()
-    return base / path
+    The caches assume the filesystem layout does not change during a run;
+    callers that create, move, delete or re-link paths mid-run should call this.
+    """
+    _resolve_cached.cache_clear()
+    _canonical.cache_clear()
+    with _reserved_names_lock:
+        _reserved_names.clear()
+    _ensured_dirs.clear()
 
 
 def create_file_url(file_path: Union[str, Path]) -> str:
@@ -57,27 +125,12 @@ def create_file_url(file_path: Union[str, Path]) -> str:
     Example:
         >>> create_file_url("/path/to/file.txt")
         'file:///path/to/file.txt'
+        
+        >>> create_file_url("/path/to/my file.txt")
+        'file:///path/to/my%20file.txt'
     """
-    # Ensure we have an absolute path
-    path = resolve_path(file_path)
-    
-    # Convert to a valid file URL
-    try:
-        path_str = str(path.absolute())
-    except AttributeError:
-        # Handle the case where path might be a MagicMock in tests
-        path_str = str(path)
-    
-    # Handle Windows paths by adding an extra slash for the drive letter
-    if os.name == 'nt' and len(path_str) >= 3 and path_str[1:3] == ':\\':
-        return "file:///" + path_str.replace('\\', '/')
-    
-    # For non-Windows paths, ensure three slashes are used
-    # If path_str already starts with a slash, we don't need to add it
-    if path_str.startswith('/'):
-        return f"file:///{path_str[1:]}"
-    else:
-        return f"file:///{path_str}"
+    # Path.as_uri handles drive letters and percent-encoding on every platform
+    return resolve_path(file_path).absolute().as_uri()
 
 
 def ensure_directory_exists(directory: Union[str, Path]) -> Path:
@@ -99,8 +152,14 @@ def ensure_directory_exists(directory: Union[str, Path]) -> Path:
     """
     dir_path = resolve_path(directory)
     
+    # Skip the mkdir syscall for directories already ensured in this process
+    dir_key = str(dir_path)
+    if dir_key in _ensured_dirs:
+        return dir_path
+    
     try:
         dir_path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(dir_key)
         return dir_path
     except Exception as e:
         raise FileIOError(
@@ -136,24 +195,16 @@ def generate_output_filename(input_path: str, output_dir: Union[str, Path], suff
     parsed = urlparse(input_path)
     
     if parsed.scheme and parsed.netloc:  # This is a URL
-        # Extract domain and path parts of the URL
-        domain = parsed.netloc.replace('.', '_')
-        path = parsed.path.replace('/', '_')
-        
-        # Clean up filename components
-        filename = f"{domain}{path}".rstrip('_')
-        
-        # Remove common extensions
-        if filename.endswith(('.html', '.htm', '.php')):
-            filename = filename.rsplit('.', 1)[0]
+        # Use the domain and path of the URL without common page extensions;
+        # dots and slashes are replaced along with other special characters below
+        filename = _URL_EXT_RE.sub("", f"{parsed.netloc}{parsed.path}".rstrip('/'))
     else:  # This is a file path
         # Use the file name without its extension
         path_obj = Path(input_path)
         filename = path_obj.stem
     
     # Clean up any remaining special characters
-    filename = "".join(c if c.isalnum() or c == '_' else '_' for c in filename)
-    filename = filename.strip('_')
+    filename = _SANITIZE_RE.sub('_', filename).strip('_')
     
     # Ensure the filename isn't too long
     if len(filename) > 100:
@@ -167,16 +218,26 @@ def generate_output_filename(input_path: str, output_dir: Union[str, Path], suff
     if not suffix.startswith('.'):
         suffix = f".{suffix}"
     
-    # Create the final path
-    output_path = out_dir / f"{filename}{suffix}"
-    
-    # Handle file name conflicts by adding a numeric suffix
-    counter = 1
-    while output_path.exists():
-        output_path = out_dir / f"{filename}_{counter}{suffix}"
-        counter += 1
+    # Handle file name conflicts by adding a numeric suffix. Names already seen in
+    # the directory (or handed out since the caches were last cleared) are skipped
+    # in memory, so only the final candidate needs a stat to catch files created since.
+    with _reserved_names_lock:
+        reserved = _reserved_names.get(str(out_dir))
+        if reserved is None:
+            with os.scandir(out_dir) as entries:
+                reserved = {entry.name for entry in entries}
+            _reserved_names[str(out_dir)] = reserved
+        
+        candidate = f"{filename}{suffix}"
+        counter = 0
+        while candidate in reserved or (out_dir / candidate).exists():
+            reserved.add(candidate)
+            counter += 1
+            candidate = f"{filename}_{counter}{suffix}"
+        
+        reserved.add(candidate)
     
-    return output_path
+    return out_dir / candidate
 
 
 def is_same_file(path1: Union[str, Path], path2: Union[str, Path]) -> bool:
@@ -195,6 +256,6 @@ def is_same_file(path1: Union[str, Path], path2: Union[str, Path]) -> bool:
         True
     """
     try:
-        return Path(path1).resolve() == Path(path2).resolve()
+        return _canonical(os.fspath(path1)) == _canonical(os.fspath(path2))
     except Exception:
         return False
\ No newline at end of file
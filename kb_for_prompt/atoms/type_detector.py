@@ -6,11 +6,36 @@ and file types based on extensions.
 """
 
 import os
+import zipfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional, Tuple, Literal
-from urllib.parse import urlparse
+from typing import FrozenSet, Union, Optional, Tuple, Literal
+from urllib.parse import urlparse, ParseResult
 import re
 
+# URL patterns for inputs provided without a scheme, compiled once at import
+# Domain with TLD, no scheme (e.g. "example.com/path")
+_DOMAIN_RE = re.compile(r"^([a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}(/.*)?$")
+# IP address with optional port and path (e.g. "192.168.1.1:8080/path")
+_IP_RE = re.compile(r"^(\d{1,3}\.){3}\d{1,3}(:\d+)?(/.*)?$")
+
+# Supported file extensions (without the dot), in display order and as a set;
+# shared with the input validators
+SUPPORTED_EXTENSIONS: Tuple[str, ...] = ("doc", "docx", "pdf")
+SUPPORTED_EXTENSIONS_SET: FrozenSet[str] = frozenset(SUPPORTED_EXTENSIONS)
+# Maps each supported extension to its constant string, so detected types are the
+# shared (compiler-interned) objects rather than fresh slices of the input path
+_CANONICAL_EXTENSIONS = {extension: extension for extension in SUPPORTED_EXTENSIONS}
+
+# Number of leading bytes read when sniffing a file's type from its content
+_HEADER_SIZE = 64
+# Magic bytes for the supported formats
+_PDF_MAGIC = b"%PDF-"
+_OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # Legacy .doc (OLE2 compound file)
+_ZIP_MAGIC = b"PK\x03\x04"  # .docx (Office Open XML zip package)
+# Offset of the first entry's name in a zip local file header
+_ZIP_NAME_OFFSET = 30
+
 
 def detect_input_type(input_string: str) -> Literal["url", "file"]:
     """
@@ -29,39 +54,56 @@ def detect_input_type(input_string: str) -> Literal["url", "file"]:
         >>> detect_input_type("/path/to/document.pdf")
         'file'
     """
-    parsed = urlparse(input_string)
+    return _detect_input_type_parsed(input_string)[0]
+
+
+@lru_cache(maxsize=4096)
+def _detect_input_type_parsed(input_string: str) -> Tuple[str, Optional[ParseResult]]:
+    """
+    Determine the input type, also returning the URL parse if one was made.
     
-    # If it has a scheme (http, https, etc.) and a netloc (domain), it's a URL
-    if parsed.scheme and parsed.netloc:
-        return "url"
+    Validators reuse the returned ParseResult instead of parsing the input again.
+    Results are memoized (the function is pure and ParseResult is immutable), so
+    detect_input_type, is_url and is_file_path all skip repeat work; long-running
+    processes can bound memory with _detect_input_type_parsed.cache_clear().
     
-    # file:// URLs are a special case
-    if parsed.scheme == "file":
-        return "url"
+    Args:
+        input_string: The input string to analyze
+    
+    Returns:
+        A tuple of ("url" or "file", the urlparse result or None if the input
+        was classified without parsing)
+    """
+    parsed = None
+    
+    # Only inputs containing a colon can carry a scheme, so skip parsing otherwise
+    if ":" in input_string:
+        parsed = urlparse(input_string)
+        
+        # If it has a scheme (http, https, etc.) and a netloc (domain), it's a URL
+        if parsed.scheme and parsed.netloc:
+            return "url", parsed
+        
+        # file:// URLs are a special case
+        if parsed.scheme == "file":
+            return "url", parsed
     
     # Some URLs might be provided without a scheme (e.g. "example.com")
-    # Common URL patterns to check
-    url_patterns = [
-        # Domain with TLD, no scheme
-        r"^([a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}(/.*)?$",
-        # IP address
-        r"^(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(:\d+)?(/.*)?$"
-    ]
-    
-    for pattern in url_patterns:
-        if re.match(pattern, input_string):
-            return "url"
+    if _DOMAIN_RE.match(input_string) or _IP_RE.match(input_string):
+        return "url", parsed
     
     # Otherwise, assume it's a file path
-    return "file"
+    return "file", parsed
 
 
-def detect_file_type(file_path: Union[str, Path]) -> Optional[str]:
+def detect_file_type(file_path: Union[str, Path], strict: bool = False) -> Optional[str]:
     """
     Detect the type of file based on its extension.
     
     Args:
         file_path: The path to the file
+        strict: If True, detect the type from the file's content instead of
+                trusting its extension (see detect_file_type_by_content)
     
     Returns:
         The detected file type ("doc", "docx", "pdf") or None if unsupported
@@ -76,16 +118,82 @@ def detect_file_type(file_path: Union[str, Path]) -> Optional[str]:
         >>> detect_file_type("document.txt")
         None
     """
-    if isinstance(file_path, str):
-        file_path = Path(file_path)
+    if strict:
+        return detect_file_type_by_content(file_path)
     
-    extension = file_path.suffix.lower().lstrip('.')
+    # Split the extension off the string directly rather than building a Path
+    extension = os.path.splitext(os.fspath(file_path))[1][1:].lower()
     
     # Check for supported file types
-    if extension in ("doc", "docx"):
-        return extension
-    elif extension == "pdf":
-        return extension
+    return _CANONICAL_EXTENSIONS.get(extension)
+
+
+def detect_file_type_by_content(file_path: Union[str, Path]) -> Optional[str]:
+    """
+    Detect the type of file from the magic bytes at the start of its content.
+    
+    Only the first few bytes of the file are read, so a mislabeled or corrupt
+    file can be rejected before an expensive conversion is attempted. Results
+    are cached per path, modification time and size.
+    
+    Args:
+        file_path: The path to the file
+    
+    Returns:
+        The detected file type ("doc", "docx", "pdf") or None if the content
+        does not match a supported format or the file cannot be read
+    
+    Example:
+        >>> detect_file_type_by_content("report.pdf")
+        'pdf'
+        
+        >>> detect_file_type_by_content("notes.txt")
+        None
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    
+    return _sniff_file_type(os.fspath(file_path), file_stat.st_mtime_ns, file_stat.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _sniff_file_type(path_str: str, mtime_ns: int, size: int) -> Optional[str]:
+    """
+    Match a file's header against the supported formats' magic bytes.
+    
+    Args:
+        path_str: The path to the file
+        mtime_ns: The file's modification time, part of the cache key
+        size: The file's size, part of the cache key
+    
+    Returns:
+        The detected file type or None if unsupported or unreadable
+    """
+    try:
+        with open(path_str, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+    except OSError:
+        return None
+    
+    if header.startswith(_PDF_MAGIC):
+        return "pdf"
+    
+    if header.startswith(_OLE2_MAGIC):
+        return "doc"
+    
+    if header.startswith(_ZIP_MAGIC):
+        # Word writes [Content_Types].xml as the first entry; otherwise fall back
+        # to reading the zip's central directory for the main document part
+        if header[_ZIP_NAME_OFFSET:].startswith(b"[Content_Types].xml"):
+            return "docx"
+        try:
+            with zipfile.ZipFile(path_str) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return "docx"
+        except (OSError, zipfile.BadZipFile):
+            return None
     
     return None
 
@@ -101,7 +209,7 @@ def get_supported_extensions() -> Tuple[str, ...]:
         >>> get_supported_extensions()
         ('doc', 'docx', 'pdf')
     """
-    return ("doc", "docx", "pdf")
+    return SUPPORTED_EXTENSIONS
 
 
 def is_url(input_string: str) -> bool:
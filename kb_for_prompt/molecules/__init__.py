@@ -12,7 +12,13 @@ and PDF files, transforming them into Markdown format.
 # Import conversion functions to make them accessible
 from kb_for_prompt.molecules.url_converter import convert_url_to_markdown
 from kb_for_prompt.molecules.doc_converter import convert_doc_to_markdown
-from kb_for_prompt.molecules.pdf_converter import convert_pdf_to_markdown
+from kb_for_prompt.molecules.pdf_converter import (
+    convert_pdf_to_markdown,
+    convert_pdf_to_markdown_stream,
+    convert_pdfs_to_markdown,
+    convert_many,
+)
 
 # Export public functions
-__all__ = ['convert_url_to_markdown', 'convert_doc_to_markdown', 'convert_pdf_to_markdown']
\ No newline at end of file
+__all__ = ['convert_url_to_markdown', 'convert_doc_to_markdown', 'convert_pdf_to_markdown',
+           'convert_pdf_to_markdown_stream', 'convert_pdfs_to_markdown', 'convert_many']
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+On-disk cache of converted markdown, keyed by input content.
+
+Converting a large document can take minutes, while re-ingesting the same
+files and URLs across runs is common. When the ``KBFP_CACHE_DIR`` environment
+variable names a directory, converters store their markdown there and reuse it
+for identical input:
+
+- files are keyed by the SHA-256 of their bytes plus the conversion settings
+- URLs are keyed by the URL plus the ETag or Last-Modified header from a HEAD
+  request; responses without either header are never cached
+
+Example:
+    ```python
+    from kb_for_prompt.molecules.conversion_cache import (
+        file_cache_key, load_cached_markdown, store_cached_markdown
+    )
+    
+    key = file_cache_key("/path/to/document.pdf", "pypdfium")
+    markdown_content = load_cached_markdown(key)
+    if markdown_content is None:
+        markdown_content = convert(...)
+        store_cached_markdown(key, markdown_content)
+    ```
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+# Directory holding cached markdown; caching is disabled when unset
+CACHE_DIR_ENV_VAR = "KBFP_CACHE_DIR"
+
+
+def get_cache_dir() -> Optional[Path]:
+    """
+    Get the conversion cache directory, if caching is enabled.
+    
+    Returns:
+        The directory named by KBFP_CACHE_DIR, or None when caching is disabled
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    return Path(cache_dir).expanduser() if cache_dir else None
+
+
+def file_cache_key(file_path: Union[str, Path], *settings: object) -> Optional[str]:
+    """
+    Build a cache key from a file's contents and the conversion settings.
+    
+    Args:
+        file_path: The file being converted
+        *settings: Conversion settings that change the output (e.g. backend)
+    
+    Returns:
+        A hex digest, or None when caching is disabled or the file is unreadable
+    """
+    if get_cache_dir() is None:
+        return None
+    
+    try:
+        with open(file_path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256")
+    except OSError:
+        # Leave unreadable files to the converter's own error handling
+        return None
+    for setting in settings:
+        digest.update(f"\0{setting}".encode())
+    return digest.hexdigest()
+
+
+def url_cache_key(url: str, headers: Mapping[str, str]) -> Optional[str]:
+    """
+    Build a cache key from a URL and its validator headers.
+    
+    Args:
+        url: The URL being converted
+        headers: Response headers from a HEAD request for the URL
+    
+    Returns:
+        A hex digest, or None when caching is disabled or the response carries
+        neither an ETag nor a Last-Modified header
+    """
+    if get_cache_dir() is None:
+        return None
+    
+    validator = headers.get("ETag") or headers.get("Last-Modified")
+    if not validator:
+        return None
+    return hashlib.sha256(f"{url}\0{validator}".encode()).hexdigest()
+
+
+def load_cached_markdown(key: Optional[str]) -> Optional[str]:
+    """
+    Read cached markdown for a key.
+    
+    Args:
+        key: A key from file_cache_key or url_cache_key, or None
+    
+    Returns:
+        The cached markdown, or None on a miss or when caching is disabled
+    """
+    cache_dir = get_cache_dir()
+    if key is None or cache_dir is None:
+        return None
+    
+    try:
+        return (cache_dir / f"{key}.md").read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def store_cached_markdown(key: Optional[str], markdown_content: str) -> None:
+    """
+    Store markdown under a key, atomically replacing any previous entry.
+    
+    Failing to write the cache never fails a conversion, so write errors are
+    ignored.
+    
+    Args:
+        key: A key from file_cache_key or url_cache_key, or None to skip
+        markdown_content: The markdown to cache
+    """
+    cache_dir = get_cache_dir()
+    if key is None or cache_dir is None:
+        return
+    
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(markdown_content)
+            os.replace(tmp_path, cache_dir / f"{key}.md")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
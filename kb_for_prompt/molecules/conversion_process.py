@@ -0,0 +1,211 @@
+"""
+Conversion in a child process that can be killed when it overruns a timeout.
+
+A docling conversion runs in native model code, so a hung call cannot be
+interrupted from another thread; abandoning it only leaves it running. When a
+converter is given a timeout, each attempt is instead sent to a child process
+that keeps its own DocumentConverter. An attempt that overruns is stopped by
+killing the child, and the next attempt starts a fresh one. The child loads
+docling's models before any attempt is timed, so model loading never counts
+against the timeout.
+
+Example:
+    ```python
+    from kb_for_prompt.molecules.conversion_process import ExportedResult, IsolatedConverter
+    
+    def _convert_exported(path):
+        return ExportedResult.from_result(_get_converter().convert(path))
+    
+    worker = IsolatedConverter(_get_converter)
+    result = worker.call(_convert_exported, ("/path/to/document.pdf",), timeout=60)
+    ```
+"""
+
+import multiprocessing
+import pickle
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class _ExportedDocument:
+    """A converted document reduced to its markdown."""
+    
+    def __init__(self, markdown: str):
+        self._markdown = markdown
+    
+    def export_to_markdown(self) -> str:
+        """Return the markdown exported in the conversion process."""
+        return self._markdown
+
+
+class ExportedResult:
+    """
+    Picklable summary of a docling ConversionResult.
+    
+    Carries the attributes convert_with_retry reads (document, status and
+    errors), with the document already exported to markdown, so a result can be
+    sent back from a conversion process without pickling docling's document model.
+    """
+    
+    def __init__(self, markdown: Optional[str], status: str, errors: List[str]):
+        self.document = _ExportedDocument(markdown) if markdown is not None else None
+        self.status = status
+        self.errors = errors
+    
+    @classmethod
+    def from_result(cls, result: Any) -> "ExportedResult":
+        """
+        Summarize a docling ConversionResult.
+        
+        Args:
+            result: The ConversionResult to summarize
+        
+        Returns:
+            An ExportedResult holding the document's markdown, if any
+        """
+        markdown = result.document.export_to_markdown() if result.document else None
+        return cls(markdown, str(result.status), [str(err) for err in (result.errors or [])])
+
+
+def _picklable_error(error: BaseException) -> BaseException:
+    """
+    Return an exception that can be sent back to the parent process.
+    
+    Args:
+        error: The exception raised in the child
+    
+    Returns:
+        The exception itself, or a RuntimeError describing it if it cannot be pickled
+    """
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{error.__class__.__name__}: {error}")
+
+
+def _worker_main(conn: Any, initializer: Callable[..., Any], initargs: Tuple[Any, ...]) -> None:
+    """
+    Serve conversion calls in the child process until the parent goes away.
+    
+    Args:
+        conn: The child's end of the pipe to the parent
+        initializer: Called once before any call is served, e.g. to load models
+        initargs: Arguments for the initializer
+    """
+    try:
+        initializer(*initargs)
+    except BaseException as e:
+        conn.send((False, _picklable_error(e)))
+        return
+    conn.send((True, None))
+    
+    while True:
+        try:
+            func, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            outcome = (True, func(*args))
+        except BaseException as e:
+            outcome = (False, _picklable_error(e))
+        conn.send(outcome)
+
+
+class IsolatedConverter:
+    """
+    Run conversion calls in a child process that is killed on timeout.
+    
+    The child is started with the "spawn" method, so it never inherits locks
+    held by the parent's threads, and is started lazily on the first call. Its
+    initializer runs before that call's timeout starts. Calls are served one at
+    a time.
+    """
+    
+    def __init__(self, initializer: Callable[..., Any], initargs: Tuple[Any, ...] = ()):
+        """
+        Initialize the IsolatedConverter.
+        
+        Args:
+            initializer: Picklable function run once in each new child, e.g. one
+                         that builds and caches the DocumentConverter
+            initargs: Arguments for the initializer
+        """
+        self._initializer = initializer
+        self._initargs = initargs
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+    
+    def _start(self) -> None:
+        """Start the child and wait, without a timeout, for its initializer."""
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self._initializer, self._initargs),
+            name="kb-for-prompt-conversion",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+        
+        try:
+            ok, error = parent_conn.recv()
+        except EOFError:
+            self._stop()
+            raise RuntimeError("Conversion process exited while starting")
+        if not ok:
+            self._stop()
+            raise error
+    
+    def _stop(self) -> None:
+        """Kill the child, if any, and release its pipe."""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join()
+            self._conn.close()
+        self._process = self._conn = None
+    
+    def call(self, func: Callable[..., Any], args: Tuple[Any, ...], timeout: Optional[float]) -> Any:
+        """
+        Call a function in the child process.
+        
+        Args:
+            func: Picklable, module-level function to call
+            args: Picklable arguments for the function
+            timeout: Seconds to wait for the result, or None to wait indefinitely
+        
+        Returns:
+            The function's return value
+        
+        Raises:
+            TimeoutError: If the call does not finish in time; the child is killed
+            RuntimeError: If the child process exits unexpectedly
+            Exception: Any exception raised by the function itself
+        """
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self._stop()
+                self._start()
+            
+            self._conn.send((func, args))
+            if not self._conn.poll(timeout):
+                self._stop()
+                raise TimeoutError(f"Conversion timed out after {timeout} seconds")
+            try:
+                ok, value = self._conn.recv()
+            except EOFError:
+                self._stop()
+                raise RuntimeError("Conversion process exited unexpectedly")
+        
+        if not ok:
+            raise value
+        return value
+    
+    def close(self) -> None:
+        """Stop the child process; a later call starts a new one."""
+        with self._lock:
+            self._stop()
@@ -0,0 +1,174 @@
+"""
+Shared retry loop for docling-based converters.
+
+This module holds the attempt/validate/back-off loop used by the URL, PDF and
+Word converters, so fixes to retry behaviour only need to be made once.
+
+Example:
+    ```python
+    from kb_for_prompt.molecules.conversion_retry import convert_with_retry
+    
+    markdown_content = convert_with_retry(
+        lambda attempt_timeout: converter.convert(source),
+        input_path="/path/to/document.pdf",
+        conversion_type="pdf",
+        failure_message="Failed to convert pdf document",
+        transient_errors=(OSError,),
+        transient_label="File access error",
+        transient_key="os_error"
+    )
+    ```
+"""
+
+import random
+import time
+from typing import Any, Callable, Optional, Tuple, Type
+
+from kb_for_prompt.atoms.error_utils import ConversionError, is_retryable_error
+
+# Shortest timeout given to an attempt started at the very end of a retry budget
+_MIN_ATTEMPT_TIMEOUT = 0.001
+
+
+def convert_with_retry(
+    attempt: Callable[[Optional[float]], Any],
+    *,
+    input_path: str,
+    conversion_type: str,
+    failure_message: str,
+    transient_errors: Tuple[Type[BaseException], ...] = (),
+    transient_label: str = "Conversion error",
+    transient_key: str = "error",
+    max_retries: int = 3,
+    timeout: Optional[float] = None,
+    retry_delay: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_budget: Optional[float] = None
+) -> str:
+    """
+    Run a docling conversion with retries and return its markdown.
+    
+    Each attempt calls ``attempt(attempt_timeout)`` to get a docling
+    ConversionResult and checks that it holds a document with non-whitespace
+    markdown. ``attempt_timeout`` is the number of seconds the attempt may take,
+    or None for no limit. Enforcing it is left to the attempt, since only work
+    that can actually be stopped (such as an IsolatedConverter child process)
+    should be timed out. A TimeoutError raised by an attempt counts as a
+    transient failure. Failures are
+    wrapped in ConversionError; transient ones are retried with capped,
+    fully jittered exponential backoff, permanent ones are raised immediately.
+    With a retry_budget, attempt timeouts are clipped to the time left and no
+    retry is started once the budget would be spent, so a flaky input cannot
+    hold its caller for max_retries full timeouts.
+    
+    Args:
+        attempt: Callable performing one conversion and returning its result,
+                 given the seconds it may take (or None)
+        input_path: The URL or file path being converted, for error reporting
+        conversion_type: The kind of input (e.g. "url", "pdf", "docx")
+        failure_message: Error message used when docling returns no document
+        transient_errors: Exception types given a dedicated error message
+        transient_label: Message prefix for transient_errors
+        transient_key: Details key holding the text of a transient error
+        max_retries: Maximum number of retries after the first attempt (default: 3)
+        timeout: Seconds passed to each attempt as its limit, or None for no limit
+                 (default: None)
+        retry_delay: Delay between retries in seconds (default: 1.0)
+        max_backoff: Upper bound in seconds for a single retry delay (default: 30.0)
+        retry_budget: Total seconds allowed across all attempts and retry delays,
+                      or None for no limit (default: None)
+    
+    Returns:
+        The markdown content of the converted document
+    
+    Raises:
+        ConversionError: If conversion fails after all retry attempts or encounters
+                         a non-recoverable error
+    """
+    retries = 0
+    deadline = time.monotonic() + retry_budget if retry_budget else None
+    
+    while True:
+        attempt_timeout = timeout
+        if deadline is not None:
+            # Never let an attempt run past the budget
+            remaining = max(deadline - time.monotonic(), _MIN_ATTEMPT_TIMEOUT)
+            attempt_timeout = min(timeout, remaining) if timeout else remaining
+        
+        try:
+            result = attempt(attempt_timeout)
+            
+            # Check if conversion was successful and document was created
+            if result.document:
+                markdown_content = result.document.export_to_markdown()
+                
+                # Validate markdown content is not empty
+                if markdown_content and not markdown_content.isspace():
+                    return markdown_content
+                
+                raise ConversionError(
+                    message="Conversion produced empty markdown content",
+                    input_path=input_path,
+                    conversion_type=conversion_type,
+                    details={"status": str(result.status)}
+                )
+            
+            # Handle case where document is None but result is returned
+            raise ConversionError(
+                message=failure_message,
+                input_path=input_path,
+                conversion_type=conversion_type,
+                details={
+                    "status": str(result.status),
+                    "errors": [str(err) for err in (result.errors or [])]
+                }
+            )
+        
+        except ConversionError as e:
+            # Conversion errors we've already formatted properly
+            last_error = e
+        except TimeoutError as e:
+            # Checked before transient_errors since TimeoutError is an OSError
+            last_error = ConversionError(
+                message=f"Conversion timed out: {str(e)}",
+                input_path=input_path,
+                conversion_type=conversion_type,
+                details={"timeout": attempt_timeout}
+            )
+        except transient_errors as e:
+            last_error = ConversionError(
+                message=f"{transient_label}: {str(e)}",
+                input_path=input_path,
+                conversion_type=conversion_type,
+                details={transient_key: str(e)}
+            )
+            # Keep an HTTP status so permanent failures are not retried
+            response = getattr(e, "response", None)
+            if response is not None:
+                last_error.details["status_code"] = response.status_code
+        except Exception as e:
+            # Catch-all for unexpected errors
+            last_error = ConversionError(
+                message=f"Unexpected conversion error: {str(e)}",
+                input_path=input_path,
+                conversion_type=conversion_type,
+                details={"error_type": e.__class__.__name__}
+            )
+        
+        retries += 1
+        
+        # Retry transient failures until max retries; permanent ones fail fast
+        if retries > max_retries or not is_retryable_error(last_error):
+            last_error.details["retries"] = retries - 1
+            raise last_error
+        
+        # Capped exponential backoff with full jitter
+        sleep_time = random.uniform(0, min(max_backoff, retry_delay * (2 ** (retries - 1))))
+        
+        # Give up rather than start a retry the budget has no time left for
+        if deadline is not None and time.monotonic() + sleep_time >= deadline:
+            last_error.details["retries"] = retries - 1
+            last_error.details["retry_budget"] = retry_budget
+            raise last_error
+        
+        time.sleep(sleep_time)
@@ -22,25 +22,93 @@ Example:
 """
 
 import os
-import time
+import threading
 from pathlib import Path
-from typing import Union, Tuple, Optional, Dict, Any
-import requests
-
-# Import docling for document conversion
-from docling.document_converter import DocumentConverter
+from typing import Union, Tuple, Optional, Dict, Any, Callable
 
 # Import utility functions
-from kb_for_prompt.atoms.error_utils import ConversionError, ValidationError
+from kb_for_prompt.atoms.error_utils import ValidationError
+from kb_for_prompt.molecules.conversion_cache import (
+    file_cache_key, load_cached_markdown, store_cached_markdown
+)
+from kb_for_prompt.molecules.conversion_process import ExportedResult, IsolatedConverter
+from kb_for_prompt.molecules.conversion_retry import convert_with_retry
 from kb_for_prompt.atoms.input_validator import validate_file_path, validate_file_type
-from kb_for_prompt.atoms.path_utils import create_file_url
+
+
+# Shared converter, built on first use; docling loads its models at construction,
+# so one instance is reused across calls and retries. DocumentConverter itself is
+# imported by _get_converter so importing this module does not load docling.
+DocumentConverter = None
+_converter: Optional["DocumentConverter"] = None
+_converter_lock = threading.Lock()
+
+
+def _get_converter() -> "DocumentConverter":
+    """
+    Get the shared DocumentConverter, creating it on first use.
+    
+    Returns:
+        The process-wide DocumentConverter instance
+    """
+    global _converter, DocumentConverter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                # Import docling on first use; it pulls in the ML stack
+                if DocumentConverter is None:
+                    from docling.document_converter import DocumentConverter
+                _converter = DocumentConverter()
+    return _converter
+
+
+# Conversion process used when attempts are timed; it keeps its own converter and
+# is killed when an attempt overruns its timeout
+_isolated_converter = IsolatedConverter(_get_converter)
+
+
+def _convert_exported(file_path: str) -> ExportedResult:
+    """
+    Convert a Word document inside a conversion process.
+    
+    Args:
+        file_path: The path to the Word document
+    
+    Returns:
+        The conversion result, with its markdown already exported
+    """
+    return ExportedResult.from_result(_get_converter().convert(file_path))
+
+
+def _doc_attempt(file_path: str, timeout: Optional[float]) -> Callable[[Optional[float]], Any]:
+    """
+    Build the conversion attempt passed to convert_with_retry.
+    
+    Without a timeout the shared converter runs in this process. With one,
+    attempts run in the conversion process, the only place a hung docling call
+    can be stopped.
+    
+    Args:
+        file_path: The path to the Word document
+        timeout: Seconds each attempt may take, or None for no limit
+    
+    Returns:
+        A callable taking the attempt's timeout and returning its result
+    """
+    if timeout is None:
+        return lambda attempt_timeout: _get_converter().convert(file_path)
+    return lambda attempt_timeout: _isolated_converter.call(
+        _convert_exported, (file_path,), attempt_timeout
+    )
 
 
 def convert_doc_to_markdown(
     file_path: Union[str, Path], 
     max_retries: int = 3, 
-    timeout: int = 30,
-    retry_delay: float = 1.0
+    timeout: Optional[float] = None,
+    retry_delay: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_budget: Optional[float] = None
 ) -> Tuple[str, str]:
     """
     Convert a Word document (.doc or .docx) to markdown content using docling.
@@ -52,8 +120,13 @@ def convert_doc_to_markdown(
     Args:
         file_path: The path to the Word document (str or Path object)
         max_retries: Maximum number of conversion attempts (default: 3)
-        timeout: Timeout in seconds for the conversion process (default: 30)
+        timeout: Seconds each conversion attempt may take, or None for no limit;
+                 timed attempts run in a separate process that is killed when
+                 one overruns (default: None)
         retry_delay: Delay between retries in seconds (default: 1.0)
+        max_backoff: Upper bound in seconds for a single retry delay (default: 30.0)
+        retry_budget: Total seconds allowed across all attempts and retry delays,
+                      or None for no limit (default: None)
     
     Returns:
         A tuple containing (markdown_content, original_file_path)
@@ -69,95 +142,29 @@ def convert_doc_to_markdown(
     # Validate that the file is a Word document (.doc or .docx)
     file_type = validate_file_type(resolved_path, allowed_types=["doc", "docx"])
     
-    # Convert file path to string for docling
-    path_str = str(resolved_path)
+    # Bind the path string once; docling resolves plain paths but rejects file:// URLs
+    resolved_path_str = os.fspath(resolved_path)
     
-    # Set up retry mechanism
-    retries = 0
-    last_error = None
+    # Reuse markdown from an earlier conversion of identical content
+    cache_key = file_cache_key(resolved_path_str, file_type)
+    markdown_content = load_cached_markdown(cache_key)
+    if markdown_content is not None:
+        return markdown_content, resolved_path_str
     
-    while retries <= max_retries:
-        try:
-            # Create a DocumentConverter instance
-            converter = DocumentConverter()
-            
-            # Create a file URL from the path and use it for conversion
-            file_url = create_file_url(resolved_path)
-            
-            # Convert the document with timeout
-            result = converter.convert(file_url)
-            
-            # Check if conversion was successful and document was created
-            if result.document:
-                # Check if the document has content
-                markdown_content = result.document.export_to_markdown()
-                
-                # Validate markdown content is not empty
-                if markdown_content and len(markdown_content.strip()) > 0:
-                    return markdown_content, str(resolved_path)
-                else:
-                    raise ConversionError(
-                        message="Conversion produced empty markdown content",
-                        input_path=str(resolved_path),
-                        conversion_type=file_type,
-                        details={"status": str(result.status)}
-                    )
-            else:
-                # Handle case where document is None but result is returned
-                error_details = {
-                    "status": str(result.status),
-                    "errors": [str(err) for err in (result.errors or [])]
-                }
-                
-                raise ConversionError(
-                    message=f"Failed to convert {file_type} document",
-                    input_path=str(resolved_path),
-                    conversion_type=file_type,
-                    details=error_details
-                )
-                
-        except (OSError, IOError) as e:
-            # File access errors
-            last_error = ConversionError(
-                message=f"File access error: {str(e)}",
-                input_path=str(resolved_path),
-                conversion_type=file_type,
-                details={"os_error": str(e)}
-            )
-        except ConversionError as e:
-            # Re-raise conversion errors that we've already formatted properly
-            last_error = e
-        except Exception as e:
-            # Catch-all for unexpected errors
-            last_error = ConversionError(
-                message=f"Unexpected conversion error: {str(e)}",
-                input_path=str(resolved_path),
-                conversion_type=file_type,
-                details={"error_type": e.__class__.__name__}
-            )
-        
-        # If we reach here, there was an error
-        retries += 1
-        
-        # If we haven't reached max retries, wait before trying again
-        if retries <= max_retries:
-            # Exponential backoff with jitter
-            sleep_time = retry_delay * (2 ** (retries - 1))
-            time.sleep(sleep_time)
-        else:
-            # We've exhausted our retries, raise the last error
-            if last_error:
-                # Add retry information to error details
-                if last_error.details:
-                    last_error.details.update({"retries": retries - 1})
-                else:
-                    last_error.details = {"retries": retries - 1}
-                raise last_error
-            else:
-                # This should never happen, but just in case
-                raise ConversionError(
-                    message=f"Failed to convert {file_type} document after multiple attempts",
-                    input_path=str(resolved_path),
-                    conversion_type=file_type,
-                    details={"retries": retries - 1}
-                )
\ No newline at end of file
+    # Reuse the shared DocumentConverter (or conversion process) across attempts
+    markdown_content = convert_with_retry(
+        _doc_attempt(resolved_path_str, timeout),
+        input_path=resolved_path_str,
+        conversion_type=file_type,
+        failure_message=f"Failed to convert {file_type} document",
+        transient_errors=(OSError,),
+        transient_label="File access error",
+        transient_key="os_error",
+        max_retries=max_retries,
+        timeout=timeout,
+        retry_delay=retry_delay,
+        max_backoff=max_backoff,
+        retry_budget=retry_budget
+    )
+    store_cached_markdown(cache_key, markdown_content)
+    return markdown_content, resolved_path_str
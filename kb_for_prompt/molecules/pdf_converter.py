@@ -18,28 +18,273 @@ Example:
         max_retries=5,
         timeout=10
     )
+    
+    # Write the markdown for a PDF document straight to an open file
+    with open("document.md", "w", encoding="utf-8") as out:
+        original_path = convert_pdf_to_markdown_stream("/path/to/document.pdf", out)
+    
+    # Use docling's own PDF parser instead of pypdfium
+    # (or set KBFP_PDF_BACKEND=docling in the environment)
+    markdown_content, original_path = convert_pdf_to_markdown(
+        "/path/to/document.pdf", backend="docling"
+    )
+    
+    # Opt back into OCR and accurate tables for scanned, table-heavy documents
+    markdown_content, original_path = convert_pdf_to_markdown(
+        "/path/to/scan.pdf", ocr=True, table_mode="accurate"
+    )
+    
+    # Convert several PDF documents in one docling batch
+    results = convert_pdfs_to_markdown(["/path/to/a.pdf", "/path/to/b.pdf"])
+    
+    # Convert PDF documents in parallel worker processes
+    for markdown_content, original_path in convert_many(paths, max_workers=4):
+        ...
     ```
 """
 
+import multiprocessing
 import os
-import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Union, Tuple, Optional, Dict, Any
-
-# Import docling for document conversion
-from docling.document_converter import DocumentConverter
+from typing import IO, Union, Tuple, Optional, Dict, Any, Callable, Iterable, Iterator, List
 
 # Import utility functions
-from kb_for_prompt.atoms.error_utils import ConversionError, ValidationError
+from kb_for_prompt.atoms.error_utils import ValidationError
+from kb_for_prompt.molecules.conversion_cache import (
+    file_cache_key, load_cached_markdown, store_cached_markdown
+)
+from kb_for_prompt.molecules.conversion_process import ExportedResult, IsolatedConverter
+from kb_for_prompt.molecules.conversion_retry import convert_with_retry
 from kb_for_prompt.atoms.input_validator import validate_file_path, validate_file_type
-from kb_for_prompt.atoms.path_utils import create_file_url
+
+
+# Shared converters, built on first use and keyed by pipeline settings; docling loads its
+# models at construction, so each instance is reused across calls and retries.
+# DocumentConverter itself is imported by _build_converter so importing this module
+# does not load docling.
+DocumentConverter = None
+_converters: Dict[Tuple[str, bool, str], "DocumentConverter"] = {}
+_converter_lock = threading.Lock()
+
+# Conversion processes used when attempts are timed, keyed like _converters; each
+# keeps its own converter and is killed when an attempt overruns its timeout
+_isolated_converters: Dict[Tuple[str, bool, str], IsolatedConverter] = {}
+
+# Number of documents docling pulls into each batch in convert_pdfs_to_markdown
+PDF_BATCH_SIZE = 4
+
+# PDF parsing backend: "pypdfium" is roughly twice as fast as docling-parse and
+# uses far less memory; "docling" keeps docling's own parser
+PDF_BACKEND_ENV_VAR = "KBFP_PDF_BACKEND"
+DEFAULT_PDF_BACKEND = "pypdfium"
+PDF_BACKENDS = ("pypdfium", "docling")
+
+# TableFormer mode: "fast" trades a little table accuracy for much faster layout;
+# OCR is off by default since most PDFs carry a text layer
+TABLE_MODES = ("fast", "accurate")
+DEFAULT_TABLE_MODE = "fast"
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    """
+    Pick the PDF backend from the argument, the environment, or the default.
+    
+    Args:
+        backend: Explicit backend name, or None to use KBFP_PDF_BACKEND
+    
+    Returns:
+        The normalized backend name
+        
+    Raises:
+        ValidationError: If the backend name is not supported
+    """
+    name = (backend or os.environ.get(PDF_BACKEND_ENV_VAR) or DEFAULT_PDF_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        raise ValidationError(
+            message=f"Unsupported PDF backend: {name}. Supported backends: {', '.join(PDF_BACKENDS)}",
+            input_value=name,
+            validation_type="pdf_backend"
+        )
+    return name
+
+
+def _resolve_table_mode(table_mode: str) -> str:
+    """
+    Normalize and check a TableFormer mode name.
+    
+    Args:
+        table_mode: "fast" or "accurate"
+    
+    Returns:
+        The normalized mode name
+        
+    Raises:
+        ValidationError: If the mode is not supported
+    """
+    mode = table_mode.lower()
+    if mode not in TABLE_MODES:
+        raise ValidationError(
+            message=f"Unsupported table mode: {table_mode}. Supported modes: {', '.join(TABLE_MODES)}",
+            input_value=table_mode,
+            validation_type="table_mode"
+        )
+    return mode
+
+
+def _build_converter(backend: str, ocr: bool, table_mode: str) -> "DocumentConverter":
+    """
+    Construct a DocumentConverter with the given PDF pipeline settings.
+    
+    Args:
+        backend: A name from PDF_BACKENDS
+        ocr: Whether to run OCR on PDF pages
+        table_mode: A name from TABLE_MODES
+    
+    Returns:
+        A new DocumentConverter instance
+    """
+    global DocumentConverter
+    # Import docling on first use; it pulls in the ML stack
+    if DocumentConverter is None:
+        from docling.document_converter import DocumentConverter
+    
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import (
+        PdfPipelineOptions, TableFormerMode, TableStructureOptions
+    )
+    from docling.document_converter import PdfFormatOption
+    
+    pipeline_options = PdfPipelineOptions(
+        do_ocr=ocr,
+        do_table_structure=True,
+        table_structure_options=TableStructureOptions(mode=TableFormerMode(table_mode))
+    )
+    
+    if backend == "pypdfium":
+        from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        format_option = PdfFormatOption(
+            pipeline_options=pipeline_options, backend=PyPdfiumDocumentBackend
+        )
+    else:
+        format_option = PdfFormatOption(pipeline_options=pipeline_options)
+    
+    return DocumentConverter(format_options={InputFormat.PDF: format_option})
+
+
+def _get_converter(
+    backend: Optional[str] = None,
+    ocr: bool = False,
+    table_mode: str = DEFAULT_TABLE_MODE
+) -> "DocumentConverter":
+    """
+    Get the shared DocumentConverter for a set of PDF pipeline settings.
+    
+    The converter is created on first use and reused for later calls with the
+    same settings.
+    
+    Args:
+        backend: PDF backend name (default: KBFP_PDF_BACKEND, else "pypdfium")
+        ocr: Whether to run OCR on PDF pages (default: False)
+        table_mode: TableFormer mode, "fast" or "accurate" (default: "fast")
+    
+    Returns:
+        The process-wide DocumentConverter instance for those settings
+        
+    Raises:
+        ValidationError: If the backend or table mode is not supported
+    """
+    key = (_resolve_backend(backend), ocr, _resolve_table_mode(table_mode))
+    converter = _converters.get(key)
+    if converter is None:
+        with _converter_lock:
+            converter = _converters.get(key)
+            if converter is None:
+                converter = _converters[key] = _build_converter(*key)
+    return converter
+
+
+def _convert_exported(file_path: str, backend: str, ocr: bool, table_mode: str) -> ExportedResult:
+    """
+    Convert a PDF document inside a conversion process.
+    
+    Args:
+        file_path: The path to the PDF document
+        backend: A name from PDF_BACKENDS
+        ocr: Whether to run OCR on PDF pages
+        table_mode: A name from TABLE_MODES
+    
+    Returns:
+        The conversion result, with its markdown already exported
+    """
+    return ExportedResult.from_result(_get_converter(backend, ocr, table_mode).convert(file_path))
+
+
+def _get_isolated_converter(backend: str, ocr: bool, table_mode: str) -> IsolatedConverter:
+    """
+    Get the conversion process for a set of resolved PDF pipeline settings.
+    
+    Args:
+        backend: A name from PDF_BACKENDS
+        ocr: Whether to run OCR on PDF pages
+        table_mode: A name from TABLE_MODES
+    
+    Returns:
+        The shared IsolatedConverter for those settings
+    """
+    key = (backend, ocr, table_mode)
+    with _converter_lock:
+        worker = _isolated_converters.get(key)
+        if worker is None:
+            # The child builds its converter before any attempt is timed
+            worker = _isolated_converters[key] = IsolatedConverter(_get_converter, key)
+    return worker
+
+
+def _pdf_attempt(
+    file_path: str,
+    backend: str,
+    ocr: bool,
+    table_mode: str,
+    timeout: Optional[float]
+) -> Callable[[Optional[float]], Any]:
+    """
+    Build the conversion attempt passed to convert_with_retry.
+    
+    Without a timeout the shared converter runs in this process. With one,
+    attempts run in a conversion process, the only place a hung docling call
+    can be stopped.
+    
+    Args:
+        file_path: The path to the PDF document
+        backend: A name from PDF_BACKENDS
+        ocr: Whether to run OCR on PDF pages
+        table_mode: A name from TABLE_MODES
+        timeout: Seconds each attempt may take, or None for no limit
+    
+    Returns:
+        A callable taking the attempt's timeout and returning its result
+    """
+    if timeout is None:
+        return lambda attempt_timeout: _get_converter(backend, ocr, table_mode).convert(file_path)
+    
+    worker = _get_isolated_converter(backend, ocr, table_mode)
+    return lambda attempt_timeout: worker.call(
+        _convert_exported, (file_path, backend, ocr, table_mode), attempt_timeout
+    )
 
 
 def convert_pdf_to_markdown(
     file_path: Union[str, Path], 
     max_retries: int = 3, 
-    timeout: int = 30,
-    retry_delay: float = 1.0
+    timeout: Optional[float] = None,
+    retry_delay: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_budget: Optional[float] = None,
+    backend: Optional[str] = None,
+    ocr: bool = False,
+    table_mode: str = DEFAULT_TABLE_MODE
 ) -> Tuple[str, str]:
     """
     Convert a PDF document to markdown content using docling.
@@ -51,14 +296,24 @@ def convert_pdf_to_markdown(
     Args:
         file_path: The path to the PDF document (str or Path object)
         max_retries: Maximum number of conversion attempts (default: 3)
-        timeout: Timeout in seconds for the conversion process (default: 30)
+        timeout: Seconds each conversion attempt may take, or None for no limit;
+                 timed attempts run in a separate process that is killed when
+                 one overruns (default: None)
         retry_delay: Delay between retries in seconds (default: 1.0)
+        max_backoff: Upper bound in seconds for a single retry delay (default: 30.0)
+        retry_budget: Total seconds allowed across all attempts and retry delays,
+                      or None for no limit (default: None)
+        backend: PDF parsing backend, "pypdfium" or "docling"
+                 (default: KBFP_PDF_BACKEND environment variable, else "pypdfium")
+        ocr: Run OCR on PDF pages, for scanned documents (default: False)
+        table_mode: Table structure mode, "fast" or "accurate" (default: "fast")
     
     Returns:
         A tuple containing (markdown_content, original_file_path)
         
     Raises:
-        ValidationError: If the file path is invalid or the file is not a PDF document
+        ValidationError: If the file path is invalid, the file is not a PDF document,
+                         or the backend or table mode is not supported
         ConversionError: If conversion fails after all retry attempts or encounters
                          a non-recoverable error
     """
@@ -68,92 +323,390 @@ def convert_pdf_to_markdown(
     # Validate that the file is a PDF document
     file_type = validate_file_type(resolved_path, allowed_types=["pdf"])
     
-    # Convert file path to file URL for docling
-    file_url = create_file_url(resolved_path)
+    # Bind the path string once; docling resolves plain paths but rejects file:// URLs
+    resolved_path_str = os.fspath(resolved_path)
+    
+    # Check the pipeline settings before converting
+    backend = _resolve_backend(backend)
+    table_mode = _resolve_table_mode(table_mode)
+    
+    # Reuse markdown from an earlier conversion of identical content
+    cache_key = file_cache_key(resolved_path_str, "pdf", backend, ocr, table_mode)
+    markdown_content = load_cached_markdown(cache_key)
+    if markdown_content is not None:
+        return markdown_content, resolved_path_str
+    
+    # Reuse the shared DocumentConverter (or conversion process) across attempts
+    markdown_content = convert_with_retry(
+        _pdf_attempt(resolved_path_str, backend, ocr, table_mode, timeout),
+        input_path=resolved_path_str,
+        conversion_type=file_type,
+        failure_message=f"Failed to convert {file_type} document",
+        transient_errors=(OSError,),
+        transient_label="File access error",
+        transient_key="os_error",
+        max_retries=max_retries,
+        timeout=timeout,
+        retry_delay=retry_delay,
+        max_backoff=max_backoff,
+        retry_budget=retry_budget
+    )
+    store_cached_markdown(cache_key, markdown_content)
+    return markdown_content, resolved_path_str
+
+
+def convert_pdf_to_markdown_stream(
+    file_path: Union[str, Path],
+    out: IO[str],
+    max_retries: int = 3,
+    timeout: Optional[float] = None,
+    retry_delay: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_budget: Optional[float] = None,
+    backend: Optional[str] = None,
+    ocr: bool = False,
+    table_mode: str = DEFAULT_TABLE_MODE
+) -> str:
+    """
+    Convert a PDF document and write its markdown to a text stream.
+    
+    docling-core renders markdown in a single pass, so the export is written
+    to ``out`` as one chunk and released immediately instead of being handed
+    back to the caller to write and keep alive.
+    
+    Args:
+        file_path: The path to the PDF document (str or Path object)
+        out: A writable text stream, such as an open file or io.StringIO
+        max_retries: Maximum number of conversion attempts (default: 3)
+        timeout: Seconds each conversion attempt may take, or None for no limit;
+                 timed attempts run in a separate process that is killed when
+                 one overruns (default: None)
+        retry_delay: Delay between retries in seconds (default: 1.0)
+        max_backoff: Upper bound in seconds for a single retry delay (default: 30.0)
+        retry_budget: Total seconds allowed across all attempts and retry delays,
+                      or None for no limit (default: None)
+        backend: PDF parsing backend, "pypdfium" or "docling"
+                 (default: KBFP_PDF_BACKEND environment variable, else "pypdfium")
+        ocr: Run OCR on PDF pages, for scanned documents (default: False)
+        table_mode: Table structure mode, "fast" or "accurate" (default: "fast")
+    
+    Returns:
+        The original file path as a string
+        
+    Raises:
+        ValidationError: If the file path is invalid, the file is not a PDF document,
+                         or the backend or table mode is not supported
+        ConversionError: If conversion fails after all retry attempts or encounters
+                         a non-recoverable error
+    """
+    markdown_content, original_path = convert_pdf_to_markdown(
+        file_path,
+        max_retries=max_retries,
+        timeout=timeout,
+        retry_delay=retry_delay,
+        max_backoff=max_backoff,
+        retry_budget=retry_budget,
+        backend=backend,
+        ocr=ocr,
+        table_mode=table_mode
+    )
+    out.write(markdown_content)
+    return original_path
+
+
+def _validate_pdf_batch(file_paths: Iterable[Union[str, Path]]) -> List[Path]:
+    """
+    Validate every input of a batch before any conversion starts.
+    
+    All inputs are checked, so a single error reports every invalid path at
+    once. Empty files are rejected here because docling can only turn them into
+    an empty-markdown ConversionError after a full retry cycle.
     
-    # Set up retry mechanism
-    retries = 0
-    last_error = None
+    Args:
+        file_paths: The paths to the PDF documents (str or Path objects)
     
-    while retries <= max_retries:
+    Returns:
+        The resolved paths, in input order
+        
+    Raises:
+        ValidationError: If any input is missing, not a PDF document or empty;
+                         details["errors"] lists each failing input
+    """
+    resolved_paths = []
+    errors = []
+    
+    for file_path in file_paths:
         try:
-            # Create a DocumentConverter instance
-            converter = DocumentConverter()
-            
-            # Convert the document with timeout
-            result = converter.convert(file_url)
-            
-            # Check if conversion was successful and document was created
-            if result.document:
-                # Check if the document has content
-                markdown_content = result.document.export_to_markdown()
-                
-                # Validate markdown content is not empty
-                if markdown_content and len(markdown_content.strip()) > 0:
-                    return markdown_content, str(resolved_path)
-                else:
-                    raise ConversionError(
-                        message="Conversion produced empty markdown content",
-                        input_path=str(resolved_path),
-                        conversion_type=file_type,
-                        details={"status": str(result.status)}
-                    )
-            else:
-                # Handle case where document is None but result is returned
-                error_details = {
-                    "status": str(result.status),
-                    "errors": [str(err) for err in (result.errors or [])]
-                }
-                
-                raise ConversionError(
-                    message=f"Failed to convert {file_type} document",
-                    input_path=str(resolved_path),
-                    conversion_type=file_type,
-                    details=error_details
+            resolved_path = validate_file_path(file_path)
+            validate_file_type(resolved_path, allowed_types=["pdf"])
+            if os.path.getsize(resolved_path) == 0:
+                raise ValidationError(
+                    message="File is empty",
+                    input_value=os.fspath(resolved_path),
+                    validation_type="file_empty"
                 )
-                
-        except (OSError, IOError) as e:
-            # File access errors
-            last_error = ConversionError(
-                message=f"File access error: {str(e)}",
-                input_path=str(resolved_path),
-                conversion_type=file_type,
-                details={"os_error": str(e)}
-            )
-        except ConversionError as e:
-            # Re-raise conversion errors that we've already formatted properly
-            last_error = e
-        except Exception as e:
-            # Catch-all for unexpected errors
-            last_error = ConversionError(
-                message=f"Unexpected conversion error: {str(e)}",
-                input_path=str(resolved_path),
-                conversion_type=file_type,
-                details={"error_type": e.__class__.__name__}
+        except ValidationError as e:
+            errors.append({
+                "input": os.fspath(file_path),
+                "message": e.message,
+                "validation_type": e.validation_type
+            })
+            continue
+        resolved_paths.append(resolved_path)
+    
+    if errors:
+        raise ValidationError(
+            message=f"{len(errors)} of {len(resolved_paths) + len(errors)} inputs failed validation",
+            validation_type="batch",
+            details={"errors": errors}
+        )
+    
+    return resolved_paths
+
+
+def convert_pdfs_to_markdown(
+    file_paths: Iterable[Union[str, Path]],
+    max_retries: int = 3,
+    timeout: Optional[float] = None,
+    retry_delay: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_budget: Optional[float] = None,
+    backend: Optional[str] = None,
+    ocr: bool = False,
+    table_mode: str = DEFAULT_TABLE_MODE
+) -> List[Tuple[str, str]]:
+    """
+    Convert several PDF documents to markdown in a single docling batch.
+    
+    All paths are validated (and empty files rejected) before any conversion
+    starts, then handed to
+    ``DocumentConverter.convert_all`` in one call so the pipeline is set up once
+    and docling's document batching applies. When the conversion cache is
+    enabled, documents with cached markdown are left out of the batch. Documents
+    the batch fails to convert are retried individually through
+    convert_pdf_to_markdown.
+    
+    Args:
+        file_paths: The paths to the PDF documents (str or Path objects)
+        max_retries: Maximum number of retries for documents that fail in the batch (default: 3)
+        timeout: Seconds each conversion attempt may take, or None for no limit;
+                 timed attempts run in a separate process that is killed when
+                 one overruns (default: None)
+        retry_delay: Delay between retries in seconds (default: 1.0)
+        max_backoff: Upper bound in seconds for a single retry delay (default: 30.0)
+        retry_budget: Total seconds allowed across all attempts and retry delays,
+                      or None for no limit (default: None)
+        backend: PDF parsing backend, "pypdfium" or "docling"
+                 (default: KBFP_PDF_BACKEND environment variable, else "pypdfium")
+        ocr: Run OCR on PDF pages, for scanned documents (default: False)
+        table_mode: Table structure mode, "fast" or "accurate" (default: "fast")
+    
+    Returns:
+        A list of (markdown_content, original_file_path) tuples, in input order
+        
+    Raises:
+        ValidationError: If any file path is invalid, empty or not a PDF document,
+                         or the backend or table mode is not supported
+        ConversionError: If a document still fails after all retry attempts
+    """
+    # Validate every input and the pipeline settings before starting the batch
+    resolved_paths = _validate_pdf_batch(file_paths)
+    backend = _resolve_backend(backend)
+    table_mode = _resolve_table_mode(table_mode)
+    if not resolved_paths:
+        return []
+    
+    # A docling batch cannot be stopped part-way, so timed documents go one by one
+    if timeout is not None:
+        return [
+            convert_pdf_to_markdown(
+                resolved_path,
+                max_retries=max_retries,
+                timeout=timeout,
+                retry_delay=retry_delay,
+                max_backoff=max_backoff,
+                retry_budget=retry_budget,
+                backend=backend,
+                ocr=ocr,
+                table_mode=table_mode
             )
+            for resolved_path in resolved_paths
+        ]
+    
+    # Reuse markdown from earlier conversions of identical content, so only the
+    # cache misses go to docling
+    cache_keys = [
+        file_cache_key(os.fspath(resolved_path), "pdf", backend, ocr, table_mode)
+        for resolved_path in resolved_paths
+    ]
+    batch_markdown = [load_cached_markdown(cache_key) for cache_key in cache_keys]
+    misses = [index for index, markdown_content in enumerate(batch_markdown) if markdown_content is None]
+    
+    if misses:
+        from docling.datamodel.base_models import ConversionStatus
+        from docling.datamodel.settings import settings as docling_settings
         
-        # If we reach here, there was an error
-        retries += 1
+        # Let docling batch documents; never lower a setting the caller raised.
+        # docling's settings are process-wide, so they are put back after the batch.
+        batch_size = min(len(misses), PDF_BATCH_SIZE)
+        perf = docling_settings.perf
+        saved_settings = (perf.doc_batch_size, perf.doc_batch_concurrency)
+        perf.doc_batch_size = max(perf.doc_batch_size, batch_size)
+        perf.doc_batch_concurrency = max(perf.doc_batch_concurrency, batch_size)
         
-        # If we haven't reached max retries, wait before trying again
-        if retries <= max_retries:
-            # Exponential backoff with jitter
-            sleep_time = retry_delay * (2 ** (retries - 1))
-            time.sleep(sleep_time)
+        try:
+            conversions = _get_converter(backend, ocr, table_mode).convert_all(
+                [resolved_paths[index] for index in misses], raises_on_error=False
+            )
+            for index, result in zip(misses, conversions):
+                if result.document and result.status in (
+                    ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS
+                ):
+                    markdown_content = result.document.export_to_markdown()
+                    batch_markdown[index] = markdown_content
+                    if markdown_content and not markdown_content.isspace():
+                        store_cached_markdown(cache_keys[index], markdown_content)
+        finally:
+            perf.doc_batch_size, perf.doc_batch_concurrency = saved_settings
+    
+    results = []
+    for resolved_path, markdown_content in zip(resolved_paths, batch_markdown):
+        if markdown_content and not markdown_content.isspace():
+            results.append((markdown_content, os.fspath(resolved_path)))
         else:
-            # We've exhausted our retries, raise the last error
-            if last_error:
-                # Add retry information to error details
-                if last_error.details:
-                    last_error.details.update({"retries": retries - 1})
-                else:
-                    last_error.details = {"retries": retries - 1}
-                raise last_error
-            else:
-                # This should never happen, but just in case
-                raise ConversionError(
-                    message=f"Failed to convert {file_type} document after multiple attempts",
-                    input_path=str(resolved_path),
-                    conversion_type=file_type,
-                    details={"retries": retries - 1}
-                )
\ No newline at end of file
+            # Fall back to the single-document path and its retry handling
+            results.append(convert_pdf_to_markdown(
+                resolved_path,
+                max_retries=max_retries,
+                timeout=timeout,
+                retry_delay=retry_delay,
+                max_backoff=max_backoff,
+                retry_budget=retry_budget,
+                backend=backend,
+                ocr=ocr,
+                table_mode=table_mode
+            ))
+    
+    return results
+
+
+def _init_worker(omp_threads: int, backend: str, ocr: bool, table_mode: str) -> None:
+    """
+    Prepare a convert_many worker process.
+    
+    Limits the OpenMP thread count so parallel workers do not oversubscribe the
+    CPU, then builds the worker's own DocumentConverter before any task arrives.
+    
+    Args:
+        omp_threads: Number of OpenMP threads the worker's models may use
+        backend: A name from PDF_BACKENDS
+        ocr: Whether to run OCR on PDF pages
+        table_mode: A name from TABLE_MODES
+    """
+    os.environ["OMP_NUM_THREADS"] = str(omp_threads)
+    _get_converter(backend, ocr, table_mode)
+
+
+def convert_many(
+    file_paths: Iterable[Union[str, Path]],
+    max_workers: Optional[int] = None,
+    max_retries: int = 3,
+    timeout: Optional[float] = None,
+    retry_delay: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_budget: Optional[float] = None,
+    backend: Optional[str] = None,
+    ocr: bool = False,
+    table_mode: str = DEFAULT_TABLE_MODE
+) -> Iterator[Tuple[str, str]]:
+    """
+    Convert PDF documents in parallel, one DocumentConverter per worker process.
+    
+    Docling's models are CPU-bound, so documents are fanned out to a process pool
+    whose workers each keep a cached converter. Every input is validated before
+    the pool starts. Results are yielded as soon as each document finishes,
+    which is not necessarily input order.
+    
+    Args:
+        file_paths: The paths to the PDF documents (str or Path objects)
+        max_workers: Number of worker processes (default: CPU count, capped at the number of inputs)
+        max_retries: Maximum number of conversion attempts per document (default: 3)
+        timeout: Seconds each conversion attempt may take, or None for no limit;
+                 timed attempts run in a separate process that is killed when
+                 one overruns (default: None)
+        retry_delay: Delay between retries in seconds (default: 1.0)
+        max_backoff: Upper bound in seconds for a single retry delay (default: 30.0)
+        retry_budget: Total seconds allowed across all attempts and retry delays,
+                      or None for no limit (default: None)
+        backend: PDF parsing backend, "pypdfium" or "docling"
+                 (default: KBFP_PDF_BACKEND environment variable, else "pypdfium")
+        ocr: Run OCR on PDF pages, for scanned documents (default: False)
+        table_mode: Table structure mode, "fast" or "accurate" (default: "fast")
+    
+    Yields:
+        A (markdown_content, original_file_path) tuple for each converted document
+        
+    Raises:
+        ValidationError: If any file path is invalid, empty or not a PDF document,
+                         or the backend or table mode is not supported
+        ConversionError: If a document fails after all retry attempts
+    """
+    # Validate the whole batch and the pipeline settings before paying for any conversion
+    paths = _validate_pdf_batch(file_paths)
+    backend = _resolve_backend(backend)
+    table_mode = _resolve_table_mode(table_mode)
+    if not paths:
+        return
+    
+    cpu_count = os.cpu_count() or 1
+    workers = min(max_workers or cpu_count, len(paths))
+    
+    # A single worker gains nothing from a process pool
+    if workers == 1:
+        for file_path in paths:
+            yield convert_pdf_to_markdown(
+                file_path,
+                max_retries=max_retries,
+                timeout=timeout,
+                retry_delay=retry_delay,
+                max_backoff=max_backoff,
+                retry_budget=retry_budget,
+                backend=backend,
+                ocr=ocr,
+                table_mode=table_mode
+            )
+        return
+    
+    # Split the cores between workers to avoid oversubscription
+    omp_threads = max(1, cpu_count // workers)
+    
+    # Spawn rather than fork, so workers never inherit locks held by the
+    # caller's threads (logging, docling or converter locks)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(omp_threads, backend, ocr, table_mode)
+    ) as executor:
+        futures = [
+            executor.submit(
+                convert_pdf_to_markdown,
+                file_path,
+                max_retries=max_retries,
+                timeout=timeout,
+                retry_delay=retry_delay,
+                max_backoff=max_backoff,
+                retry_budget=retry_budget,
+                backend=backend,
+                ocr=ocr,
+                table_mode=table_mode
+            )
+            for file_path in paths
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Drop queued work if a document failed or the caller stopped early
+            for future in futures:
+                future.cancel()
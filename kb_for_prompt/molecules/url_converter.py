@@ -21,23 +21,153 @@ Example:
     ```
 """
 
-import time
-from typing import Tuple, Optional, Dict, Any
-import requests
+import threading
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Tuple, Optional, Dict, Any
+from urllib.parse import urlparse
 
-# Import docling for document conversion
-from docling.document_converter import DocumentConverter
+if TYPE_CHECKING:
+    import requests
+    from docling_core.types.io import DocumentStream
 
 # Import utility functions
-from kb_for_prompt.atoms.error_utils import ConversionError
 from kb_for_prompt.atoms.input_validator import validate_url
+from kb_for_prompt.molecules.conversion_cache import (
+    get_cache_dir, url_cache_key, load_cached_markdown, store_cached_markdown
+)
+from kb_for_prompt.molecules.conversion_retry import convert_with_retry
+
+
+# Shared converter, built on first use; docling loads its models at construction,
+# so one instance is reused across calls and retries. DocumentConverter itself is
+# imported by _get_converter so importing this module does not load docling.
+DocumentConverter = None
+_converter: Optional["DocumentConverter"] = None
+_converter_lock = threading.Lock()
+
+
+def _get_converter() -> "DocumentConverter":
+    """
+    Get the shared DocumentConverter, creating it on first use.
+    
+    Returns:
+        The process-wide DocumentConverter instance
+    """
+    global _converter, DocumentConverter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                # Import docling on first use; it pulls in the ML stack
+                if DocumentConverter is None:
+                    from docling.document_converter import DocumentConverter
+                _converter = DocumentConverter()
+    return _converter
+
+
+# Shared HTTP session so retries and later calls reuse keep-alive connections;
+# retrying is left to convert_url_to_markdown, hence max_retries=0 on the adapter
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> "requests.Session":
+    """
+    Get the shared requests.Session, creating it on first use.
+    
+    Returns:
+        The process-wide Session with a pooled adapter mounted for http and https
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _document_name(response: "requests.Response") -> str:
+    """
+    Derive a file name for fetched content so docling can detect its format.
+    
+    Args:
+        response: The HTTP response for the fetched URL
+    
+    Returns:
+        The last path segment of the final URL, with an extension added from the
+        Content-Type header when the path has none
+    """
+    name = PurePosixPath(urlparse(response.url).path).name or "index"
+    if not PurePosixPath(name).suffix:
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "pdf" in content_type:
+            name += ".pdf"
+        elif "html" in content_type:
+            name += ".html"
+    return name
+
+
+def _fetch_document(url: str, timeout: int) -> "DocumentStream":
+    """
+    Download a URL through the shared session for conversion by docling.
+    
+    Args:
+        url: The URL to fetch
+        timeout: Timeout in seconds for the HTTP request
+    
+    Returns:
+        A DocumentStream holding the response body
+        
+    Raises:
+        requests.RequestException: If the request fails or returns an error status
+    """
+    from docling_core.types.io import DocumentStream
+    
+    response = _get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return DocumentStream(name=_document_name(response), stream=BytesIO(response.content))
+
+
+def _url_cache_key(url: str, timeout: int) -> Optional[str]:
+    """
+    Build the conversion cache key for a URL from a HEAD request.
+    
+    Args:
+        url: The URL being converted
+        timeout: Timeout in seconds for the HEAD request
+    
+    Returns:
+        The cache key, or None when caching is disabled, the page sends no
+        ETag/Last-Modified header, or the HEAD request fails
+    """
+    if get_cache_dir() is None:
+        return None
+    
+    import requests
+    
+    try:
+        response = _get_session().head(url, timeout=timeout, allow_redirects=True)
+    except requests.RequestException:
+        return None
+    if not response.ok:
+        return None
+    return url_cache_key(url, response.headers)
 
 
 def convert_url_to_markdown(
     url: str, 
     max_retries: int = 3, 
     timeout: int = 30,
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0,
+    max_backoff: float = 30.0,
+    retry_budget: Optional[float] = None
 ) -> Tuple[str, str]:
     """
     Convert a URL to markdown content using docling.
@@ -49,8 +179,13 @@ def convert_url_to_markdown(
     Args:
         url: The URL to convert
         max_retries: Maximum number of conversion attempts (default: 3)
-        timeout: Timeout in seconds for the conversion process (default: 30)
+        timeout: Timeout in seconds for each HTTP request (default: 30); the
+                 docling conversion itself is not timed, since it runs in this
+                 process and could not be stopped
         retry_delay: Delay between retries in seconds (default: 1.0)
+        max_backoff: Upper bound in seconds for a single retry delay (default: 30.0)
+        retry_budget: Total seconds allowed across all attempts and retry delays,
+                      or None for no limit (default: None)
     
     Returns:
         A tuple containing (markdown_content, original_url)
@@ -62,89 +197,30 @@ def convert_url_to_markdown(
     # Validate URL format (will raise ValidationError if invalid)
     validate_url(url)
     
-    # Set up retry mechanism
-    retries = 0
-    last_error = None
-    
-    while retries <= max_retries:
-        try:
-            # Create a DocumentConverter instance
-            converter = DocumentConverter()
-            
-            # Convert the document with timeout
-            result = converter.convert(url)
-            
-            # Check if conversion was successful and document was created
-            if result.document:
-                # Check if the document has content
-                markdown_content = result.document.export_to_markdown()
-                
-                # Validate markdown content is not empty
-                if markdown_content and len(markdown_content.strip()) > 0:
-                    return markdown_content, url
-                else:
-                    raise ConversionError(
-                        message="Conversion produced empty markdown content",
-                        input_path=url,
-                        conversion_type="url",
-                        details={"status": str(result.status)}
-                    )
-            else:
-                # Handle case where document is None but result is returned
-                error_details = {
-                    "status": str(result.status),
-                    "errors": [str(err) for err in (result.errors or [])]
-                }
-                
-                raise ConversionError(
-                    message=f"Failed to convert URL to document",
-                    input_path=url,
-                    conversion_type="url",
-                    details=error_details
-                )
-                
-        except requests.RequestException as e:
-            # Network-related errors, might be temporary
-            last_error = ConversionError(
-                message=f"HTTP request failed: {str(e)}",
-                input_path=url,
-                conversion_type="url",
-                details={"http_error": str(e)}
-            )
-        except ConversionError as e:
-            # Re-raise conversion errors that we've already formatted properly
-            last_error = e
-        except Exception as e:
-            # Catch-all for unexpected errors
-            last_error = ConversionError(
-                message=f"Unexpected conversion error: {str(e)}",
-                input_path=url,
-                conversion_type="url",
-                details={"error_type": e.__class__.__name__}
-            )
-        
-        # If we reach here, there was an error
-        retries += 1
-        
-        # If we haven't reached max retries, wait before trying again
-        if retries <= max_retries:
-            # Exponential backoff with jitter
-            sleep_time = retry_delay * (2 ** (retries - 1))
-            time.sleep(sleep_time)
-        else:
-            # We've exhausted our retries, raise the last error
-            if last_error:
-                # Add retry information to error details
-                if last_error.details:
-                    last_error.details.update({"retries": retries - 1})
-                else:
-                    last_error.details = {"retries": retries - 1}
-                raise last_error
-            else:
-                # This should never happen, but just in case
-                raise ConversionError(
-                    message="Failed to convert URL after multiple attempts",
-                    input_path=url,
-                    conversion_type="url",
-                    details={"retries": retries - 1}
-                )
\ No newline at end of file
+    # Reuse markdown from an earlier conversion of an unchanged page
+    cache_key = _url_cache_key(url, timeout)
+    markdown_content = load_cached_markdown(cache_key)
+    if markdown_content is not None:
+        return markdown_content, url
+    
+    import requests
+    
+    # Fetch over the pooled session, then convert with the shared DocumentConverter.
+    # With a retry budget, the fetch is also cut off at the budget's deadline.
+    markdown_content = convert_with_retry(
+        lambda attempt_timeout: _get_converter().convert(_fetch_document(
+            url, min(timeout, attempt_timeout) if attempt_timeout is not None else timeout
+        )),
+        input_path=url,
+        conversion_type="url",
+        failure_message="Failed to convert URL to document",
+        transient_errors=(requests.RequestException,),
+        transient_label="HTTP request failed",
+        transient_key="http_error",
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        max_backoff=max_backoff,
+        retry_budget=retry_budget
+    )
+    store_cached_markdown(cache_key, markdown_content)
+    return markdown_content, url
@@ -53,6 +53,3 @@ except ImportError as e:
     # depending on how the rest of the application handles missing components.
     # For now, we just log a warning and don't add them to __all__.
     pass
-
-# Ensure __all__ has unique entries (though unlikely to have duplicates here)
-__all__ = sorted(list(set(__all__)))
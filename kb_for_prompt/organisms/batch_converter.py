@@ -20,12 +20,15 @@ input validation, and provides detailed summary reporting.
 
 import os
 import csv
+import gc
+import multiprocessing
 import time
 import concurrent.futures
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Any, Set
-from concurrent.futures import ThreadPoolExecutor
-import pandas as pd
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from rich.console import Console
 
 # Import core converters
@@ -36,17 +39,16 @@ from kb_for_prompt.molecules.pdf_converter import convert_pdf_to_markdown
 # Import utilities
 from kb_for_prompt.atoms.type_detector import (
     detect_input_type,
-    detect_file_type,
-    is_url,
     is_file_path
 )
 from kb_for_prompt.atoms.path_utils import (
     generate_output_filename,
     ensure_directory_exists,
-    resolve_path
+    resolve_path,
+    clear_path_caches
 )
 from kb_for_prompt.atoms.input_validator import (
-    validate_input_item,
+    validate_input_items,
     validate_url,
     validate_file_path,
     validate_file_type,
@@ -65,10 +67,220 @@ from kb_for_prompt.templates.progress import (
     display_completion,
     display_progress_bar
 )
-from kb_for_prompt.templates.summary import (
-    display_conversion_summary,
-    display_dataframe_summary
-)
+from kb_for_prompt.templates.summary import display_conversion_summary
+
+# Update spinner text once per this many CSV rows, since every change triggers
+# a re-render
+SPINNER_UPDATE_INTERVAL = 1024
+
+# Read buffer for CSV input: one read(2) per MiB instead of one per 8 KiB default
+# buffer, while csv.reader still streams rows without loading the whole file
+CSV_READ_BUFFER_SIZE = 1024 * 1024
+
+# Worker threads for batch conversion: conversions mostly wait on the network or
+# docling, so the default follows concurrent.futures' I/O-bound sizing, capped to
+# avoid thread contention on large machines
+MAX_WORKERS_ENV_VAR = "KBFP_MAX_WORKERS"
+MAX_WORKERS_CAP = 32
+
+# Local file types whose CPU-bound docling conversion runs in worker processes
+FILE_INPUT_TYPES = frozenset({"pdf", "doc", "docx"})
+
+# Tasks kept in flight per worker; enough to keep every worker busy without
+# allocating a future for every input of a huge batch up front
+MAX_PENDING_PER_WORKER = 2
+
+# Inputs validated per validate_input_items call in validate_and_classify_inputs
+VALIDATION_CHUNK_SIZE = 4096
+
+# Minimum seconds between progress bar updates; completions in between are
+# batched into one update so fast batches do not trigger a render per input
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+# Per-input time budget for conversion attempts and retries, in seconds; None
+# leaves inputs unbounded, since large documents (and first-time model loading)
+# can legitimately take minutes
+DEFAULT_RETRY_BUDGET: Optional[float] = None
+
+# Invalid inputs listed individually before conversion; the rest are counted
+MAX_INVALID_INPUTS_SHOWN = 10
+
+
+def _resolve_max_workers(max_workers: Optional[int]) -> int:
+    """
+    Pick the worker count from the argument, the environment, or the CPU count.
+    
+    Args:
+        max_workers: Explicit worker count, or None to use KBFP_MAX_WORKERS
+    
+    Returns:
+        The number of worker threads to use
+    
+    Raises:
+        ValidationError: If the worker count is not a positive integer
+    """
+    value = max_workers if max_workers is not None else os.environ.get(MAX_WORKERS_ENV_VAR)
+    if value is None or value == "":
+        return min(MAX_WORKERS_CAP, (os.cpu_count() or 1) * 5)
+    
+    try:
+        max_workers = int(value)
+    except ValueError:
+        max_workers = 0
+    
+    if max_workers < 1:
+        raise ValidationError(
+            message=f"Invalid worker count: {value}. Must be a positive integer",
+            input_value=str(value),
+            validation_type="max_workers"
+        )
+    return max_workers
+
+
+def _convert_input(
+    input_data: Dict[str, Any],
+    output_dir: Path,
+    max_retries: int,
+    retry_budget: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Convert a single input item and write its markdown to the output directory.
+    
+    This is a module-level function, free of console state, so that it can run
+    in a worker thread or be pickled into a worker process.
+    
+    Args:
+        input_data: Dictionary with input details (original, validated, type),
+                    plus an optional pre-assigned output_path
+        output_dir: Directory where to save the converted markdown file
+        max_retries: Maximum number of retries for the conversion
+        retry_budget: Total seconds the conversion may spend across attempts and
+                      retry delays, or None for no limit
+    
+    Returns:
+        A dictionary with the conversion result:
+        - success: Boolean indicating if conversion was successful
+        - original: The original input string
+        - type: The input type
+        - output_path: Path to the output file (if successful)
+        - error: Error details (if failed)
+    """
+    result = {
+        "success": False,
+        "original": input_data["original"],
+        "type": input_data["type"],
+        "output_path": None,
+        "error": None
+    }
+    
+    try:
+        input_type = input_data["type"]
+        validated_input = input_data["validated"]
+        
+        # Use the output path reserved by the batch, or generate one
+        output_path = input_data.get("output_path") or generate_output_filename(
+            validated_input, output_dir
+        )
+        
+        # Perform the conversion based on input type
+        if input_type == "url":
+            markdown_content, _ = convert_url_to_markdown(
+                validated_input,
+                max_retries=max_retries,
+                retry_budget=retry_budget
+            )
+        elif input_type in ["doc", "docx"]:
+            markdown_content, _ = convert_doc_to_markdown(
+                validated_input,
+                max_retries=max_retries,
+                retry_budget=retry_budget
+            )
+        elif input_type == "pdf":
+            markdown_content, _ = convert_pdf_to_markdown(
+                validated_input,
+                max_retries=max_retries,
+                retry_budget=retry_budget
+            )
+        else:
+            raise ValueError(f"Unsupported input type: {input_type}")
+        
+        # Write the markdown content to file. Each worker writes its own output, so
+        # writes already overlap with the conversions running on other workers.
+        # Encoding up front lets the whole file go out in a single write call.
+        Path(output_path).write_bytes(markdown_content.encode('utf-8'))
+        
+        # Update result with success
+        result["success"] = True
+        result["output_path"] = str(output_path)
+    
+    except Exception as e:
+        # Handle any errors during conversion
+        result["error"] = _error_details(e)
+    
+    return result
+
+
+def _error_details(error: Exception) -> Dict[str, str]:
+    """
+    Describe a failed conversion for the result dictionary.
+    
+    Args:
+        error: The exception that ended the conversion
+    
+    Returns:
+        A dictionary with the error type ("conversion" or "unexpected") and message
+    """
+    # Determine error type
+    if isinstance(error, ConversionError):
+        error_type = "conversion"
+    else:
+        error_type = "unexpected"
+    
+    return {
+        "type": error_type,
+        "message": str(error)
+    }
+
+
+def _iter_completed(
+    submit: Callable[[Dict[str, Any]], concurrent.futures.Future],
+    inputs: Iterable[Dict[str, Any]],
+    max_pending: int
+) -> Iterator[Tuple[Dict[str, Any], concurrent.futures.Future]]:
+    """
+    Submit inputs as earlier ones complete, keeping at most max_pending in flight.
+    
+    Args:
+        submit: Function submitting one input to an executor and returning its future
+        inputs: The inputs to submit, consumed lazily
+        max_pending: Maximum number of submitted but unfinished inputs
+    
+    Yields:
+        An (input_data, future) tuple for each input as its future completes
+    """
+    pending_inputs = iter(inputs)
+    in_flight = {submit(input_data): input_data for input_data in islice(pending_inputs, max_pending)}
+    
+    while in_flight:
+        done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            input_data = in_flight.pop(future)
+            # Refill the freed slot before handing the result back
+            for next_input in islice(pending_inputs, 1):
+                in_flight[submit(next_input)] = next_input
+            yield input_data, future
+
+
+def _init_file_worker(omp_threads: int) -> None:
+    """
+    Prepare a worker process for local file conversions.
+    
+    Limits the OpenMP thread count so parallel workers do not oversubscribe the CPU.
+    
+    Args:
+        omp_threads: Number of OpenMP threads the worker's models may use
+    """
+    os.environ["OMP_NUM_THREADS"] = str(omp_threads)
 
 
 class BatchConverter:
@@ -80,17 +292,31 @@ class BatchConverter:
     detection, output file generation, and concurrent processing.
     """
     
-    def __init__(self, console: Optional[Console] = None, max_workers: int = 5):
+    def __init__(
+        self,
+        console: Optional[Console] = None,
+        max_workers: Optional[int] = None,
+        retry_budget: Optional[float] = DEFAULT_RETRY_BUDGET
+    ):
         """
         Initialize the batch converter.
         
         Args:
             console: The Rich console to print to. If None, a new console is created.
-            max_workers: Maximum number of worker threads for concurrent processing.
+            max_workers: Maximum number of worker threads for concurrent processing
+                         (default: KBFP_MAX_WORKERS, else 5 per CPU capped at 32).
+            retry_budget: Seconds each input may spend across conversion attempts and
+                          retry delays, or None for no limit (default: None).
+        
+        Raises:
+            ValidationError: If the worker count is not a positive integer.
         """
         self.console = console or Console()
-        self.max_workers = max_workers
+        self.max_workers = _resolve_max_workers(max_workers)
         self.max_retries = 3  # Maximum number of retries for conversion
+        # Seconds each input may spend on attempts and retries; when set, flaky
+        # inputs give up instead of holding a worker through every retry
+        self.retry_budget = retry_budget
     
     def run(
         self,
@@ -140,11 +366,14 @@ class BatchConverter:
                 )
                 return False, result_data
             
+            # Validate and classify once; the summary and conversion both reuse it
+            valid_inputs, invalid_inputs = self.validate_and_classify_inputs(inputs)
+            
             # Display a summary of the inputs
-            self._display_input_summary(inputs)
+            self._display_input_summary(valid_inputs, invalid_inputs)
             
             # Process the inputs concurrently
-            successful, failed = self._process_batch(inputs, output_dir)
+            successful, failed = self._process_batch(valid_inputs, invalid_inputs, output_dir)
             
             # Update result data
             result_data["successful"] = successful
@@ -160,7 +389,7 @@ class BatchConverter:
             
             # Return success if at least one conversion was successful
             return len(successful) > 0, result_data
-            
+        
         except ValidationError as e:
             # Input validation error
             display_processing_update(
@@ -169,7 +398,7 @@ class BatchConverter:
                 console=self.console
             )
             return False, result_data
-            
+        
         except FileIOError as e:
             # File I/O error
             display_processing_update(
@@ -178,7 +407,7 @@ class BatchConverter:
                 console=self.console
             )
             return False, result_data
-            
+        
         except Exception as e:
             # Unexpected error
             display_processing_update(
@@ -213,70 +442,9 @@ class BatchConverter:
                 # Validate and resolve the file path
                 file_path = validate_file_path(csv_path)
                 
-                inputs = []
                 spinner.text = f"Parsing CSV file: {file_path}"
-                
-                # --- Use standard CSV reader first ---
-                try:
-                    with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                        reader = csv.reader(f)
-                        for i, row in enumerate(reader):
-                            spinner.text = f"Reading row {i+1} from {file_path}"
-                            for value in row:
-                                value_str = str(value).strip()
-                                if value_str:
-                                    inputs.append(value_str)
-                    spinner.text = "Finished reading CSV."
-                except csv.Error as e:
-                    # If csv.reader fails, raise a FileIOError
-                    raise FileIOError(
-                        message=f"Failed to parse CSV file with standard reader: {str(e)}",
-                        file_path=str(file_path),
-                        operation="read"
-                    )
-                except Exception as e:
-                    # Catch other potential file reading errors
-                    raise FileIOError(
-                        message=f"Failed to read CSV file: {str(e)}",
-                        file_path=str(file_path),
-                        operation="read"
-                    )
-                
-                # --- Original pandas code (commented out for now) ---
-                # try:
-                #     # First, try to read as a pandas DataFrame
-                #     df = pd.read_csv(file_path)
-                #
-                #     # Extract non-empty values from all columns
-                #     for column in df.columns:
-                #         for value in df[column].dropna():
-                #             value_str = str(value).strip()
-                #             if value_str:
-                #                 inputs.append(value_str)
-                #
-                #     # Display a summary of the DataFrame
-                #     spinner.text = "CSV file loaded, analyzing data..."
-                #     display_dataframe_summary(df, title="CSV Input Summary", console=self.console)
-                #
-                # except Exception as e:
-                #     # If pandas fails, fall back to the standard CSV reader
-                #     spinner.text = "Falling back to basic CSV parsing..."
-                #
-                #     with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                #         reader = csv.reader(f)
-                #         for row in reader:
-                #             for value in row:
-                #                 value_str = str(value).strip()
-                #                 if value_str:
-                #                     inputs.append(value_str)
-                
-                # Filter out duplicates while preserving order
-                unique_inputs = []
-                seen: Set[str] = set() # Explicitly type hint seen
-                for item in inputs:
-                    if item not in seen:
-                        seen.add(item)
-                        unique_inputs.append(item)
+                # dict.fromkeys deduplicates in C while preserving first-seen order
+                unique_inputs = list(dict.fromkeys(self._iter_csv_cells(file_path, spinner)))
                 
                 if not unique_inputs:
                     spinner.text = "No inputs found in CSV."
@@ -284,7 +452,7 @@ class BatchConverter:
                     spinner.text = f"Found {len(unique_inputs)} unique inputs."
                 
                 return unique_inputs
-                
+            
             except ValidationError as e:
                 # Re-raise validation errors related to the file path itself
                 raise ValidationError(
@@ -292,11 +460,11 @@ class BatchConverter:
                     input_value=str(csv_path),
                     validation_type="csv_input"
                 )
-                
+            
             except FileIOError as e:
                 # Re-raise FileIOErrors encountered during reading/parsing
                 raise e
-                
+            
             except Exception as e:
                 # Catch any other unexpected errors during the process
                 raise FileIOError(
@@ -305,15 +473,57 @@ class BatchConverter:
                     operation="read"
                 )
     
+    def _iter_csv_cells(self, file_path: Path, spinner: Any = None) -> Iterator[str]:
+        """
+        Yield the non-empty cell values of a CSV file, stripped, in file order.
+        
+        Args:
+            file_path: Validated path to the CSV file
+            spinner: Optional spinner whose text reports reading progress
+        
+        Yields:
+            Each non-empty stripped cell value, duplicates included
+        
+        Raises:
+            FileIOError: If the file cannot be read or parsed.
+        """
+        try:
+            with open(
+                file_path, 'r', newline='', encoding='utf-8', buffering=CSV_READ_BUFFER_SIZE
+            ) as f:
+                reader = csv.reader(f)
+                for i, row in enumerate(reader):
+                    if spinner is not None and i % SPINNER_UPDATE_INTERVAL == 0:
+                        spinner.text = f"Reading row {i+1} from {file_path}"
+                    # Strip and drop empty cells in C rather than a per-cell Python loop
+                    yield from filter(None, map(str.strip, row))
+            if spinner is not None:
+                spinner.text = "Finished reading CSV."
+        except csv.Error as e:
+            # If csv.reader fails, raise a FileIOError
+            raise FileIOError(
+                message=f"Failed to parse CSV file with standard reader: {str(e)}",
+                file_path=str(file_path),
+                operation="read"
+            )
+        except Exception as e:
+            # Catch other potential file reading errors
+            raise FileIOError(
+                message=f"Failed to read CSV file: {str(e)}",
+                file_path=str(file_path),
+                operation="read"
+            )
+    
     def validate_and_classify_inputs(
         self, 
-        inputs: List[str]
+        inputs: Iterable[str]
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
         Validate and classify inputs by type.
         
         Args:
-            inputs: List of input strings to validate and classify
+            inputs: Input strings to validate and classify; may be a lazy iterable,
+                    which is consumed chunk by chunk
         
         Returns:
             A tuple containing (valid_inputs, invalid_inputs) where:
@@ -327,51 +537,47 @@ class BatchConverter:
             valid_inputs = []
             invalid_inputs = []
             
-            for i, input_str in enumerate(inputs):
-                spinner.text = f"Validating input {i+1}/{len(inputs)}..."
+            # Validate in chunks: each chunk is classified in a single pass with its
+            # file checks spread across threads, and a lazy iterable of inputs is
+            # never materialized as a whole
+            pending_inputs = iter(inputs)
+            while chunk := list(islice(pending_inputs, VALIDATION_CHUNK_SIZE)):
+                checked = len(valid_inputs) + len(invalid_inputs)
+                spinner.text = f"Validating inputs {checked+1}-{checked+len(chunk)}..."
+                results = validate_input_items(chunk)
                 
-                try:
-                    # Try to validate and classify the input
-                    input_type, validated_input = validate_input_item(input_str)
-                    
-                    # For file inputs, get the specific file type
-                    if input_type == "file":
-                        file_type = detect_file_type(validated_input)
-                        if file_type:
-                            input_type = file_type
-                        else:
-                            # This should not happen since validate_input_item checks file type
-                            raise ValidationError(
-                                message="Unsupported file type",
-                                input_value=input_str,
-                                validation_type="file_type"
-                            )
-                    
-                    valid_inputs.append({
-                        "original": input_str,
-                        "validated": validated_input,
-                        "type": input_type
-                    })
-                    
-                except ValidationError as e:
-                    invalid_inputs.append({
-                        "original": input_str,
-                        "error": e.message,
-                        "details": e.details if hasattr(e, 'details') else None
-                    })
+                # Failures come back as ValidationError values; record them as data
+                # rather than raising and catching each one
+                for input_str, (input_type, validated_input) in zip(chunk, results):
+                    if isinstance(validated_input, ValidationError):
+                        invalid_inputs.append({
+                            "original": input_str,
+                            "error": validated_input.message,
+                            "details": validated_input.details
+                        })
+                    else:
+                        # File inputs already carry their detected file type
+                        valid_inputs.append({
+                            "original": input_str,
+                            "validated": validated_input,
+                            "type": input_type
+                        })
             
             return valid_inputs, invalid_inputs
     
     def _process_batch(
         self,
-        inputs: List[str],
+        valid_inputs: List[Dict[str, Any]],
+        invalid_inputs: List[Dict[str, Any]],
         output_dir: Path
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Process a batch of inputs concurrently.
+        Process a batch of validated inputs concurrently.
         
         Args:
-            inputs: List of input strings to process
+            valid_inputs: Validated input details from validate_and_classify_inputs
+            invalid_inputs: Validation failures from validate_and_classify_inputs,
+                            reported as failed conversions
             output_dir: Directory where to save the converted markdown files
         
         Returns:
@@ -379,9 +585,6 @@ class BatchConverter:
             - successful is a list of successful conversion details
             - failed is a list of failed conversion details
         """
-        # First, validate and classify all inputs
-        valid_inputs, invalid_inputs = self.validate_and_classify_inputs(inputs)
-        
         # Initialize results lists
         successful = []
         failed = invalid_inputs.copy()  # Start with invalid inputs
@@ -395,6 +598,16 @@ class BatchConverter:
             )
             return successful, failed
         
+        # Scope output name reservations to this batch: outputs of an earlier batch
+        # may have been deleted since, and names its failed inputs took were never written
+        clear_path_caches()
+        
+        # Docling holds the GIL while parsing local files, so when there is more
+        # than one they are converted in worker processes; URLs stay on threads
+        cpu_count = os.cpu_count() or 1
+        file_count = sum(1 for input_data in valid_inputs if input_data["type"] in FILE_INPUT_TYPES)
+        file_workers = min(cpu_count, file_count)
+        
         # Setup progress tracking
         with display_progress_bar(
             f"Converting {len(valid_inputs)} inputs",
@@ -402,23 +615,73 @@ class BatchConverter:
             console=self.console
         ) as progress:
             # Process valid inputs concurrently
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_input = {
-                    executor.submit(self._process_single_input, input_data, output_dir): input_data
-                    for input_data in valid_inputs
-                }
+            with ExitStack() as stack:
+                thread_executor = stack.enter_context(
+                    ThreadPoolExecutor(max_workers=self.max_workers)
+                )
+                process_executor = None
+                if file_workers > 1:
+                    # Split the cores between workers to avoid oversubscription
+                    # Spawn rather than fork: URL worker threads and the progress
+                    # refresh thread may hold locks a forked child would inherit
+                    process_executor = stack.enter_context(ProcessPoolExecutor(
+                        max_workers=file_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_file_worker,
+                        initargs=(max(1, cpu_count // file_workers),)
+                    ))
                 
-                # Process results as they complete
-                for i, future in enumerate(concurrent.futures.as_completed(future_to_input)):
-                    input_data = future_to_input[future]
-                    
-                    # Update progress
-                    progress.update(
-                        progress.task_id,
-                        description=f"Processing {i+1}/{len(valid_inputs)}",
-                        advance=1
+                def submit(input_data: Dict[str, Any]) -> concurrent.futures.Future:
+                    # Reserve the output name here, on the submitting thread: worker
+                    # processes each keep their own reserved names, so names chosen
+                    # inside workers could collide
+                    try:
+                        input_data["output_path"] = generate_output_filename(
+                            input_data["validated"], output_dir
+                        )
+                    except Exception as e:
+                        # A failed reservation fails this input only, as it would
+                        # inside _convert_input, instead of aborting the batch
+                        future = concurrent.futures.Future()
+                        future.set_result({
+                            "success": False,
+                            "original": input_data["original"],
+                            "type": input_data["type"],
+                            "output_path": None,
+                            "error": _error_details(e)
+                        })
+                        return future
+                    if process_executor is not None and input_data["type"] in FILE_INPUT_TYPES:
+                        return process_executor.submit(
+                            _convert_input, input_data, output_dir,
+                            self.max_retries, self.retry_budget
+                        )
+                    return thread_executor.submit(
+                        self._process_single_input, input_data, output_dir
                     )
+                
+                # Keep a bounded number of tasks in flight rather than one future per input
+                total_workers = self.max_workers + (file_workers if process_executor else 0)
+                max_pending = MAX_PENDING_PER_WORKER * total_workers
+                
+                # Process results as they complete
+                total = len(valid_inputs)
+                unreported = 0
+                last_update = time.monotonic()
+                for i, (input_data, future) in enumerate(
+                    _iter_completed(submit, valid_inputs, max_pending)
+                ):
+                    # Update progress at a bounded rate, always including the last item
+                    unreported += 1
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_UPDATE_INTERVAL or i + 1 == total:
+                        progress.update(
+                            progress.task_id,
+                            description=f"Processing {i+1}/{total}",
+                            advance=unreported
+                        )
+                        unreported = 0
+                        last_update = now
                     
                     try:
                         # Get the result from the future
@@ -445,6 +708,10 @@ class BatchConverter:
                             "type": input_data["type"]
                         })
         
+        # Conversions leave many large, cyclic docling objects behind; collect
+        # them now rather than carrying them into the summary or the next batch
+        gc.collect()
+        
         return successful, failed
     
     def _process_single_input(
@@ -463,91 +730,47 @@ class BatchConverter:
             output_dir: Directory where to save the converted markdown file
         
         Returns:
-            A dictionary with the conversion result:
-            - success: Boolean indicating if conversion was successful
-            - original: The original input string
-            - type: The input type
-            - output_path: Path to the output file (if successful)
-            - error: Error details (if failed)
+            A dictionary with the conversion result, as returned by _convert_input
         """
-        result = {
-            "success": False,
-            "original": input_data["original"],
-            "type": input_data["type"],
-            "output_path": None,
-            "error": None
-        }
-        
-        try:
-            input_type = input_data["type"]
-            validated_input = input_data["validated"]
-            
-            # Generate output filename
-            output_path = generate_output_filename(validated_input, output_dir)
-            
-            # Perform the conversion based on input type
-            if input_type == "url":
-                markdown_content, _ = convert_url_to_markdown(
-                    validated_input,
-                    max_retries=self.max_retries
-                )
-            elif input_type in ["doc", "docx"]:
-                markdown_content, _ = convert_doc_to_markdown(
-                    validated_input,
-                    max_retries=self.max_retries
-                )
-            elif input_type == "pdf":
-                markdown_content, _ = convert_pdf_to_markdown(
-                    validated_input,
-                    max_retries=self.max_retries
-                )
-            else:
-                raise ValueError(f"Unsupported input type: {input_type}")
-            
-            # Write the markdown content to file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-            
-            # Update result with success
-            result["success"] = True
-            result["output_path"] = str(output_path)
-            
-        except Exception as e:
-            # Handle any errors during conversion
-            error_message = str(e)
-            
-            # Determine error type
-            if isinstance(e, ConversionError):
-                error_type = "conversion"
-            else:
-                error_type = "unexpected"
-            
-            result["error"] = {
-                "type": error_type,
-                "message": error_message
-            }
-        
-        return result
+        return _convert_input(input_data, output_dir, self.max_retries, self.retry_budget)
     
-    def _display_input_summary(self, inputs: List[str]) -> None:
+    def _display_input_summary(
+        self,
+        valid_inputs: List[Dict[str, Any]],
+        invalid_inputs: List[Dict[str, Any]]
+    ) -> None:
         """
-        Display a summary of the inputs to be processed.
+        Display a summary of the inputs to be processed and any validation errors.
         
         Args:
-            inputs: List of input strings
+            valid_inputs: Validated input details from validate_and_classify_inputs
+            invalid_inputs: Validation failures from validate_and_classify_inputs
         """
-        url_count = 0
-        file_count = 0
+        # Count URLs and files from the types assigned during validation
+        url_count = sum(1 for input_data in valid_inputs if input_data["type"] == "url")
+        file_count = len(valid_inputs) - url_count
+        total = len(valid_inputs) + len(invalid_inputs)
         
-        # Count URLs and files
-        for input_str in inputs:
-            if is_url(input_str):
-                url_count += 1
-            else:
-                file_count += 1
+        message = f"Loaded {total} inputs: {url_count} URLs and {file_count} files"
+        if invalid_inputs:
+            message += f" ({len(invalid_inputs)} invalid)"
         
         display_processing_update(
-            f"Loaded {len(inputs)} inputs: {url_count} URLs and {file_count} files",
+            message,
             status="info",
             console=self.console
-        )
\ No newline at end of file
+        )
+        
+        # Report validation errors before any conversion starts
+        for invalid in invalid_inputs[:MAX_INVALID_INPUTS_SHOWN]:
+            display_processing_update(
+                f"Skipping {invalid['original']}: {invalid['error']}",
+                status="warning",
+                console=self.console
+            )
+        if len(invalid_inputs) > MAX_INVALID_INPUTS_SHOWN:
+            display_processing_update(
+                f"...and {len(invalid_inputs) - MAX_INVALID_INPUTS_SHOWN} more invalid inputs",
+                status="warning",
+                console=self.console
+            )
@@ -6,9 +6,19 @@ use a Language Model (LLM) via LiteLlmClient to condense its content
 based on a specific prompt, and save the condensed version to a new file.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import mmap
+import os
+import re
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Literal, Tuple
 
 # Attempt to import LiteLlmClient and handle potential ImportError if litellm is not installed
 try:
@@ -25,72 +35,472 @@ except ImportError:
             raise ImportError("LiteLlmClient could not be imported. Ensure 'litellm' is installed and kb_for_prompt.organisms.llm_client is accessible.")
         def invoke(self, *args: Any, **kwargs: Any) -> Optional[str]:
             raise NotImplementedError("LLM client is not available because 'litellm' is not installed.")
+        async def ainvoke(self, *args: Any, **kwargs: Any) -> Optional[str]:
+            raise NotImplementedError("LLM client is not available because 'litellm' is not installed.")
+        def invoke_stream(self, *args: Any, **kwargs: Any) -> Iterator[str]:
+            raise NotImplementedError("LLM client is not available because 'litellm' is not installed.")
 
-# Configure logging
-# Consider moving configuration to a central place if the application grows
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - [%(name)s] %(message)s')
+# Library module: leave handler and format configuration to the application
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
-# --- LLM Prompt for Condensing ---
-CONDENSE_PROMPT = """
-Review the knowledge base provided below and condense it down to just the key information the agent needs to know to help the user.
+# --- LLM Prompts for Condensing ---
+# The instructions are sent unchanged as the system message, ahead of the
+# knowledge base, so providers can cache them as a shared prompt prefix.
+CONDENSE_SYSTEM_PROMPT = """
+Review the knowledge base provided by the user and condense it down to just the key information the agent needs to know to help the user.
 
 Instead of listing each article in its entirety, organize the content by meaningful topic, and then provide a extremely detailed summary of the topic content as taken from each article that discusses that topic. Where some of the existing content discusses the same topic, merge that content into the detailed summary. Where some of the existing content provides conflicting or different points of view on the same topic, include all points of view and indicate which author provided the point of view.
 
 There is no token limit for the knowledge base.
+"""
 
+CONDENSE_USER_PROMPT = """
 --- KNOWLEDGE BASE CONTENT ---
 {knowledge_base_content}
 """
 
+# --- LLM Prompts for Condensing One Section of a Large Knowledge Base ---
+SECTION_CONDENSE_SYSTEM_PROMPT = """
+Review the section of a knowledge base provided by the user and summarize it for an agent that will use it to help the user.
+
+Keep every fact, figure, and point of view, along with the author who provided it. Remove only repetition and filler. Keep the headings so topics can be merged with other sections later.
+"""
+
+SECTION_CONDENSE_USER_PROMPT = """
+--- KNOWLEDGE BASE SECTION ---
+{section_content}
+"""
+
+# The user prompts split around their single slot, so a prompt holding a large
+# knowledge base is built by one join instead of str.format scanning the template
+_CONDENSE_PROMPT_PREFIX, _CONDENSE_PROMPT_SUFFIX = CONDENSE_USER_PROMPT.split("{knowledge_base_content}")
+_SECTION_PROMPT_PREFIX, _SECTION_PROMPT_SUFFIX = SECTION_CONDENSE_USER_PROMPT.split("{section_content}")
+
 # --- Model Specification ---
 # Using the specific model requested in the specification
 CONDENSE_MODEL = "gemini/gemini-2.5-pro-preview-03-25"
 
+# Fast, cheap model tried first; its output is only kept if it passes the draft check
+CONDENSE_MODEL_DRAFT = "gemini/gemini-1.5-flash"
+
+# Trade-off between speed and cost on one side and condensation quality on the other
+CondenseQuality = Literal["fast", "balanced", "best"]
+
+# Models tried in order for each quality setting; every model but the last must
+# pass the draft check, otherwise the next model is tried
+CONDENSE_QUALITY_MODELS: Dict[str, Tuple[str, ...]] = {
+    "fast": (CONDENSE_MODEL_DRAFT,),
+    "balanced": (CONDENSE_MODEL_DRAFT, CONDENSE_MODEL),
+    "best": (CONDENSE_MODEL,),
+}
+
+# A draft shorter than this fraction of the knowledge base is assumed to have dropped content
+DRAFT_MIN_LENGTH_RATIO = 0.1
+
+# Name of the condensed file written next to the knowledge base
+CONDENSED_FILENAME = "knowledge_base_condensed.md"
+
+# Name of the structured condensed file written next to the knowledge base
+CONDENSED_JSON_FILENAME = "knowledge_base_condensed.json"
+
+# Schema of the structured condensed knowledge base: one entry per topic
+CONDENSE_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "condensed_kb",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "topics": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "summary": {"type": "string"},
+                            "sources": {"type": "array", "items": {"type": "string"}},
+                        },
+                        "required": ["name", "summary", "sources"],
+                    },
+                },
+            },
+            "required": ["topics"],
+        },
+    },
+}
+
+# Suffix of the sidecar file recording which input and model produced a
+# condensed file, so an unchanged knowledge base is not condensed again
+CHECKPOINT_SUFFIX = ".meta.json"
+
+# Directory next to the knowledge base caching LLM responses, so condensing an
+# unchanged knowledge base again does not repeat the LLM calls
+LLM_CACHE_DIRNAME = ".kb_cache"
+
+# Default cap on concurrent LLM calls when condensing several knowledge bases or sections
+DEFAULT_MAX_CONCURRENT_CONDENSATIONS = 4
+
+# Knowledge bases longer than this many characters are summarized section by
+# section in parallel before the final condensation pass
+CONDENSE_CHUNK_CHARS = 30000
+
+# Top-level (# and ##) markdown headings, where sections are split
+_SECTION_HEADING_PATTERN = re.compile(r"#{1,2}(?:\s|$)")
+
+# Opening or closing line of a fenced code block
+_CODE_FENCE_PATTERN = re.compile(r"\s*(?:```|~~~)")
+
+# HTML comments, which converted pages often carry but the LLM never needs
+_HTML_COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+
+# Two or more blank lines in a row
+_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
 
-def condense_knowledge_base(kb_file_path: Path) -> Optional[Path]:
+# Start of a ## (or deeper) topic heading; the text searched always starts with a
+# newline, so a heading on the first line is found too
+_TOPIC_HEADING_PATTERN = re.compile(r"\n##")
+
+
+def _condense_prompt(kb_content: str) -> str:
     """
-    Condenses a knowledge base Markdown file using an LLM.
+    Builds the user prompt for the final condensation.
 
-    Reads the content of the input file, sends it to an LLM with a specific
-    prompt for condensation, and writes the result to a new file named
-    'knowledge_base_condensed.md' in the same directory as the input file.
+    Args:
+        kb_content: The knowledge base, or the joined summaries of its sections.
+
+    Returns:
+        CONDENSE_USER_PROMPT with the content filled in.
+    """
+    return "".join((_CONDENSE_PROMPT_PREFIX, kb_content, _CONDENSE_PROMPT_SUFFIX))
+
+
+def _section_prompt(section: str) -> str:
+    """
+    Builds the user prompt summarizing one section of a large knowledge base.
 
     Args:
-        kb_file_path: Path object pointing to the knowledge base markdown file.
+        section: A chunk from _split_markdown_by_headings.
 
     Returns:
-        The Path object of the created condensed file if successful.
-        Returns None if any step in the process fails (e.g., file reading error,
-        LLM client instantiation error, LLM invocation error, file writing error,
-        or if the 'litellm' library is unavailable).
+        SECTION_CONDENSE_USER_PROMPT with the section filled in.
+    """
+    return "".join((_SECTION_PROMPT_PREFIX, section, _SECTION_PROMPT_SUFFIX))
+
+
+def _dedupe_paragraphs(md: str) -> str:
+    """
+    Removes repeated boilerplate from markdown before it is sent to the LLM.
+
+    HTML comments are stripped, runs of blank lines are collapsed to one, and
+    only the first copy of each paragraph is kept, since knowledge bases built
+    from several pages repeat navigation, license and table-of-contents text
+    that the LLM would otherwise read and echo back. Headings and fenced code
+    blocks are always kept, so repeated headings still separate the articles
+    they belong to and no code block loses its fences.
+
+    Args:
+        md: The knowledge base markdown.
+
+    Returns:
+        The markdown without comments, extra blank lines and duplicate paragraphs.
+    """
+    text = _BLANK_LINES_PATTERN.sub("\n\n", _HTML_COMMENT_PATTERN.sub("", md))
+
+    seen = set()
+    kept: List[str] = []
+    in_fence = False
+    for paragraph in text.split("\n\n"):
+        fence_lines = sum(1 for line in paragraph.split("\n") if _CODE_FENCE_PATTERN.match(line))
+        key = paragraph.strip()
+        if in_fence or fence_lines or key.startswith("#") or key not in seen:
+            kept.append(paragraph)
+            seen.add(key)
+        in_fence ^= fence_lines % 2 == 1
+    deduped = "\n\n".join(kept)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        saved = len(md.encode("utf-8")) - len(deduped.encode("utf-8"))
+        logger.debug(f"Removed {saved} bytes of comments and duplicate paragraphs from the knowledge base.")
+    return deduped
+
+
+def _split_markdown_by_headings(text: str, max_chars: int = CONDENSE_CHUNK_CHARS) -> List[str]:
+    """
+    Splits markdown into chunks of at most max_chars at top-level headings.
+
+    Sections start at '#' and '##' headings outside fenced code blocks and
+    are packed in order into as few chunks as fit. A section longer than
+    max_chars is split between paragraphs, and a paragraph longer than
+    max_chars is cut to size. Joining the chunks gives back the input.
+
+    Args:
+        text: The markdown to split.
+        max_chars: The maximum length of a chunk.
+
+    Returns:
+        The chunks, in order; a single chunk if the text already fits.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    sections: List[str] = []
+    current: List[str] = []
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if _CODE_FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence and current and _SECTION_HEADING_PATTERN.match(line):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+
+    def pieces() -> Iterator[str]:
+        for section in sections:
+            if len(section) <= max_chars:
+                yield section
+                continue
+            for paragraph in re.split(r"(?<=\n\n)", section):
+                for start in range(0, len(paragraph), max_chars):
+                    yield paragraph[start:start + max_chars]
+
+    return _pack_chunks(pieces(), max_chars)
+
+
+def _pack_chunks(pieces: Iterable[str], max_chars: int) -> List[str]:
+    """
+    Concatenates consecutive pieces into chunks of at most max_chars.
+
+    Args:
+        pieces: Strings no longer than max_chars, in order.
+        max_chars: The maximum length of a chunk.
+
+    Returns:
+        The packed chunks, in order.
+    """
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _join_section_summaries(summaries: List[Optional[str]], model: str) -> Optional[str]:
+    """
+    Joins per-section summaries into the input for the final condensation.
+
+    Args:
+        summaries: The LLM's summary of each section, None where it failed.
+        model: The model that summarized the sections, for logging.
+
+    Returns:
+        The summaries separated by blank lines, or None if any section failed,
+        since condensing without it would silently drop part of the knowledge base.
+    """
+    failed = sum(1 for summary in summaries if not summary)
+    if failed:
+        logger.error(f"Failed to summarize {failed} of {len(summaries)} knowledge base sections with model {model}.")
+        return None
+    return "\n\n".join(summaries)
+
+
+def _condense_sections(
+    llm_client: LiteLlmClient,
+    sections: List[str],
+    model: str = CONDENSE_MODEL
+) -> Optional[str]:
+    """
+    Summarizes the sections of a large knowledge base in parallel.
+
+    Args:
+        llm_client: The client to summarize with.
+        sections: Chunks from _split_markdown_by_headings.
+        model: The model to summarize with.
+
+    Returns:
+        The joined summaries, or None if any section could not be summarized.
+    """
+    logger.info(f"Summarizing {len(sections)} knowledge base sections with model: {model}")
+    prompts = [_section_prompt(section) for section in sections]
+    try:
+        summaries = llm_client.invoke_many(
+            prompts,
+            model,
+            max_concurrency=DEFAULT_MAX_CONCURRENT_CONDENSATIONS,
+            latency_optimized=True,
+            system_prompt=SECTION_CONDENSE_SYSTEM_PROMPT
+        )
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during the LLM invoke call: {e}", exc_info=True)
+        return None
+    return _join_section_summaries(summaries, model)
+
+
+async def _acondense_sections(
+    llm_client: LiteLlmClient,
+    sections: List[str],
+    semaphore: asyncio.Semaphore,
+    model: str = CONDENSE_MODEL
+) -> Optional[str]:
+    """
+    Summarizes the sections of a large knowledge base concurrently.
+
+    Args:
+        llm_client: The client to summarize with.
+        sections: Chunks from _split_markdown_by_headings.
+        semaphore: Limits the LLM calls in flight, shared with other work.
+        model: The model to summarize with.
+
+    Returns:
+        The joined summaries, or None if any section could not be summarized.
+    """
+    async def summarize(section: str) -> Optional[str]:
+        async with semaphore:
+            return await llm_client.ainvoke(
+                prompt=_section_prompt(section),
+                model=model,
+                latency_optimized=True,
+                system_prompt=SECTION_CONDENSE_SYSTEM_PROMPT
+            )
+
+    logger.info(f"Summarizing {len(sections)} knowledge base sections with model: {model}")
+    try:
+        summaries = await asyncio.gather(*(summarize(section) for section in sections))
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during the LLM invoke call: {e}", exc_info=True)
+        return None
+    return _join_section_summaries(list(summaries), model)
+
+
+def _read_text_mapped(file_path: Path) -> str:
+    """
+    Reads a UTF-8 text file by decoding a memory map of it.
+
+    Decoding straight from the mapping means the file's bytes are never
+    copied onto the heap next to the decoded text, roughly halving peak
+    memory for large knowledge bases compared to `Path.read_text`. Newlines
+    are translated like `read_text` does.
+
+    Args:
+        file_path: The file to read.
+
+    Returns:
+        The file's content.
 
     Raises:
-        This function aims to handle errors internally and return None on failure,
-        but underlying operations (like file I/O or LLM client calls) could
-        potentially raise exceptions if not caught internally by those components
-        or if unexpected errors occur. Standard exceptions like FileNotFoundError
-        or IOError might occur during file operations if initial checks fail,
-        and errors from the LLM client (like API errors) might occur during invocation.
+        OSError: If the file cannot be opened or mapped.
+        UnicodeDecodeError: If the file is not valid UTF-8.
     """
-    logger.info(f"Starting condensation process for: {kb_file_path}")
+    with file_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                text = str(view, "utf-8")
 
-    # --- 1. Validate and Read Input File ---
-    kb_content: str
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _prompt_fits(llm_client: LiteLlmClient, full_prompt: str, model: str = CONDENSE_MODEL) -> bool:
+    """
+    Checks that the condensing prompt fits the model before sending it.
+
+    Large knowledge bases are already summarized section by section, but the
+    joined summaries can still be too long; refusing locally saves uploading
+    a request the provider would reject.
+
+    Args:
+        llm_client: The client that would send the prompt.
+        full_prompt: The user prompt holding the knowledge base or its summaries.
+        model: The model the prompt would be sent to.
+
+    Returns:
+        True if the prompt can be sent.
+    """
     try:
-        if not kb_file_path.is_file():
-            # Log specific error for not found vs not a file
-            if not kb_file_path.exists():
-                 logger.error(f"Input file not found: {kb_file_path}")
-            else:
-                 logger.error(f"Input path exists but is not a file: {kb_file_path}")
-            # Raise FileNotFoundError or a custom error if needed, but spec asks to return None
-            # raise FileNotFoundError(f"Input file not found or is not a file: {kb_file_path}")
+        fits = llm_client.fits_context(full_prompt, model, CONDENSE_SYSTEM_PROMPT)
+    except Exception as e:
+        # The check is only a guardrail; let the provider decide if counting fails
+        logger.warning(f"Could not count prompt tokens for model {model}: {e}")
+        return True
+    if not fits:
+        logger.error(f"Knowledge base is too large to condense with model {model}.")
+    return fits
+
+
+def _passes_draft_check(condensed_length: int, has_topic_heading: bool, min_length: int, model: str) -> bool:
+    """
+    Checks whether a draft condensation is good enough to keep.
+
+    A cheap model's output is only trusted if it is not suspiciously short and
+    is organized under ## topic headings as the prompt asks; otherwise the
+    next, stronger model is tried.
+
+    Args:
+        condensed_length: Number of characters the draft model produced.
+        has_topic_heading: Whether the draft contains a ## heading.
+        min_length: The draft must be longer than this many characters.
+        model: The draft model, for logging.
+
+    Returns:
+        True if the draft can be kept.
+    """
+    if condensed_length > min_length and has_topic_heading:
+        return True
+    logger.warning(f"Condensed content from model {model} failed the draft check "
+                   f"({condensed_length} characters, topic headings: {has_topic_heading}).")
+    return False
+
+
+def _draft_min_length(kb_content: str) -> int:
+    """
+    Computes the length a draft condensation of a knowledge base must exceed.
+
+    Args:
+        kb_content: The knowledge base content as read from disk.
+
+    Returns:
+        DRAFT_MIN_LENGTH_RATIO of the knowledge base's length, in characters.
+    """
+    return int(len(kb_content) * DRAFT_MIN_LENGTH_RATIO)
+
+
+def _read_knowledge_base(kb_file_path: Path) -> Optional[str]:
+    """
+    Reads the knowledge base file to be condensed.
+
+    Args:
+        kb_file_path: Path object pointing to the knowledge base markdown file.
+
+    Returns:
+        The file content, or None if the path is not a readable file.
+    """
+    try:
+        # One stat tells a missing path from one that is not a regular file
+        try:
+            file_stat = kb_file_path.stat()
+        except FileNotFoundError:
+            logger.error(f"Input file not found: {kb_file_path}")
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            logger.error(f"Input path exists but is not a file: {kb_file_path}")
             return None
 
         logger.info(f"Reading content from {kb_file_path}...")
-        kb_content = kb_file_path.read_text(encoding='utf-8')
-        logger.debug(f"Successfully read {len(kb_content)} characters from {kb_file_path}.")
+        kb_content = _read_text_mapped(kb_file_path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Successfully read {len(kb_content)} characters from {kb_file_path}.")
+        return kb_content
 
     except (IOError, OSError) as e:
         logger.error(f"Error reading file {kb_file_path}: {e}", exc_info=True)
@@ -101,19 +511,30 @@ def condense_knowledge_base(kb_file_path: Path) -> Optional[Path]:
         logger.error(f"Unexpected error reading file {kb_file_path}: {e}", exc_info=True)
         return None
 
-    # --- 2. Check Prerequisite and Instantiate LLM Client ---
+
+def _create_llm_client(cache_dir: Optional[Path] = None) -> Optional[LiteLlmClient]:
+    """
+    Instantiates the LLM client used for condensation.
+
+    Args:
+        cache_dir: Optional directory for the client's response cache.
+
+    Returns:
+        A LiteLlmClient, or None if 'litellm' is unavailable or the client
+        could not be created.
+    """
     if not LITELLM_AVAILABLE:
         logger.error("Cannot condense knowledge base: The 'litellm' library is not installed or failed to load.")
         # Optionally raise an error here if this is considered a critical failure condition
         # raise ImportError("Condensation requires the 'litellm' library, which is not available.")
         return None
 
-    llm_client: LiteLlmClient
     try:
         # API key handling might be needed depending on LiteLLM setup (e.g., env vars)
         # Pass API key if required: llm_client = LiteLlmClient(api_key="YOUR_API_KEY")
-        llm_client = LiteLlmClient()
+        llm_client = LiteLlmClient(cache_dir=cache_dir)
         logger.info("LiteLlmClient instantiated successfully.")
+        return llm_client
     except ImportError as e: # Catch error if dummy class was used
          logger.error(f"Failed to instantiate LiteLlmClient: {e}", exc_info=False) # Keep log clean
          return None
@@ -121,34 +542,37 @@ def condense_knowledge_base(kb_file_path: Path) -> Optional[Path]:
         logger.error(f"Unexpected error instantiating LiteLlmClient: {e}", exc_info=True)
         return None
 
-    # --- 3. Prepare Prompt and Call LLM ---
-    full_prompt = CONDENSE_PROMPT.format(knowledge_base_content=kb_content)
 
-    logger.info(f"Sending request to LLM model: {CONDENSE_MODEL}")
-    condensed_content: Optional[str] = None
-    try:
-        # The invoke method in LiteLlmClient should handle specific litellm API errors
-        condensed_content = llm_client.invoke(prompt=full_prompt, model=CONDENSE_MODEL)
-    except Exception as e: # Catch unexpected errors during the invoke call itself
-        # This might happen if invoke raises an error not caught internally
-        logger.error(f"An unexpected error occurred during the LLM invoke call: {e}", exc_info=True)
-        return None
+def _write_condensed(
+    kb_file_path: Path,
+    condensed_content: Optional[str],
+    model: str = CONDENSE_MODEL
+) -> Optional[Path]:
+    """
+    Writes the LLM's condensed content next to the knowledge base file.
+
+    Args:
+        kb_file_path: Path object pointing to the knowledge base markdown file.
+        condensed_content: The content returned by the LLM, or None on failure.
+        model: The model that produced the content, for logging.
 
-    # --- 4. Handle LLM Response ---
+    Returns:
+        The Path of the condensed file, or None if there was no content to
+        write or writing failed.
+    """
     if not condensed_content:
         # LiteLlmClient's invoke method already logs errors, but we add context here.
-        logger.error(f"LLM call failed or returned empty content for model {CONDENSE_MODEL}.")
+        logger.error(f"LLM call failed or returned empty content for model {model}.")
         # Optionally raise a specific error
-        # raise KbForPromptError(message="LLM failed to generate condensed content.", details={"model": CONDENSE_MODEL})
+        # raise KbForPromptError(message="LLM failed to generate condensed content.", details={"model": model})
         return None
 
     logger.info("Received condensed content from LLM.")
     # Avoid logging potentially large content, log length instead
-    logger.debug(f"Condensed content length: {len(condensed_content)} characters.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Condensed content length: {len(condensed_content)} characters.")
 
-    # --- 5. Calculate Output Path and Write File ---
-    output_filename = "knowledge_base_condensed.md"
-    output_path = kb_file_path.parent / output_filename
+    output_path = kb_file_path.parent / CONDENSED_FILENAME
 
     logger.info(f"Attempting to write condensed knowledge base to: {output_path}")
     try:
@@ -163,9 +587,594 @@ def condense_knowledge_base(kb_file_path: Path) -> Optional[Path]:
         logger.error(f"Unexpected error writing file {output_path}: {e}", exc_info=True)
         return None
 
-    # --- 6. Return Output Path ---
     return output_path
 
+
+def _stream_condensed(
+    kb_file_path: Path,
+    deltas: Iterator[str],
+    model: str = CONDENSE_MODEL,
+    draft_min_length: Optional[int] = None
+) -> Optional[Path]:
+    """
+    Writes streamed LLM output next to the knowledge base file as it arrives.
+
+    The deltas go to a '.part' file that only replaces the condensed file once
+    the stream has finished, so a failed or empty response never leaves a
+    truncated condensed file behind.
+
+    Args:
+        kb_file_path: Path object pointing to the knowledge base markdown file.
+        deltas: The pieces of the LLM's response, in order.
+        model: The model producing the response, for logging.
+        draft_min_length: If given, the response is a draft and is discarded
+                          unless it passes _passes_draft_check with this minimum
+                          length.
+
+    Returns:
+        The Path of the condensed file, or None if the stream failed, was
+        empty, was a draft that failed the check, or writing failed.
+    """
+    output_path = kb_file_path.parent / CONDENSED_FILENAME
+    partial_path = output_path.with_name(output_path.name + ".part")
+
+    logger.info(f"Attempting to write condensed knowledge base to: {output_path}")
+    written = 0
+    stream_error: Optional[Exception] = None
+    # Headings are tracked as the deltas arrive, so drafts need not be kept in memory
+    has_topic_heading = False
+    tail = "\n"
+    try:
+        with partial_path.open("w", encoding='utf-8') as output_file:
+            while True:
+                try:
+                    delta = next(deltas, None)
+                except Exception as e: # Errors from the LLM, not from writing
+                    stream_error = e
+                    break
+                if delta is None:
+                    break
+                output_file.write(delta)
+                written += len(delta)
+                if draft_min_length is not None and not has_topic_heading:
+                    # Keep the last two characters so a heading split across deltas is still found
+                    window = tail + delta
+                    has_topic_heading = _TOPIC_HEADING_PATTERN.search(window) is not None
+                    tail = window[-2:]
+
+        if stream_error is not None or not written:
+            partial_path.unlink(missing_ok=True)
+            if stream_error is not None:
+                logger.error(f"An unexpected error occurred during the LLM invoke call: {stream_error}", exc_info=stream_error)
+            else:
+                logger.error(f"LLM call failed or returned empty content for model {model}.")
+            return None
+
+        if draft_min_length is not None and not _passes_draft_check(
+            written, has_topic_heading, draft_min_length, model
+        ):
+            partial_path.unlink(missing_ok=True)
+            return None
+
+        partial_path.replace(output_path)
+    except (IOError, OSError) as e:
+        logger.error(f"Error writing condensed file {output_path}: {e}", exc_info=True)
+        try:
+            partial_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+    logger.info("Received condensed content from LLM.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Condensed content length: {written} characters.")
+    logger.info(f"Successfully wrote condensed file: {output_path}")
+    return output_path
+
+
+def _parse_condensed_json(content: Optional[str], model: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses and checks a structured condensation returned by the LLM.
+
+    Args:
+        content: The LLM's response, or None on failure.
+        model: The model that produced the response, for logging.
+
+    Returns:
+        The condensed knowledge base following CONDENSE_RESPONSE_FORMAT, or
+        None if the response is missing or does not follow the schema.
+    """
+    if not content:
+        logger.error(f"LLM call failed or returned empty content for model {model}.")
+        return None
+    try:
+        condensed = json.loads(content)
+        for topic in condensed["topics"]:
+            if not isinstance(topic["name"], str) or not isinstance(topic["summary"], str):
+                raise TypeError(f"topic fields must be strings: {topic!r}")
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"LLM returned invalid structured content for model {model}: {e}")
+        return None
+    return condensed
+
+
+def _render_condensed_markdown(condensed: Dict[str, Any]) -> str:
+    """
+    Renders a structured condensation as markdown, one ## section per topic.
+
+    Args:
+        condensed: A condensed knowledge base from _parse_condensed_json.
+
+    Returns:
+        The markdown.
+    """
+    sections = []
+    for topic in condensed["topics"]:
+        section = f"## {topic['name']}\n\n{topic['summary']}"
+        if topic.get("sources"):
+            section += "\n\nSources: " + ", ".join(topic["sources"])
+        sections.append(section)
+    return "\n\n".join(sections) + "\n"
+
+
+def _condense_structured(
+    llm_client: LiteLlmClient,
+    kb_file_path: Path,
+    full_prompt: str,
+    model: str,
+    draft_min_length: Optional[int] = None
+) -> Optional[Path]:
+    """
+    Condenses into JSON and writes it next to the knowledge base, with its markdown rendering.
+
+    Args:
+        llm_client: The client to condense with.
+        kb_file_path: Path object pointing to the knowledge base markdown file.
+        full_prompt: The user prompt holding the knowledge base or its summaries.
+        model: The model to condense with.
+        draft_min_length: If given, the response is a draft and is discarded
+                          unless its rendering passes _passes_draft_check with
+                          this minimum length.
+
+    Returns:
+        The Path of the condensed markdown file, or None if the call failed,
+        returned invalid JSON, was a draft that failed the check, or writing failed.
+    """
+    try:
+        content = llm_client.invoke(
+            prompt=full_prompt,
+            model=model,
+            latency_optimized=True,
+            system_prompt=CONDENSE_SYSTEM_PROMPT,
+            response_format=CONDENSE_RESPONSE_FORMAT
+        )
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during the LLM invoke call: {e}", exc_info=True)
+        return None
+
+    condensed = _parse_condensed_json(content, model)
+    if condensed is None:
+        return None
+    markdown = _render_condensed_markdown(condensed)
+    if draft_min_length is not None and not _passes_draft_check(
+        len(markdown), bool(condensed["topics"]), draft_min_length, model
+    ):
+        return None
+
+    json_path = kb_file_path.parent / CONDENSED_JSON_FILENAME
+    try:
+        json_path.write_text(json.dumps(condensed, ensure_ascii=False, indent=2), encoding='utf-8')
+    except (IOError, OSError) as e:
+        logger.error(f"Error writing condensed file {json_path}: {e}", exc_info=True)
+        return None
+    return _write_condensed(kb_file_path, markdown, model)
+
+
+def _checkpoint_path(output_path: Path) -> Path:
+    """
+    Gets the checkpoint sidecar of a condensed file.
+
+    Args:
+        output_path: The condensed markdown file.
+
+    Returns:
+        The path of its sidecar, e.g. 'knowledge_base_condensed.md.meta.json'.
+    """
+    return output_path.with_name(output_path.name + CHECKPOINT_SUFFIX)
+
+
+def _load_checkpoint(
+    kb_file_path: Path,
+    src_sha: str,
+    models: Tuple[str, ...],
+    structured: bool
+) -> Optional[Path]:
+    """
+    Finds an existing condensed file that is still up to date.
+
+    Args:
+        kb_file_path: Path object pointing to the knowledge base markdown file.
+        src_sha: SHA-256 of the knowledge base content.
+        models: The models the requested quality setting may use.
+        structured: Whether the JSON condensation is also required.
+
+    Returns:
+        The Path of the condensed file if its checkpoint matches the knowledge
+        base content, one of the models and the structured setting, and the
+        condensed files still exist; otherwise None.
+    """
+    output_path = kb_file_path.parent / CONDENSED_FILENAME
+    try:
+        with open(_checkpoint_path(output_path), encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(checkpoint, dict)
+        or checkpoint.get("src_sha") != src_sha
+        or checkpoint.get("model") not in models
+        or checkpoint.get("structured", False) != structured
+        or not output_path.is_file()
+        or (structured and not (kb_file_path.parent / CONDENSED_JSON_FILENAME).is_file())
+    ):
+        return None
+    logger.info(f"Condensed file is up to date, skipping condensation: {output_path}")
+    return output_path
+
+
+def _write_checkpoint(output_path: Path, src_sha: str, model: str, structured: bool = False) -> None:
+    """
+    Records which knowledge base content and model produced a condensed file.
+
+    The sidecar is replaced atomically. Failing to write it only means the
+    file is condensed again next time, so errors are logged, not raised.
+
+    Args:
+        output_path: The condensed markdown file just written.
+        src_sha: SHA-256 of the knowledge base content.
+        model: The model that produced the condensed file.
+        structured: Whether the JSON condensation was written too.
+    """
+    checkpoint = {
+        "src_sha": src_sha,
+        "model": model,
+        "structured": structured,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    checkpoint_path = _checkpoint_path(output_path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f)
+            os.replace(tmp_path, checkpoint_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not write checkpoint {checkpoint_path}: {e}")
+
+
+def _content_sha(kb_content: str) -> str:
+    """
+    Hashes knowledge base content for its checkpoint.
+
+    Args:
+        kb_content: The knowledge base content as read from disk.
+
+    Returns:
+        The hex SHA-256 of the content's UTF-8 encoding.
+    """
+    return hashlib.sha256(kb_content.encode("utf-8")).hexdigest()
+
+
+def _quality_models(quality: str) -> Tuple[str, ...]:
+    """
+    Looks up the models to try, in order, for a quality setting.
+
+    Args:
+        quality: One of the CONDENSE_QUALITY_MODELS keys.
+
+    Returns:
+        The models to try.
+
+    Raises:
+        ValueError: If the quality setting is unknown.
+    """
+    models = CONDENSE_QUALITY_MODELS.get(quality)
+    if models is None:
+        raise ValueError(f"quality must be one of {', '.join(CONDENSE_QUALITY_MODELS)}, got {quality!r}")
+    return models
+
+
+def condense_knowledge_base(
+    kb_file_path: Path,
+    quality: CondenseQuality = "balanced",
+    structured: bool = False,
+    llm_client: Optional[LiteLlmClient] = None
+) -> Optional[Path]:
+    """
+    Condenses a knowledge base Markdown file using an LLM.
+
+    Reads the content of the input file, drops duplicate paragraphs and HTML
+    comments, sends it to an LLM with a specific prompt for condensation, and
+    streams the result into a new file named 'knowledge_base_condensed.md' in
+    the same directory as the input file.
+    A knowledge base longer than CONDENSE_CHUNK_CHARS is first split at its
+    headings and each section summarized in parallel; the final pass then
+    merges those summaries by topic, so no single call has to generate the
+    whole output from the whole input. LLM responses are cached in a
+    '.kb_cache' directory next to the input, so condensing an unchanged
+    knowledge base again reuses them. After each successful run a
+    '.meta.json' checkpoint records the input's hash and the model used, and
+    a rerun on unchanged input returns the existing condensed file at once,
+    so an interrupted batch resumes where it stopped.
+
+    The quality setting picks the models used. "fast" only uses the cheap
+    CONDENSE_MODEL_DRAFT, "best" only uses CONDENSE_MODEL, and "balanced" tries
+    the draft model first and escalates to CONDENSE_MODEL only if the draft
+    is shorter than DRAFT_MIN_LENGTH_RATIO of the knowledge base or has no
+    ## topic headings.
+
+    With structured=True the LLM returns JSON following CONDENSE_RESPONSE_FORMAT
+    instead of streaming markdown. The JSON is written to
+    'knowledge_base_condensed.json' for programs to read, and its rendering,
+    one ## section per topic, to 'knowledge_base_condensed.md'.
+
+    Args:
+        kb_file_path: Path object pointing to the knowledge base markdown file.
+        quality: "fast", "balanced" (the default) or "best".
+        structured: Whether to also write the condensation as JSON.
+        llm_client: Optional client to reuse, as `condense_many` does; by default
+                    a client caching responses in '.kb_cache' is created.
+
+    Returns:
+        The Path object of the created condensed file if successful.
+        Returns None if any step in the process fails (e.g., file reading error,
+        LLM client instantiation error, LLM invocation error, file writing error,
+        or if the 'litellm' library is unavailable).
+
+    Raises:
+        This function aims to handle errors internally and return None on failure,
+        but underlying operations (like file I/O or LLM client calls) could
+        potentially raise exceptions if not caught internally by those components
+        or if unexpected errors occur. Standard exceptions like FileNotFoundError
+        or IOError might occur during file operations if initial checks fail,
+        and errors from the LLM client (like API errors) might occur during invocation.
+        ValueError: If the quality setting is unknown.
+    """
+    models = _quality_models(quality)
+    logger.info(f"Starting condensation process for: {kb_file_path}")
+
+    # --- 1. Validate and Read Input File ---
+    kb_content = _read_knowledge_base(kb_file_path)
+    if kb_content is None:
+        return None
+    src_sha = _content_sha(kb_content)
+    up_to_date_path = _load_checkpoint(kb_file_path, src_sha, models, structured)
+    if up_to_date_path is not None:
+        return up_to_date_path
+    kb_content = _dedupe_paragraphs(kb_content)
+    draft_min_length = _draft_min_length(kb_content)
+
+    # --- 2. Check Prerequisite and Instantiate LLM Client ---
+    if llm_client is None:
+        llm_client = _create_llm_client(cache_dir=kb_file_path.parent / LLM_CACHE_DIRNAME)
+        if llm_client is None:
+            return None
+
+    # --- 3. Summarize Large Knowledge Bases Section by Section ---
+    sections = _split_markdown_by_headings(kb_content, CONDENSE_CHUNK_CHARS)
+    if len(sections) > 1:
+        kb_content = _condense_sections(llm_client, sections, models[0])
+        if kb_content is None:
+            return None
+
+    # --- 4. Prepare Prompt and Call Each Model Until One Succeeds ---
+    full_prompt = _condense_prompt(kb_content)
+    for index, model in enumerate(models):
+        is_draft = index < len(models) - 1
+        if not _prompt_fits(llm_client, full_prompt, model):
+            continue
+
+        logger.info(f"Sending request to LLM model: {model}")
+        if structured:
+            output_path = _condense_structured(
+                llm_client,
+                kb_file_path,
+                full_prompt,
+                model,
+                draft_min_length=draft_min_length if is_draft else None
+            )
+        else:
+            try:
+                deltas = iter(llm_client.invoke_stream(
+                    prompt=full_prompt,
+                    model=model,
+                    latency_optimized=True,
+                    system_prompt=CONDENSE_SYSTEM_PROMPT
+                ))
+            except Exception as e: # Catch unexpected errors starting the call
+                logger.error(f"An unexpected error occurred during the LLM invoke call: {e}", exc_info=True)
+                continue
+
+            # --- 5. Write the Response to Disk as it Streams In ---
+            output_path = _stream_condensed(
+                kb_file_path,
+                deltas,
+                model,
+                draft_min_length=draft_min_length if is_draft else None
+            )
+        if output_path is not None:
+            _write_checkpoint(output_path, src_sha, model, structured)
+            return output_path
+        if is_draft:
+            logger.info(f"Escalating condensation to model: {models[index + 1]}")
+
+    return None
+
+
+def condense_many(
+    kb_file_paths: Iterable[Path],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_CONDENSATIONS,
+    cache_dir: Optional[Path] = None,
+    quality: CondenseQuality = "balanced"
+) -> List[Optional[Path]]:
+    """
+    Condenses several knowledge base files in parallel threads.
+
+    Each file is condensed by `condense_knowledge_base`, with up to
+    max_concurrency files in flight at once, all sharing one LLM client and
+    its response cache. Progress is logged as each file finishes. This is the
+    blocking counterpart of `acondense_knowledge_base`, for callers without an
+    event loop. Each condensed file is written next to its input, so the
+    inputs should live in different directories.
+
+    Args:
+        kb_file_paths: Paths of the knowledge base markdown files to condense.
+        max_concurrency: Maximum number of files condensed at once.
+        cache_dir: Directory caching LLM responses for all the inputs. Defaults
+                   to a '.kb_cache' directory in the deepest directory containing
+                   every input.
+        quality: "fast", "balanced" (the default) or "best", as for
+                 `condense_knowledge_base`.
+
+    Returns:
+        One entry per input, in input order: the Path of the condensed file,
+        or None if condensing that file failed.
+
+    Raises:
+        ValueError: If max_concurrency is less than 1 or the quality setting is unknown.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    _quality_models(quality)
+
+    paths = list(kb_file_paths)
+    results: List[Optional[Path]] = [None] * len(paths)
+    if not paths:
+        return results
+    if cache_dir is None:
+        # Responses are keyed by model and prompt, so one cache serves every input
+        common_dir = os.path.commonpath([path.absolute().parent for path in paths])
+        cache_dir = Path(common_dir) / LLM_CACHE_DIRNAME
+    llm_client = _create_llm_client(cache_dir=cache_dir)
+    if llm_client is None:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {
+            executor.submit(condense_knowledge_base, path, quality, llm_client=llm_client): index
+            for index, path in enumerate(paths)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.error(f"Unexpected error condensing {paths[index]}: {e}", exc_info=True)
+            logger.info(f"Finished {done} of {len(paths)} knowledge bases: {paths[index]}")
+    return results
+
+
+async def acondense_knowledge_base(
+    kb_file_paths: List[Path],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_CONDENSATIONS,
+    cache_dir: Optional[Path] = None,
+    quality: CondenseQuality = "balanced"
+) -> List[Optional[Path]]:
+    """
+    Condenses several knowledge base files concurrently.
+
+    Each file is condensed exactly as by `condense_knowledge_base`, but the
+    LLM calls share one client and run concurrently on the event loop, so
+    condensing N independent knowledge bases takes roughly as long as the
+    slowest one rather than the sum of all of them. Files are read and written
+    on worker threads, so disk I/O overlaps with the network calls instead of
+    blocking the event loop. Each condensed file is written next to its
+    input, so the inputs should live in different directories.
+
+    Args:
+        kb_file_paths: Paths of the knowledge base markdown files to condense.
+        max_concurrency: Maximum number of LLM calls in flight at once, to stay
+                         within the provider's rate limits.
+        cache_dir: Optional directory caching LLM responses for all the inputs;
+                   unlike `condense_knowledge_base`, there is no per-file default
+                   since the inputs share one client.
+        quality: "fast", "balanced" (the default) or "best", as for
+                 `condense_knowledge_base`.
+
+    Returns:
+        One entry per input, in input order: the Path of the condensed file,
+        or None if condensing that file failed.
+
+    Raises:
+        ValueError: If max_concurrency is less than 1 or the quality setting is unknown.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    models = _quality_models(quality)
+
+    llm_client = _create_llm_client(cache_dir=cache_dir)
+    if llm_client is None:
+        return [None] * len(kb_file_paths)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def condense_one(kb_file_path: Path) -> Optional[Path]:
+        logger.info(f"Starting condensation process for: {kb_file_path}")
+        # File I/O runs on worker threads so it never stalls the other files' LLM calls
+        kb_content = await asyncio.to_thread(_read_knowledge_base, kb_file_path)
+        if kb_content is None:
+            return None
+        src_sha = _content_sha(kb_content)
+        up_to_date_path = await asyncio.to_thread(_load_checkpoint, kb_file_path, src_sha, models, False)
+        if up_to_date_path is not None:
+            return up_to_date_path
+        kb_content = _dedupe_paragraphs(kb_content)
+        draft_min_length = _draft_min_length(kb_content)
+
+        sections = _split_markdown_by_headings(kb_content, CONDENSE_CHUNK_CHARS)
+        if len(sections) > 1:
+            kb_content = await _acondense_sections(llm_client, sections, semaphore, models[0])
+            if kb_content is None:
+                return None
+
+        full_prompt = _condense_prompt(kb_content)
+        for index, model in enumerate(models):
+            is_draft = index < len(models) - 1
+            if not _prompt_fits(llm_client, full_prompt, model):
+                continue
+            try:
+                async with semaphore:
+                    logger.info(f"Sending request to LLM model: {model}")
+                    condensed_content = await llm_client.ainvoke(
+                        prompt=full_prompt,
+                        model=model,
+                        latency_optimized=True,
+                        system_prompt=CONDENSE_SYSTEM_PROMPT
+                    )
+            except Exception as e:
+                logger.error(f"An unexpected error occurred during the LLM invoke call: {e}", exc_info=True)
+                continue
+
+            if is_draft and not _passes_draft_check(
+                len(condensed_content or ""),
+                _TOPIC_HEADING_PATTERN.search("\n" + (condensed_content or "")) is not None,
+                draft_min_length,
+                model
+            ):
+                logger.info(f"Escalating condensation to model: {models[index + 1]}")
+                continue
+            output_path = await asyncio.to_thread(_write_condensed, kb_file_path, condensed_content, model)
+            if output_path is not None:
+                await asyncio.to_thread(_write_checkpoint, output_path, src_sha, model)
+            return output_path
+
+        return None
+
+    return list(await asyncio.gather(*(condense_one(path) for path in kb_file_paths)))
+
 # Example Usage (Optional - can be uncommented for direct testing)
 # if __name__ == '__main__':
 #     # Create a dummy KB file for testing in the current directory
@@ -2,13 +2,25 @@
 Module for LLM client implementations. Includes a simple simulator and a LiteLLM-based client.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import Optional, List, Dict
+import os
+import random
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Optional, List, Dict, Iterable, Iterator, Tuple
 
 # Attempt to import litellm and handle potential ImportError
 try:
     import litellm
-    from litellm import completion
+    from litellm import acompletion, completion
     from litellm.exceptions import APIError, RateLimitError, ServiceUnavailableError, Timeout, AuthenticationError, BadRequestError
     LITELLM_AVAILABLE = True
 except ImportError:
@@ -23,6 +35,111 @@ except ImportError:
     class AuthenticationError(Exception): pass
     class BadRequestError(Exception): pass
 
+# Errors worth retrying: the provider is overloaded or throttling us, not rejecting the request
+RETRYABLE_LLM_ERRORS = (RateLimitError, ServiceUnavailableError, Timeout)
+
+# Default number of retries after the first attempt for a retryable error
+DEFAULT_LLM_MAX_RETRIES = 5
+
+# Base delay in seconds for exponential backoff between retries
+LLM_RETRY_DELAY = 1.0
+
+# Upper bound in seconds for a single retry delay, including a server's Retry-After
+LLM_MAX_BACKOFF = 30.0
+
+# Default number of concurrent calls made by LiteLlmClient.invoke_many
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Tokens kept free below a model's input limit, since local token counts are estimates
+CONTEXT_WINDOW_MARGIN = 1024
+
+# Upper bound on the tokens a chat message adds beyond its content (role and separators)
+_MESSAGE_TOKEN_OVERHEAD = 8
+
+# Provider-specific request options that trade cost for lower latency, keyed by
+# the litellm provider prefix of the model (e.g. "bedrock/...")
+LATENCY_OPTIMIZED_KWARGS: Dict[str, Dict[str, Any]] = {
+    "bedrock": {"performanceConfig": {"latency": "optimized"}},
+    "openai": {"service_tier": "priority"},
+}
+
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Read the delay requested by a Retry-After header on an error's response.
+
+    Args:
+        error: The exception raised by a litellm call.
+
+    Returns:
+        The requested delay in seconds, or None if the error carries no
+        usable Retry-After header.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+    except Exception:
+        return None
+    if not isinstance(value, str) or not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    # Retry-After may also be an HTTP date
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay(error: BaseException, retries: int) -> float:
+    """
+    Compute how long to wait before retrying a failed LLM call.
+
+    A server-provided Retry-After wins; otherwise the delay is capped
+    exponential backoff with full jitter.
+
+    Args:
+        error: The retryable exception raised by the failed call.
+        retries: The number of the retry about to be made, starting at 1.
+
+    Returns:
+        The delay in seconds, never more than LLM_MAX_BACKOFF.
+    """
+    retry_after = _retry_after_seconds(error)
+    if retry_after is not None:
+        return min(retry_after, LLM_MAX_BACKOFF)
+    return random.uniform(0, min(LLM_MAX_BACKOFF, LLM_RETRY_DELAY * (2 ** (retries - 1))))
+
+
+def _system_message(system_prompt: str, model: str) -> Dict[str, Any]:
+    """
+    Build the system message carrying fixed instructions.
+
+    Claude models only reuse a cached prompt prefix when it is marked with
+    cache_control, so the instructions are marked for them. OpenAI and Gemini
+    cache a repeated prefix automatically and get a plain message, which
+    avoids sending them a provider-specific field.
+
+    Args:
+        system_prompt: The fixed instructions.
+        model: The identifier of the model the message is for.
+
+    Returns:
+        A litellm system message.
+    """
+    if "claude" in model.lower():
+        return {
+            "role": "system",
+            "content": [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+        }
+    return {"role": "system", "content": system_prompt}
+
 
 class LiteLlmClient:
     """
@@ -32,7 +149,12 @@ class LiteLlmClient:
     allowing calls to different models supported by litellm.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_retries: int = DEFAULT_LLM_MAX_RETRIES,
+        cache_dir: Optional[Path] = None
+    ):
         """
         Initialize the LiteLlmClient.
 
@@ -40,59 +162,315 @@ class LiteLlmClient:
             api_key: An optional API key to be passed to litellm during calls.
                      Authentication might also be handled via environment variables
                      depending on the specific LLM provider and litellm configuration.
+            max_retries: Retries after the first attempt when the provider is
+                         rate limiting, unavailable or timing out.
+            cache_dir: Optional directory caching responses by model and prompt,
+                       so repeating an identical call does not hit the API.
         """
         if not LITELLM_AVAILABLE:
             raise ImportError("The 'litellm' library is required to use LiteLlmClient. Please install it.")
 
         self.api_key = api_key
+        self.max_retries = max_retries
+        self.cache_dir = cache_dir
         # Example: Set Gemini authentication details if needed and not handled by environment variables
         # litellm.vertex_project = "your-gcp-project-id"
         # litellm.vertex_location = "us-central1"
         logging.info("LiteLlmClient initialized.")
 
-    def invoke(self, prompt: str, model: str) -> Optional[str]:
+    def _cache_path(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[Path]:
+        """
+        Get the cache file for a model and prompt.
+
+        Args:
+            prompt: The input prompt string for the LLM.
+            model: The identifier of the model to use.
+            system_prompt: Optional fixed instructions sent with the prompt.
+            response_format: Optional output format requested with the prompt.
+
+        Returns:
+            The path of the cache entry, or None if caching is disabled.
+        """
+        if self.cache_dir is None:
+            return None
+        key_text = model + "\0" + prompt
+        if system_prompt:
+            key_text = model + "\0" + system_prompt + "\0" + prompt
+        if response_format:
+            key_text += "\0" + json.dumps(response_format, sort_keys=True)
+        key = hashlib.sha256(key_text.encode("utf-8")).hexdigest()
+        return self.cache_dir / key
+
+    def _load_cached(self, cache_path: Optional[Path], model: str) -> Optional[str]:
+        """
+        Read a cached response.
+
+        Args:
+            cache_path: A path from _cache_path, or None.
+            model: The model the response is for, for logging.
+
+        Returns:
+            The cached response, or None on a miss or when caching is disabled.
+        """
+        if cache_path is None:
+            return None
+        try:
+            content = cache_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        logging.info(f"Using cached LLM response for model: {model}")
+        return content
+
+    def _open_cache_entry(self, cache_path: Optional[Path]) -> Optional[Tuple[Any, str]]:
+        """
+        Open a temporary file that will atomically become a cache entry.
+
+        Args:
+            cache_path: A path from _cache_path, or None.
+
+        Returns:
+            The open text file and its temporary path, or None if caching is
+            disabled or the cache directory cannot be written.
+        """
+        if cache_path is None:
+            return None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            return os.fdopen(fd, "w", encoding="utf-8"), tmp_path
+        except OSError as e:
+            logging.warning(f"Could not write LLM response cache in {cache_path.parent}: {e}")
+            return None
+
+    def _close_cache_entry(self, entry: Optional[Tuple[Any, str]], cache_path: Optional[Path], complete: bool) -> None:
+        """
+        Close a cache entry from _open_cache_entry, keeping it only if complete.
+
+        Failing to write the cache never fails a call, so write errors are
+        ignored.
+
+        Args:
+            entry: The value returned by _open_cache_entry.
+            cache_path: The path the entry becomes.
+            complete: Whether the whole response was written.
+        """
+        if entry is None or cache_path is None:
+            return
+        cache_file, tmp_path = entry
+        try:
+            cache_file.close()
+            if complete:
+                os.replace(tmp_path, cache_path)
+                return
+        except OSError:
+            pass
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    def _store_cached(self, cache_path: Optional[Path], content: Optional[str]) -> None:
+        """
+        Cache a response, atomically replacing any previous entry.
+
+        Args:
+            cache_path: A path from _cache_path, or None to skip.
+            content: The response to cache; empty responses are not cached.
+        """
+        if not content:
+            return
+        entry = self._open_cache_entry(cache_path)
+        if entry is None:
+            return
+        try:
+            entry[0].write(content)
+        except OSError:
+            self._close_cache_entry(entry, cache_path, complete=False)
+            return
+        self._close_cache_entry(entry, cache_path, complete=True)
+
+    def _completion_kwargs(
+        self,
+        prompt: str,
+        model: str,
+        latency_optimized: bool = False,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the keyword arguments for a litellm completion call.
+
+        Args:
+            prompt: The input prompt string for the LLM.
+            model: The identifier of the model to use.
+            latency_optimized: Whether to add the provider's low-latency options
+                               from LATENCY_OPTIMIZED_KWARGS, if it has any.
+            system_prompt: Optional fixed instructions sent ahead of the prompt.
+            response_format: Optional litellm response_format, e.g. a JSON schema.
+
+        Returns:
+            The arguments shared by `completion` and `acompletion`.
+        """
+        # Standard message format for litellm
+        messages: List[Dict[str, Any]] = []
+        if system_prompt:
+            messages.append(_system_message(system_prompt, model))
+        messages.append({"role": "user", "content": prompt})
+        kwargs: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+        }
+        if self.api_key:
+            kwargs["api_key"] = self.api_key
+        if response_format:
+            kwargs["response_format"] = response_format
+        if latency_optimized and "/" in model:
+            # Only explicitly prefixed models, so an unknown provider is never sent foreign options
+            kwargs.update(LATENCY_OPTIMIZED_KWARGS.get(model.split("/", 1)[0], {}))
+        return kwargs
+
+    def _extract_content(self, response: Any, model: str) -> Optional[str]:
+        """
+        Extract the message content from a litellm completion response.
+
+        Args:
+            response: The object returned by `completion` or `acompletion`.
+            model: The model the response came from, for logging.
+
+        Returns:
+            The response content, or None if the response has no content.
+        """
+        # Accessing response content might vary slightly based on litellm version/structure
+        # Usually it's in choices[0].message.content
+        if response and response.choices and response.choices[0].message and response.choices[0].message.content:
+            content = response.choices[0].message.content
+            logging.info(f"LLM call successful for model: {model}")
+            # Log response snippet for debugging if needed
+            # response_snippet = (content[:100] + '...') if len(content) > 100 else content
+            # logging.debug(f"Response snippet: {response_snippet}")
+            return content
+        logging.error(f"LLM call for model {model} returned an unexpected response structure: {response}")
+        return None
+
+    def fits_context(self, prompt: str, model: str, system_prompt: Optional[str] = None) -> bool:
+        """
+        Check locally whether a prompt fits the model's input limit.
+
+        Sending a prompt that is too long costs a full upload only for the
+        provider to reject it, so callers can check first. Tokens are counted
+        with litellm's tokenizer for the model, keeping CONTEXT_WINDOW_MARGIN
+        tokens spare.
+
+        Args:
+            prompt: The input prompt string for the LLM.
+            model: The identifier of the model to use.
+            system_prompt: Optional fixed instructions sent with the prompt.
+
+        Returns:
+            False if the prompt is known to be too long; True if it fits or
+            litellm does not know the model's limit.
+        """
+        try:
+            max_input_tokens = litellm.get_model_info(model).get("max_input_tokens")
+        except Exception:
+            max_input_tokens = None
+        if not max_input_tokens:
+            return True
+
+        budget = max_input_tokens - CONTEXT_WINDOW_MARGIN
+        # Byte-level tokenizers never produce more tokens than UTF-8 bytes (a
+        # non-ASCII character can be several tokens), so short prompts need no counting
+        content_bytes = len(prompt.encode("utf-8")) + len((system_prompt or "").encode("utf-8"))
+        if content_bytes + 2 * _MESSAGE_TOKEN_OVERHEAD <= budget:
+            return True
+
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        token_count = litellm.token_counter(model=model, messages=messages)
+        if token_count > budget:
+            logging.warning(f"Prompt of {token_count} tokens exceeds the {max_input_tokens} token input limit of model {model}")
+            return False
+        return True
+
+    def _completion_with_retries(self, kwargs: Dict[str, Any], model: str) -> Any:
+        """
+        Call litellm's `completion`, retrying rate limits, outages and timeouts.
+
+        Args:
+            kwargs: The arguments for `completion`.
+            model: The model being called, for logging.
+
+        Returns:
+            The object returned by `completion`.
+
+        Raises:
+            Exception: The last retryable error once `max_retries` is exhausted,
+                       or any non-retryable error immediately.
+        """
+        retries = 0
+        while True:
+            try:
+                # Make the API call via litellm
+                return completion(**kwargs)
+            except RETRYABLE_LLM_ERRORS as e:
+                retries += 1
+                if retries > self.max_retries:
+                    raise
+                delay = _retry_delay(e, retries)
+                logging.warning(f"Retryable error from model {model}, retrying in {delay:.1f}s ({retries}/{self.max_retries}): {e}")
+                time.sleep(delay)
+
+    def invoke(
+        self,
+        prompt: str,
+        model: str,
+        latency_optimized: bool = False,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
         """
         Invokes an LLM using litellm with the given prompt and model.
 
+        Rate limits, provider outages and timeouts are retried up to
+        `max_retries` times, waiting for the server's Retry-After when given
+        and for jittered exponential backoff otherwise.
+
         Args:
             prompt: The input prompt string for the LLM.
             model: The identifier of the model to use (e.g., "gemini/gemini-1.5-pro-latest").
+            latency_optimized: Request the provider's low-latency tier where one
+                               exists (Bedrock, OpenAI); ignored for others.
+            system_prompt: Optional fixed instructions sent as a system message
+                           ahead of the prompt, so providers can cache them.
+            response_format: Optional litellm response_format, e.g. a JSON schema
+                             the response must follow.
 
         Returns:
             The LLM's response content as a string, or None if an error occurs.
         """
         logging.info(f"Attempting LLM call with model: {model}")
-        prompt_snippet = (prompt[:100] + '...') if len(prompt) > 100 else prompt
-        logging.debug(f"Prompt snippet: {prompt_snippet}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            prompt_snippet = (prompt[:100] + '...') if len(prompt) > 100 else prompt
+            logging.debug(f"Prompt snippet: {prompt_snippet}")
 
-        # Standard message format for litellm
-        messages: List[Dict[str, str]] = [{"role": "user", "content": prompt}]
+        cache_path = self._cache_path(prompt, model, system_prompt, response_format)
+        cached = self._load_cached(cache_path, model)
+        if cached is not None:
+            return cached
 
         try:
-            # Prepare arguments for litellm completion
-            kwargs = {
-                "model": model,
-                "messages": messages,
-            }
-            if self.api_key:
-                kwargs["api_key"] = self.api_key
-
-            # Make the API call via litellm
-            response = completion(**kwargs)
-
-            # Extract the content from the response object
-            # Accessing response content might vary slightly based on litellm version/structure
-            # Usually it's in choices[0].message.content
-            if response and response.choices and response.choices[0].message and response.choices[0].message.content:
-                content = response.choices[0].message.content
-                logging.info(f"LLM call successful for model: {model}")
-                # Log response snippet for debugging if needed
-                # response_snippet = (content[:100] + '...') if len(content) > 100 else content
-                # logging.debug(f"Response snippet: {response_snippet}")
-                return content
-            else:
-                logging.error(f"LLM call for model {model} returned an unexpected response structure: {response}")
-                return None
+            kwargs = self._completion_kwargs(prompt, model, latency_optimized, system_prompt, response_format)
+            response = self._completion_with_retries(kwargs, model)
+            content = self._extract_content(response, model)
+            self._store_cached(cache_path, content)
+            return content
 
         except (APIError, RateLimitError, ServiceUnavailableError, Timeout, AuthenticationError, BadRequestError) as e:
             logging.error(f"LiteLLM API error during call to model {model}: {e}", exc_info=True)
@@ -102,6 +480,194 @@ class LiteLlmClient:
             logging.error(f"Unexpected error during LiteLLM call to model {model}: {e}", exc_info=True)
             return None
 
+    async def ainvoke(
+        self,
+        prompt: str,
+        model: str,
+        latency_optimized: bool = False,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Asynchronously invokes an LLM using litellm with the given prompt and model.
+
+        Behaves like `invoke`, including its retries, but awaits
+        `litellm.acompletion` so many calls can be in flight at once from a
+        single event loop.
+
+        Args:
+            prompt: The input prompt string for the LLM.
+            model: The identifier of the model to use (e.g., "gemini/gemini-1.5-pro-latest").
+            latency_optimized: Request the provider's low-latency tier where one
+                               exists (Bedrock, OpenAI); ignored for others.
+            system_prompt: Optional fixed instructions sent as a system message
+                           ahead of the prompt, so providers can cache them.
+            response_format: Optional litellm response_format, e.g. a JSON schema
+                             the response must follow.
+
+        Returns:
+            The LLM's response content as a string, or None if an error occurs.
+        """
+        logging.info(f"Attempting async LLM call with model: {model}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            prompt_snippet = (prompt[:100] + '...') if len(prompt) > 100 else prompt
+            logging.debug(f"Prompt snippet: {prompt_snippet}")
+
+        cache_path = self._cache_path(prompt, model, system_prompt, response_format)
+        cached = self._load_cached(cache_path, model)
+        if cached is not None:
+            return cached
+
+        kwargs = self._completion_kwargs(prompt, model, latency_optimized, system_prompt, response_format)
+        retries = 0
+        try:
+            while True:
+                try:
+                    response = await acompletion(**kwargs)
+                    break
+                except RETRYABLE_LLM_ERRORS as e:
+                    retries += 1
+                    if retries > self.max_retries:
+                        raise
+                    delay = _retry_delay(e, retries)
+                    logging.warning(f"Retryable error from model {model}, retrying in {delay:.1f}s ({retries}/{self.max_retries}): {e}")
+                    await asyncio.sleep(delay)
+            content = self._extract_content(response, model)
+            self._store_cached(cache_path, content)
+            return content
+
+        except (APIError, RateLimitError, ServiceUnavailableError, Timeout, AuthenticationError, BadRequestError) as e:
+            logging.error(f"LiteLLM API error during call to model {model}: {e}", exc_info=True)
+            return None
+        except Exception as e:
+            # Catch any other unexpected errors during the litellm call
+            logging.error(f"Unexpected error during LiteLLM call to model {model}: {e}", exc_info=True)
+            return None
+
+    def invoke_stream(
+        self,
+        prompt: str,
+        model: str,
+        latency_optimized: bool = False,
+        system_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Invokes an LLM and yields its response as it is generated.
+
+        Consuming the deltas as they arrive lets callers overlap receiving the
+        response with processing it, instead of waiting for the whole
+        completion. Opening the stream is retried like `invoke`; an error once
+        streaming has started is raised, since the deltas already yielded
+        cannot be taken back. With a cache_dir, a cached response is yielded
+        in one piece and a fully received stream is cached.
+
+        Args:
+            prompt: The input prompt string for the LLM.
+            model: The identifier of the model to use (e.g., "gemini/gemini-1.5-pro-latest").
+            latency_optimized: Request the provider's low-latency tier where one
+                               exists (Bedrock, OpenAI); ignored for others.
+            system_prompt: Optional fixed instructions sent as a system message
+                           ahead of the prompt, so providers can cache them.
+
+        Yields:
+            Successive non-empty pieces of the response content.
+
+        Raises:
+            Exception: Any litellm error that could not be retried away, unlike
+                       `invoke`, which logs errors and returns None.
+        """
+        cache_path = self._cache_path(prompt, model, system_prompt)
+        cached = self._load_cached(cache_path, model)
+        if cached is not None:
+            yield cached
+            return
+
+        logging.info(f"Attempting streaming LLM call with model: {model}")
+        kwargs = self._completion_kwargs(prompt, model, latency_optimized, system_prompt)
+        kwargs["stream"] = True
+
+        # Cache the stream as it arrives rather than holding the whole response
+        cache_entry = self._open_cache_entry(cache_path)
+        written = False
+        try:
+            for chunk in self._completion_with_retries(kwargs, model):
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if cache_entry is not None:
+                        try:
+                            cache_entry[0].write(delta)
+                        except OSError:
+                            self._close_cache_entry(cache_entry, cache_path, complete=False)
+                            cache_entry = None
+                    written = True
+                    yield delta
+        except BaseException:
+            self._close_cache_entry(cache_entry, cache_path, complete=False)
+            raise
+        self._close_cache_entry(cache_entry, cache_path, complete=written)
+
+    def invoke_many(
+        self,
+        prompts: Iterable[str],
+        model: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        latency_optimized: bool = False,
+        system_prompt: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """
+        Invokes an LLM on several prompts concurrently.
+
+        Each prompt is sent with `invoke`, so retries and error handling are
+        the same as for a single call; a failed prompt yields None without
+        affecting the others.
+
+        Args:
+            prompts: The prompts to send.
+            model: The identifier of the model to use for every prompt.
+            max_concurrency: Maximum number of calls in flight at once.
+            latency_optimized: Passed through to `invoke` for every prompt.
+            system_prompt: Instructions shared by every prompt, passed through to `invoke`.
+
+        Returns:
+            The response for each prompt, in prompt order, with None for
+            prompts whose call failed.
+
+        Raises:
+            ValueError: If max_concurrency is less than 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="kb-for-prompt-llm") as executor:
+            return list(executor.map(lambda prompt: self.invoke(prompt, model, latency_optimized, system_prompt), prompts))
+
+
+@functools.lru_cache(maxsize=1)
+def get_default_client() -> LiteLlmClient:
+    """
+    Get the process-wide LiteLlmClient with default settings.
+
+    Callers that do not need their own API key or cache share one client
+    instead of constructing a new one each time. litellm itself reuses its
+    HTTP connections across calls, so sharing the client also shares them.
+
+    Returns:
+        The shared LiteLlmClient, created on first use.
+
+    Raises:
+        ImportError: If the 'litellm' library is not installed.
+    """
+    return LiteLlmClient()
+
+
+# Prompt keywords SimpleLlmClient dispatches on, matched in one case-insensitive pass
+_DISPATCH_PATTERN = re.compile(r"table of contents|knowledge base|extract key information", re.IGNORECASE)
+
+# The table of contents keyword, which takes priority over the others
+_TOC_PATTERN = re.compile(r"table of contents", re.IGNORECASE)
+
 
 class SimpleLlmClient:
     """
@@ -135,11 +701,14 @@ class SimpleLlmClient:
         """
         logging.info(f"Simulating LLM call with model: {model}")
         # Log a snippet of the prompt for debugging (optional)
-        prompt_snippet = (prompt[:100] + '...') if len(prompt) > 100 else prompt
-        logging.debug(f"Prompt snippet: {prompt_snippet}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            prompt_snippet = (prompt[:100] + '...') if len(prompt) > 100 else prompt
+            logging.debug(f"Prompt snippet: {prompt_snippet}")
 
         # Return a generic placeholder response based on typical usage
-        if "table of contents" in prompt.lower():
+        match = _DISPATCH_PATTERN.search(prompt)
+        # A table of contents keyword after a knowledge base keyword still wins
+        if match and (match.group().lower() == "table of contents" or _TOC_PATTERN.search(prompt, match.end())):
             # Simulate a TOC response
             return """
 # Simulated Table of Contents
@@ -152,7 +721,7 @@ class SimpleLlmClient:
 - [Sub-section 2.1](path/to/document_c.md#sub-section-21)
   - [Document C](path/to/document_c.md)
 """
-        elif "knowledge base" in prompt.lower() or "extract key information" in prompt.lower():
+        elif match:
              # Simulate a KB response (could be XML or Markdown depending on prompt)
              # Returning Markdown here for simplicity, matching the KB prompt template expectation
             return """
@@ -3,10 +3,11 @@ Module for generating LLM-friendly XML from markdown files and using LLMs for ge
 """
 
 import os
-import xml.etree.ElementTree as ET
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional, Any
+from typing import Union, Optional, Any, Dict, Iterator, Tuple
 
 from rich.console import Console
 
@@ -16,6 +17,217 @@ from kb_for_prompt.atoms.error_utils import FileIOError
 # Assumes templates directory is at ../templates from the organisms directory
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
 
+# Upper bound on the threads reading markdown files concurrently while scanning
+MAX_READ_WORKERS = 32
+
+# Flags for reading markdown files; O_BINARY stops Windows translating newlines itself
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# A file read by the scan: (st_mtime_ns, st_size, content), reused while both still match
+_CachedRead = Tuple[int, int, str]
+
+# Placeholder in prompt templates replaced by the documents XML
+DOCUMENTS_PLACEHOLDER = "{{documents}}"
+
+# Prompt used to generate a table of contents from the documents XML
+TOC_PROMPT_TEMPLATE = """
+You are a documentation indexing assistant. Create a comprehensive table of contents in markdown format based on the content of the provided documents.
+
+Format the output as a nested markdown list with:
+1. Top-level sections as # headers
+2. Sub-sections properly indented
+3. Links to the document paths
+
+DOCUMENTS:
+{{documents}}
+
+Generate a clear, hierarchical, and well-structured table of contents that would help a user navigate the documentation.
+"""
+
+# The TOC prompt split around its placeholder, so the XML is joined in without
+# searching the template on every call
+_TOC_PROMPT_PREFIX, _TOC_PROMPT_SUFFIX = TOC_PROMPT_TEMPLATE.split(DOCUMENTS_PLACEHOLDER)
+
+# (character, entity) pairs escaped in XML text, with & first so entities are not re-escaped
+_XML_TEXT_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"))
+
+# Attribute values also escape quotes and whitespace control characters, as ElementTree does
+_XML_ATTR_ESCAPES = _XML_TEXT_ESCAPES + (('"', "&quot;"), ("\r", "&#13;"), ("\n", "&#10;"), ("\t", "&#09;"))
+
+
+def _xml_escape(text: str, escapes: Tuple[Tuple[str, str], ...] = _XML_TEXT_ESCAPES) -> str:
+    """
+    Escapes text for XML, replacing only the characters that actually occur.
+
+    Each str.replace is a fast C-level pass, and skipping characters the text
+    does not contain means most markdown is returned without being copied at
+    all; str.translate with multi-character entities is far slower on large
+    documents.
+
+    Args:
+        text: The text to escape.
+        escapes: The (character, entity) pairs to replace, in order.
+
+    Returns:
+        The escaped text.
+    """
+    for char, entity in escapes:
+        if char in text:
+            text = text.replace(char, entity)
+    return text
+
+
+def _iter_md_files(root: str) -> Iterator[Tuple[str, str]]:
+    """
+    Walks a directory tree for markdown (.md) files using os.scandir.
+
+    Visits directories in the same order as Path.rglob and, like it, does not
+    descend into symlinked directories, but avoids creating a Path object and
+    calling stat for every entry: the directory entries' cached types are used
+    instead. Only files (including symlinks to files) are yielded, so callers
+    need no is_file() check of their own. Subdirectories that cannot be
+    listed are skipped with a warning.
+
+    Args:
+        root: The directory to walk.
+
+    Yields:
+        (path, relative_path) tuples for each markdown file, where path can
+        be opened directly and relative_path is relative to root. The relative
+        path is built from entry names joined with "/" on every platform, so
+        it needs no relpath call or separator normalization.
+
+    Raises:
+        OSError: If root itself cannot be listed.
+    """
+    # (directory, its path relative to root with a trailing "/", or "" for root)
+    stack = [(root, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        yield entry.path, prefix + entry.name
+        except OSError as e:
+            if directory == root:
+                raise
+            logging.warning("Skipping directory '%s' due to error: %s", directory, e)
+            continue
+        # Reversed so the first subdirectory is walked first, as rglob does
+        stack.extend(reversed(subdirectories))
+
+
+def _read_markdown_file(
+    path: Union[str, Path], cached: Optional[_CachedRead] = None
+) -> Tuple[Optional[str], Optional[Exception], Optional[_CachedRead]]:
+    """
+    Reads a markdown file, returning the error instead of raising it.
+
+    Runs on the scan's worker threads, so one unreadable file cannot stop
+    the results of the others from being collected. The file is read with raw
+    os calls, normally a single read sized from fstat, which avoids the extra
+    syscalls and buffering layers of a text-mode open. Newlines are translated
+    as text mode would.
+
+    If a cached read from an earlier scan is given and the file's mtime and
+    size still match it, the cached content is returned without reading.
+
+    Args:
+        path: The markdown file to read.
+        cached: The file's entry from the previous scan, if any.
+
+    Returns:
+        A (content, None, cache_entry) tuple on success, or (None, error, None)
+        on failure.
+    """
+    try:
+        fd = os.open(path, _READ_FLAGS)
+        try:
+            st = os.fstat(fd)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2], None, cached
+            # Ask for one byte more than the file size so a short read marks EOF
+            size = st.st_size + 1
+            chunks = [os.read(fd, size)]
+            while len(chunks[-1]) == size:
+                chunks.append(os.read(fd, size))
+        finally:
+            os.close(fd)
+        content = b"".join(chunks).decode("utf-8")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content, None, (st.st_mtime_ns, st.st_size, content)
+    except Exception as e:
+        return None, e, None
+
+
+class _TemplateNotFoundError(Exception):
+    """Raised by _load_prompt_template_cached when the template file does not exist."""
+
+
+@lru_cache(maxsize=16)
+def _load_prompt_template_cached(template_path_str: str) -> str:
+    """
+    Reads a prompt template, memoized on its path.
+
+    Templates do not change during a run. Failures raise rather than return,
+    so they are not cached and a later call tries the file again. Call
+    _load_prompt_template_cached.cache_clear() to pick up an edited template.
+
+    Args:
+        template_path_str: The path of the template file.
+
+    Returns:
+        The content of the template file.
+
+    Raises:
+        _TemplateNotFoundError: If the path is not a file.
+        OSError: If the file cannot be read.
+    """
+    template_path = Path(template_path_str)
+    if not template_path.is_file():
+        raise _TemplateNotFoundError(template_path_str)
+    return template_path.read_text(encoding="utf-8")
+
+
+def _documents_xml_problem(xml_data: str) -> Optional[str]:
+    """
+    Sanity-checks XML from scan_and_build_xml without parsing it.
+
+    The XML is generated by this module with all content escaped, so checking
+    its outer element is enough; parsing many megabytes of it again would add
+    nothing.
+
+    Args:
+        xml_data: The XML string.
+
+    Returns:
+        A description of the problem, or None if the XML looks well formed.
+    """
+    if not xml_data.startswith("<documents>"):
+        return "missing opening <documents> tag"
+    if not xml_data.endswith("</documents>"):
+        return "missing closing </documents> tag"
+    return None
+
+
+def _has_documents(xml_data: str) -> bool:
+    """
+    Checks whether XML from scan_and_build_xml holds any document elements.
+
+    Args:
+        xml_data: The XML string, already checked by _documents_xml_problem.
+
+    Returns:
+        True if at least one document element is present.
+    """
+    # Escaped content cannot contain the tag, and "</documents>" does not contain it either
+    return "</document>" in xml_data
+
 
 class LlmGenerator:
     """
@@ -35,11 +247,17 @@ class LlmGenerator:
         """
         self.console = console if console else Console()
         self.llm_client = llm_client
+        # Files read by the last scan, by path, so a rescan (e.g. TOC then KB
+        # on the same directory) only reads files that have changed since
+        self._read_cache: Dict[str, _CachedRead] = {}
 
     def _load_prompt_template(self, template_path: Path) -> Optional[str]:
         """
         Loads a prompt template from the specified file path.
 
+        Templates are cached per path by _load_prompt_template_cached, so
+        repeated generations read each template from disk only once.
+
         Args:
             template_path: The Path object pointing to the template file.
 
@@ -47,21 +265,27 @@ class LlmGenerator:
             The content of the template file as a string, or None if an error occurs.
         """
         try:
-            if not template_path.is_file():
-                logging.error(f"Prompt template file not found: {template_path}")
-                return None
-            return template_path.read_text(encoding="utf-8")
+            return _load_prompt_template_cached(str(template_path))
+        except _TemplateNotFoundError:
+            logging.error("Prompt template file not found: %s", template_path)
+            return None
         except (IOError, OSError) as e:
-            logging.error(f"Error reading prompt template file {template_path}: {e}")
+            logging.error("Error reading prompt template file %s: %s", template_path, e)
             return None
         except Exception as e:
-            logging.error(f"An unexpected error occurred while reading template {template_path}: {e}")
+            logging.error("An unexpected error occurred while reading template %s: %s", template_path, e)
             return None
 
-    def scan_and_build_xml(self, directory_path: Union[str, Path]) -> str:
+    def scan_and_build_xml(self, directory_path: Union[str, Path], include_paths: bool = True) -> str:
         """
         Recursively scans a directory for markdown files (.md) and builds an XML string.
 
+        Files are read concurrently on up to MAX_READ_WORKERS threads, since the
+        scan is dominated by waiting on the disk; the XML is still built on the
+        calling thread, in the order the files were found. The XML is written
+        out directly rather than through an ElementTree, with the same escaping
+        and layout as `ET.tostring(..., short_empty_elements=False)`.
+
         The XML structure is:
         <documents>
             <document path="relative/path/to/file1.md">Content of file1</document>
@@ -69,8 +293,12 @@ class LlmGenerator:
             ...
         </documents>
 
+        With include_paths=False the documents are written as plain
+        <document>...</document> elements.
+
         Args:
             directory_path: The path to the directory to scan.
+            include_paths: Whether to add each file's relative path as a 'path' attribute.
 
         Returns:
             An XML string containing the documents.
@@ -87,35 +315,45 @@ class LlmGenerator:
         if not dir_path.is_dir():
             raise NotADirectoryError(f"Path is not a directory: {directory_path}")
 
-        root = ET.Element("documents")
-        found_files = False
+        parts = ["<documents>"]
 
         try:
-            # Use rglob to find all .md files recursively
-            for item in dir_path.rglob("*.md"):
-                if item.is_file():
-                    relative_path = item.relative_to(dir_path)
-                    try:
-                        content = item.read_text(encoding="utf-8")
-                        doc_element = ET.SubElement(root, "document")
-                        # Add path attribute - this might be removed later depending on use case
-                        doc_element.set("path", str(relative_path).replace("\\", "/")) # Ensure consistent path separators
-                        # Set text content, ensuring empty strings are preserved
-                        doc_element.text = content if content else ""
-                        found_files = True
-                    except (IOError, OSError, UnicodeDecodeError) as e:
-                        # Handle file reading errors gracefully by skipping the file
-                        self.console.print(f"[warning]Skipping file '{relative_path}' due to error: {e}[/warning]")
-                        logging.warning(f"Skipping file '{relative_path}' due to error: {e}")
-                        continue # Skip to the next file
-                    except Exception as e:
-                        # Catch any other unexpected errors during file processing
-                        self.console.print(f"[warning]Skipping file '{relative_path}' due to unexpected error: {e}[/warning]")
-                        logging.warning(f"Skipping file '{relative_path}' due to unexpected error: {e}")
-                        continue
+            # Walk the tree for all .md files, then read them concurrently.
+            # _iter_md_files only yields files, using the entries' cached types,
+            # so there is no per-file is_file() check here.
+            md_files = list(_iter_md_files(str(dir_path)))
+            read_cache: Dict[str, _CachedRead] = {}
+            if md_files:
+                max_workers = min(MAX_READ_WORKERS, (os.cpu_count() or 1) * 4, len(md_files))
+                file_paths = [path for path, _ in md_files]
+                cached_reads = [self._read_cache.get(path) for path in file_paths]
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # map yields results in submission order, keeping the XML deterministic
+                    results = executor.map(_read_markdown_file, file_paths, cached_reads)
+                    for (file_path, relative_path), (content, error, cache_entry) in zip(md_files, results):
+                        if isinstance(error, (IOError, OSError, UnicodeDecodeError)):
+                            # Handle file reading errors gracefully by skipping the file
+                            self.console.print(f"[warning]Skipping file '{relative_path}' due to error: {error}[/warning]")
+                            logging.warning("Skipping file '%s' due to error: %s", relative_path, error)
+                            continue # Skip to the next file
+                        if error is not None:
+                            # Catch any other unexpected errors during file processing
+                            self.console.print(f"[warning]Skipping file '{relative_path}' due to unexpected error: {error}[/warning]")
+                            logging.warning("Skipping file '%s' due to unexpected error: %s", relative_path, error)
+                            continue
+                        read_cache[file_path] = cache_entry
+                        if include_paths:
+                            # relative_path already uses "/" separators on every platform
+                            parts.append(f'<document path="{_xml_escape(relative_path, _XML_ATTR_ESCAPES)}">')
+                        else:
+                            parts.append("<document>")
+                        parts.append(_xml_escape(content))
+                        parts.append("</document>")
+            # Keep only this scan's files, so the cache never outgrows one corpus
+            self._read_cache = read_cache
         except PermissionError as e:
-             # Handle errors accessing subdirectories during rglob
-             logging.error(f"Permission denied while scanning directory contents: {dir_path}", exc_info=True)
+             # Handle errors listing the directory during the walk
+             logging.error("Permission denied while scanning directory contents: %s", dir_path, exc_info=True)
              raise FileIOError(
                 message=f"Permission denied while scanning directory contents: {e}",
                 file_path=str(dir_path),
@@ -123,7 +361,7 @@ class LlmGenerator:
             ) from e
         except OSError as e:
              # Handle other OS errors during directory scanning
-             logging.error(f"OS error while scanning directory contents: {dir_path}", exc_info=True)
+             logging.error("OS error while scanning directory contents: %s", dir_path, exc_info=True)
              raise FileIOError(
                 message=f"Failed to read directory contents: {e}",
                 file_path=str(dir_path),
@@ -131,7 +369,7 @@ class LlmGenerator:
             ) from e
         except Exception as e:
             # Catch any other unexpected errors during directory traversal
-            logging.error(f"Unexpected error while scanning directory: {dir_path}", exc_info=True)
+            logging.error("Unexpected error while scanning directory: %s", dir_path, exc_info=True)
             raise FileIOError(
                 message=f"An unexpected error occurred while scanning directory: {e}",
                 file_path=str(dir_path),
@@ -139,13 +377,9 @@ class LlmGenerator:
             ) from e
 
 
-        # Generate the XML string
-        # Using 'unicode' ensures it's a string, not bytes.
-        # Set short_empty_elements=False to ensure empty tags are written as <tag></tag>
-        # instead of <tag/>, which makes the .text attribute "" instead of None when parsed back.
-        xml_string = ET.tostring(root, encoding="unicode", xml_declaration=False, short_empty_elements=False)
-
-        return xml_string
+        # Empty documents are written as <document ...></document>, never <document/>
+        parts.append("</documents>")
+        return "".join(parts)
 
     def generate_toc(self, directory_path: Union[str, Path]) -> Optional[str]:
         """
@@ -172,36 +406,21 @@ class LlmGenerator:
             # Get the XML representation of markdown files (includes paths by default)
             xml_data = self.scan_and_build_xml(directory_path)
 
-            # Parse the XML and check if any document elements exist
-            try:
-                if not xml_data: # Handle empty string case
-                    logging.info("Scan returned empty XML data, skipping TOC generation.")
-                    return None
-                root = ET.fromstring(xml_data)
-                if len(root.findall("document")) == 0:
-                    logging.info("No markdown documents found in the XML, skipping TOC generation.")
-                    return None
-            except ET.ParseError as e:
-                logging.error(f"Malformed XML data from scan, cannot generate TOC: {e}")
+            # Check that the XML holds at least one document element
+            if not xml_data: # Handle empty string case
+                logging.info("Scan returned empty XML data, skipping TOC generation.")
+                return None
+            problem = _documents_xml_problem(xml_data)
+            if problem is not None:
+                logging.error("Malformed XML data from scan, cannot generate TOC: %s", problem)
+                return None
+            if not _has_documents(xml_data):
+                logging.info("No markdown documents found in the XML, skipping TOC generation.")
                 return None
 
-            # Construct the prompt with the XML data
+            # Construct the prompt around the XML data
             # Note: This TOC prompt currently doesn't explicitly use paths, but the XML contains them.
-            prompt_template = """
-You are a documentation indexing assistant. Create a comprehensive table of contents in markdown format based on the content of the provided documents.
-
-Format the output as a nested markdown list with:
-1. Top-level sections as # headers
-2. Sub-sections properly indented
-3. Links to the document paths
-
-DOCUMENTS:
-{{documents}}
-
-Generate a clear, hierarchical, and well-structured table of contents that would help a user navigate the documentation.
-"""
-            # Replace the placeholder with the actual XML
-            final_prompt = prompt_template.replace("{{documents}}", xml_data)
+            final_prompt = "".join((_TOC_PROMPT_PREFIX, xml_data, _TOC_PROMPT_SUFFIX))
 
             # Specify the model alias to use
             model_alias = "gemini/gemini-2.5-pro-preview-03-25"
@@ -212,14 +431,14 @@ Generate a clear, hierarchical, and well-structured table of contents that would
                 generated_toc = self.llm_client.invoke(final_prompt, model=model_alias)
                 return generated_toc
             except Exception as e:
-                logging.error(f"LLM call failed for TOC generation: {e}", exc_info=True)
+                logging.error("LLM call failed for TOC generation: %s", e, exc_info=True)
                 return None
 
         except (FileNotFoundError, NotADirectoryError, FileIOError) as e:
-            logging.error(f"Failed to scan directory for TOC generation: {e}", exc_info=True)
+            logging.error("Failed to scan directory for TOC generation: %s", e, exc_info=True)
             return None
         except Exception as e:
-            logging.error(f"An unexpected error occurred during TOC generation: {e}", exc_info=True)
+            logging.error("An unexpected error occurred during TOC generation: %s", e, exc_info=True)
             return None
 
     def generate_kb(self, directory_path: Union[str, Path]) -> Optional[str]:
@@ -229,7 +448,7 @@ Generate a clear, hierarchical, and well-structured table of contents that would
         This method:
         1. Loads the KB extraction prompt template.
         2. Scans the provided directory to build an XML representation of the markdown files.
-        3. Removes the 'path' attribute from the XML document tags.
+        3. Leaves the 'path' attribute out of the XML document tags.
         4. If no documents are found or XML is invalid, returns None.
         5. Injects the path-less XML data into the prompt template.
         6. Calls the LLM with the specified model alias.
@@ -253,44 +472,27 @@ Generate a clear, hierarchical, and well-structured table of contents that would
                 # Error already logged in _load_prompt_template
                 return None
 
-            # 2. Scan the directory and build XML (includes paths initially)
-            xml_data_with_paths = self.scan_and_build_xml(directory_path)
+            # 2. Scan the directory and build XML without paths
+            xml_data_without_paths = self.scan_and_build_xml(directory_path, include_paths=False)
 
-            # 3. Check if XML contains documents and remove paths
-            xml_data_without_paths = None
-            try:
-                if not xml_data_with_paths: # Handle empty string case
-                    logging.info("Scan returned empty XML data, skipping KB generation.")
-                    return None
-
-                root = ET.fromstring(xml_data_with_paths)
-                documents = root.findall("document")
-
-                if len(documents) == 0:
-                    logging.info("No markdown documents found in the XML, skipping KB generation.")
-                    return None
-
-                # Remove the 'path' attribute from each document element
-                for doc in documents:
-                    if 'path' in doc.attrib:
-                        del doc.attrib['path']
-
-                # Convert the modified tree back to a string
-                xml_data_without_paths = ET.tostring(root, encoding="unicode", xml_declaration=False, short_empty_elements=False)
-
-            except ET.ParseError as e:
-                logging.error(f"Malformed XML data from scan, cannot generate KB: {e}")
+            # 3. Check that the XML holds at least one document element
+            if not xml_data_without_paths: # Handle empty string case
+                logging.info("Scan returned empty XML data, skipping KB generation.")
+                return None
+            problem = _documents_xml_problem(xml_data_without_paths)
+            if problem is not None:
+                logging.error("Malformed XML data from scan, cannot generate KB: %s", problem)
+                return None
+            if not _has_documents(xml_data_without_paths):
+                logging.info("No markdown documents found in the XML, skipping KB generation.")
                 return None
-            except Exception as e:
-                 logging.error(f"Error processing XML data for KB generation: {e}", exc_info=True)
-                 return None
-
 
             # 4. Inject path-less XML data into the prompt
-            if "{{documents}}" not in prompt_template:
-                 logging.error(f"Placeholder '{{documents}}' not found in template: {template_path}")
+            template_parts = prompt_template.split(DOCUMENTS_PLACEHOLDER)
+            if len(template_parts) == 1:
+                 logging.error("Placeholder '{documents}' not found in template: %s", template_path)
                  return None
-            final_prompt = prompt_template.replace("{{documents}}", xml_data_without_paths)
+            final_prompt = xml_data_without_paths.join(template_parts)
 
             # 5. Call the LLM
             model_alias = "gemini/gemini-2.5-pro-preview-03-25"
@@ -298,12 +500,12 @@ Generate a clear, hierarchical, and well-structured table of contents that would
                 generated_kb = self.llm_client.invoke(final_prompt, model=model_alias)
                 return generated_kb
             except Exception as e:
-                logging.error(f"LLM call failed for KB generation: {e}", exc_info=True)
+                logging.error("LLM call failed for KB generation: %s", e, exc_info=True)
                 return None
 
         except (FileNotFoundError, NotADirectoryError, FileIOError) as e:
-            logging.error(f"Failed to scan directory for KB generation: {e}", exc_info=True)
+            logging.error("Failed to scan directory for KB generation: %s", e, exc_info=True)
             return None
         except Exception as e:
-            logging.error(f"An unexpected error occurred during KB generation: {e}", exc_info=True)
+            logging.error("An unexpected error occurred during KB generation: %s", e, exc_info=True)
             return None
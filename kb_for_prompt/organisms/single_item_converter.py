@@ -354,7 +354,7 @@ class SingleItemConverter:
                         raise ValueError(f"Unsupported input type: {input_type}")
                     
                     # Check if we got valid markdown content
-                    if markdown_content and len(markdown_content.strip()) > 0:
+                    if markdown_content and not markdown_content.isspace():
                         return True, markdown_content, None
                     else:
                         raise ConversionError(
@@ -35,6 +35,7 @@ Usage:
     uv run kb_for_prompt/pages/kb_for_prompt.py --batch /path/to/inputs.csv
 """
 
+import logging
 import os
 import sys
 from pathlib import Path
@@ -53,7 +54,7 @@ from rich.prompt import Confirm # Import Confirm
 from kb_for_prompt.organisms.menu_system import MenuSystem
 from kb_for_prompt.organisms.single_item_converter import SingleItemConverter
 from kb_for_prompt.organisms.batch_converter import BatchConverter
-from kb_for_prompt.organisms.llm_client import LiteLlmClient # Import the new client
+from kb_for_prompt.organisms.llm_client import get_default_client # Import the new client
 from kb_for_prompt.organisms.condenser import condense_knowledge_base # Import condenser
 from kb_for_prompt.templates.banner import display_banner
 from kb_for_prompt.templates.progress import display_spinner # Import spinner
@@ -61,6 +62,9 @@ from kb_for_prompt.templates.progress import display_spinner # Import spinner
 # Define version directly to avoid import issues during direct execution
 __version__ = "0.1.0"
 
+# Format of log records written by the CLI
+LOG_FORMAT = '%(asctime)s - %(levelname)s - [%(name)s] %(message)s'
+
 
 @click.command()
 @click.version_option(version=__version__)
@@ -78,6 +82,8 @@ def main(url: Optional[str], file: Optional[str], batch: Optional[str],
 
     Run without options to use the interactive menu interface.
     """
+    # Logging is configured here, not by the library modules
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
     console = Console()
 
     try:
@@ -92,9 +98,9 @@ def main(url: Optional[str], file: Optional[str], batch: Optional[str],
             return handle_direct_conversion(url, file, batch, output_dir, console)
 
         # --- Interactive Menu Flow ---
-        # Instantiate the LLM client (using the simple simulator for now)
+        # Use the shared LLM client
         # In a real application, you might load API keys or configure a real client here.
-        llm_client = LiteLlmClient()
+        llm_client = get_default_client()
 
         # Instantiate the menu system, passing the console and the LLM client
         menu_system = MenuSystem(console=console, llm_client=llm_client)
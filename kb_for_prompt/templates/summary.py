@@ -18,14 +18,18 @@ including success/failure counts and tables with detailed information.
 """
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-import pandas as pd
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+# pandas is only needed for the DataFrame annotation; importing it at runtime
+# would cost every CLI start-up close to a second
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def display_conversion_summary(
     successful: List[Dict[str, Any]],
@@ -95,7 +99,7 @@ def display_conversion_summary(
 
 
 def display_dataframe_summary(
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
     title: str = "Data Summary",
     console: Optional[Console] = None
 ) -> None:
@@ -29,7 +29,7 @@ import pandas as pd
 import pytest
 from rich.console import Console
 
-from kb_for_prompt.organisms.batch_converter import BatchConverter
+from kb_for_prompt.organisms.batch_converter import BatchConverter, CSV_READ_BUFFER_SIZE
 from kb_for_prompt.atoms.error_utils import ValidationError, FileIOError, ConversionError
 
 
@@ -41,6 +41,32 @@ class TestBatchConverter:
         self.console = MagicMock(spec=Console)
         self.batch_converter = BatchConverter(console=self.console)
     
+    def test_max_workers_default(self, monkeypatch):
+        """Test that the default worker count scales with CPUs and is capped."""
+        monkeypatch.delenv('KBFP_MAX_WORKERS', raising=False)
+        
+        with patch('kb_for_prompt.organisms.batch_converter.os.cpu_count', return_value=2):
+            assert BatchConverter(console=self.console).max_workers == 10
+        with patch('kb_for_prompt.organisms.batch_converter.os.cpu_count', return_value=64):
+            assert BatchConverter(console=self.console).max_workers == 32
+    
+    def test_max_workers_from_argument_and_environment(self, monkeypatch):
+        """Test that an explicit worker count wins over KBFP_MAX_WORKERS."""
+        monkeypatch.setenv('KBFP_MAX_WORKERS', '12')
+        
+        assert BatchConverter(console=self.console).max_workers == 12
+        assert BatchConverter(console=self.console, max_workers=3).max_workers == 3
+    
+    @pytest.mark.parametrize('value', ['0', 'many'])
+    def test_max_workers_invalid(self, monkeypatch, value):
+        """Test that a non-positive or non-numeric worker count is rejected."""
+        monkeypatch.setenv('KBFP_MAX_WORKERS', value)
+        
+        with pytest.raises(ValidationError) as excinfo:
+            BatchConverter(console=self.console)
+        
+        assert excinfo.value.validation_type == 'max_workers'
+    
     @patch('kb_for_prompt.organisms.batch_converter.validate_file_path')
     @patch('builtins.open', new_callable=mock_open, read_data="url,files\nhttps://example.com,file1.pdf\nhttps://test.com,\n,file2.docx")
     @patch('kb_for_prompt.organisms.batch_converter.csv.reader')
@@ -74,7 +100,7 @@ class TestBatchConverter:
 
         # Verify mocks
         mock_validate_path.assert_called_once_with('test.csv')
-        mock_open_file.assert_called_once_with(Path('/path/to/test.csv'), 'r', newline='', encoding='utf-8')
+        mock_open_file.assert_called_once_with(Path('/path/to/test.csv'), 'r', newline='', encoding='utf-8', buffering=CSV_READ_BUFFER_SIZE)
         mock_csv_reader.assert_called_once()
 
     @patch('kb_for_prompt.organisms.batch_converter.validate_file_path')
@@ -102,7 +128,7 @@ class TestBatchConverter:
 
         # Verify mocks
         mock_validate_path.assert_called_once_with('error.csv')
-        mock_open_file.assert_called_once_with(Path('/path/to/error.csv'), 'r', newline='', encoding='utf-8')
+        mock_open_file.assert_called_once_with(Path('/path/to/error.csv'), 'r', newline='', encoding='utf-8', buffering=CSV_READ_BUFFER_SIZE)
         mock_csv_reader.assert_called_once()
 
     # Note: The test_read_inputs_from_csv_fallback is less relevant now as the primary
@@ -132,7 +158,7 @@ class TestBatchConverter:
 
         # Verify mocks
         mock_validate_path.assert_called_once_with('unreadable.csv')
-        mock_open_file.assert_called_once_with(Path('/path/to/unreadable.csv'), 'r', newline='', encoding='utf-8')
+        mock_open_file.assert_called_once_with(Path('/path/to/unreadable.csv'), 'r', newline='', encoding='utf-8', buffering=CSV_READ_BUFFER_SIZE)
 
     def test_validate_and_classify_inputs(self):
         """Test validation and classification of inputs."""
@@ -143,23 +169,19 @@ class TestBatchConverter:
             '/path/to/document.docx'     # Valid document
         ]
         
-        # Mock validate_input_item to return expected values
-        with patch('kb_for_prompt.organisms.batch_converter.validate_input_item') as mock_validate:
-            mock_validate.side_effect = [
+        # Mock validate_input_items to return expected values
+        with patch('kb_for_prompt.organisms.batch_converter.validate_input_items') as mock_validate:
+            mock_validate.return_value = [
                 ('url', 'https://example.com'),  # Valid URL
-                ValidationError(message="Invalid URL", input_value="invalid-url", validation_type="url"),  # Invalid URL
-                ValidationError(message="File not found", input_value="/path/to/nonexistent.pdf", validation_type="file_existence"),  # Invalid file
-                ('file', '/path/to/document.docx')  # Valid document
+                ('file', ValidationError(message="Invalid URL", input_value="invalid-url", validation_type="url")),  # Invalid URL
+                ('file', ValidationError(message="File not found", input_value="/path/to/nonexistent.pdf", validation_type="file_existence")),  # Invalid file
+                ('docx', '/path/to/document.docx')  # Valid document, with its detected file type
             ]
             
-            # Mock detect_file_type for valid files
-            with patch('kb_for_prompt.organisms.batch_converter.detect_file_type') as mock_detect:
-                mock_detect.return_value = 'docx'  # Return docx for the valid document
-                
-                # Call the method under test
-                with patch('kb_for_prompt.organisms.batch_converter.display_spinner') as mock_spinner:
-                    mock_spinner.return_value.__enter__.return_value = MagicMock()
-                    valid, invalid = self.batch_converter.validate_and_classify_inputs(inputs)
+            # Call the method under test
+            with patch('kb_for_prompt.organisms.batch_converter.display_spinner') as mock_spinner:
+                mock_spinner.return_value.__enter__.return_value = MagicMock()
+                valid, invalid = self.batch_converter.validate_and_classify_inputs(inputs)
         
         # Check the valid inputs
         assert len(valid) == 2
@@ -172,6 +194,24 @@ class TestBatchConverter:
         assert len(invalid) == 2
         assert invalid[0]['original'] == 'invalid-url'
         assert invalid[1]['original'] == '/path/to/nonexistent.pdf'
+        assert invalid[1]['error'] == 'File not found'
+        
+        # All inputs are validated in a single batch call
+        mock_validate.assert_called_once_with(inputs)
+    
+    def test_validate_and_classify_inputs_streams_in_chunks(self):
+        """Test that a lazy iterable of inputs is validated chunk by chunk."""
+        inputs = (f'https://example{i}.com' for i in range(5))
+        
+        with patch('kb_for_prompt.organisms.batch_converter.VALIDATION_CHUNK_SIZE', 2), \
+             patch('kb_for_prompt.organisms.batch_converter.validate_input_items') as mock_validate, \
+             patch('kb_for_prompt.organisms.batch_converter.display_spinner'):
+            mock_validate.side_effect = lambda chunk: [('url', item) for item in chunk]
+            valid, invalid = self.batch_converter.validate_and_classify_inputs(inputs)
+        
+        assert [item['original'] for item in valid] == [f'https://example{i}.com' for i in range(5)]
+        assert invalid == []
+        assert [len(call.args[0]) for call in mock_validate.call_args_list] == [2, 2, 1]
     
     @patch('kb_for_prompt.organisms.batch_converter.ensure_directory_exists')
     @patch('kb_for_prompt.organisms.batch_converter.display_conversion_summary')
@@ -205,11 +245,23 @@ class TestBatchConverter:
         successful = [{'file': '/output/dir/example_com.md', 'original': 'https://example.com', 'type': 'url'}]
         failed = [{'original': '/path/to/document.pdf', 'error': 'File not found', 'type': 'pdf'}]
         
+        # Mock validation results
+        valid_inputs = [
+            {'original': 'https://example.com', 'validated': 'https://example.com', 'type': 'url'},
+            {'original': '/path/to/document.pdf', 'validated': '/path/to/document.pdf', 'type': 'pdf'}
+        ]
+        
         with patch.object(self.batch_converter, 'read_inputs_from_csv', return_value=inputs):
-            with patch.object(self.batch_converter, '_process_batch', return_value=(successful, failed)):
-                with patch.object(self.batch_converter, '_display_input_summary'):
-                    # Call the method under test
-                    success, result = self.batch_converter.run('input.csv', '/output/dir')
+            with patch.object(self.batch_converter, 'validate_and_classify_inputs', return_value=(valid_inputs, [])) as mock_validate:
+                with patch.object(self.batch_converter, '_process_batch', return_value=(successful, failed)) as mock_process:
+                    with patch.object(self.batch_converter, '_display_input_summary') as mock_display_summary:
+                        # Call the method under test
+                        success, result = self.batch_converter.run('input.csv', '/output/dir')
+        
+        # Inputs are validated once and the results shared
+        mock_validate.assert_called_once_with(inputs)
+        mock_display_summary.assert_called_once_with(valid_inputs, [])
+        mock_process.assert_called_once_with(valid_inputs, [], Path('/output/dir'))
         
         # Check the results
         assert success
@@ -219,12 +271,10 @@ class TestBatchConverter:
         assert result['successful'][0]['original'] == 'https://example.com'
         assert result['failed'][0]['original'] == '/path/to/document.pdf'
     
+    @patch('kb_for_prompt.organisms.batch_converter.generate_output_filename')
     @patch('kb_for_prompt.organisms.batch_converter.ThreadPoolExecutor')
-    def test_process_batch(self, mock_executor_class):
+    def test_process_batch(self, mock_executor_class, mock_generate):
         """Test processing a batch of inputs concurrently."""
-        # Mock inputs
-        inputs = ['https://example.com', '/path/to/document.pdf']
-        
         # Mock validate_and_classify_inputs results
         valid_inputs = [
             {'original': 'https://example.com', 'validated': 'https://example.com', 'type': 'url'},
@@ -268,20 +318,28 @@ class TestBatchConverter:
         }
         mock_executor.submit.side_effect = [mock_future1, mock_future2]
 
-        # Mock concurrent.futures.as_completed to return futures and use the map
-        with patch('kb_for_prompt.organisms.batch_converter.concurrent.futures.as_completed', return_value=[mock_future1, mock_future2]):
-            with patch.object(self.batch_converter, 'validate_and_classify_inputs', return_value=(valid_inputs, invalid_inputs)):
-                with patch('kb_for_prompt.organisms.batch_converter.display_progress_bar') as mock_progress_bar:
-                    # Mock the progress bar context manager
-                    mock_progress = MagicMock()
-                    mock_progress.task_id = 'task1'
-                    mock_progress_bar.return_value.__enter__.return_value = mock_progress
+        # Mock concurrent.futures.wait to report every submitted future as done
+        with patch('kb_for_prompt.organisms.batch_converter.concurrent.futures.wait', side_effect=lambda fs, **kwargs: (list(fs), set())):
+            with patch('kb_for_prompt.organisms.batch_converter.display_progress_bar') as mock_progress_bar:
+                # Mock the progress bar context manager
+                mock_progress = MagicMock()
+                mock_progress.task_id = 'task1'
+                mock_progress_bar.return_value.__enter__.return_value = mock_progress
 
-                    # Reconstruct the future_to_input dictionary inside the mocked context
-                    # This is necessary because the original dict is created before as_completed is mocked
-                    with patch.dict(self.batch_converter.__dict__, {'future_to_input': future_to_input_map}):
+                # Reconstruct the future_to_input dictionary inside the mocked context
+                # This is necessary because the original dict is created before as_completed is mocked
+                with patch.dict(self.batch_converter.__dict__, {'future_to_input': future_to_input_map}):
+                    with patch('kb_for_prompt.organisms.batch_converter.gc.collect') as mock_collect, \
+                         patch('kb_for_prompt.organisms.batch_converter.clear_path_caches') as mock_clear, \
+                         patch('kb_for_prompt.organisms.batch_converter.PROGRESS_UPDATE_INTERVAL', 60):
                         # Call the method under test
-                        successful, failed = self.batch_converter._process_batch(inputs, Path('/output/dir'))
+                        successful, failed = self.batch_converter._process_batch(valid_inputs, invalid_inputs, Path('/output/dir'))
+        
+        # Both completions within the update interval are reported in one update
+        mock_progress.update.assert_called_once_with('task1', description="Processing 2/2", advance=2)
+        
+        # Garbage from the conversions is collected once the batch is done
+        mock_collect.assert_called_once_with()
 
         # Check the results
         assert len(successful) == 1
@@ -292,11 +350,112 @@ class TestBatchConverter:
         assert failed[0]['error'] == 'Failed to convert PDF'
         assert failed[0]['type'] == 'pdf' # Ensure type is included in failed items
 
+        # Output name reservations start afresh for the batch
+        mock_clear.assert_called_once_with()
+        
+        # Output paths are reserved on the submitting thread, one per input
+        assert mock_generate.call_count == 2
+        assert valid_inputs[0]['output_path'] == mock_generate.return_value
+        
         # Verify that submit was called correctly
         assert mock_executor.submit.call_count == 2
         mock_executor.submit.assert_any_call(self.batch_converter._process_single_input, valid_inputs[0], Path('/output/dir'))
         mock_executor.submit.assert_any_call(self.batch_converter._process_single_input, valid_inputs[1], Path('/output/dir'))
 
+    @patch('kb_for_prompt.organisms.batch_converter.generate_output_filename')
+    @patch('kb_for_prompt.organisms.batch_converter.ProcessPoolExecutor')
+    @patch('kb_for_prompt.organisms.batch_converter.ThreadPoolExecutor')
+    def test_process_batch_routes_files_to_processes(self, mock_thread_class, mock_process_class, mock_generate):
+        """Test that local files go to the process pool and URLs to the thread pool."""
+        from kb_for_prompt.organisms.batch_converter import _convert_input
+        
+        valid_inputs = [
+            {'original': 'https://example.com', 'validated': 'https://example.com', 'type': 'url'},
+            {'original': '/path/to/a.pdf', 'validated': '/path/to/a.pdf', 'type': 'pdf'},
+            {'original': '/path/to/b.docx', 'validated': '/path/to/b.docx', 'type': 'docx'}
+        ]
+        thread_executor = mock_thread_class.return_value.__enter__.return_value
+        process_executor = mock_process_class.return_value.__enter__.return_value
+        futures = []
+        
+        def submit(*args):
+            future = MagicMock()
+            future.result.return_value = {'success': True, 'output_path': f'/out/{len(futures)}.md'}
+            futures.append(future)
+            return future
+        
+        thread_executor.submit.side_effect = submit
+        process_executor.submit.side_effect = submit
+        
+        with patch('kb_for_prompt.organisms.batch_converter.os.cpu_count', return_value=4), \
+             patch('kb_for_prompt.organisms.batch_converter.concurrent.futures.wait', side_effect=lambda fs, **kwargs: (list(fs), set())), \
+             patch('kb_for_prompt.organisms.batch_converter.display_progress_bar'):
+            successful, failed = self.batch_converter._process_batch(valid_inputs, [], Path('/output/dir'))
+        
+        assert len(successful) == 3
+        assert failed == []
+        thread_executor.submit.assert_called_once_with(
+            self.batch_converter._process_single_input, valid_inputs[0], Path('/output/dir')
+        )
+        assert process_executor.submit.call_count == 2
+        process_executor.submit.assert_any_call(_convert_input, valid_inputs[1], Path('/output/dir'), 3, None)
+        assert mock_process_class.call_args.kwargs['max_workers'] == 2
+        assert mock_process_class.call_args.kwargs['initargs'] == (2,)
+        assert mock_process_class.call_args.kwargs['mp_context'].get_start_method() == 'spawn'
+    
+    @patch('kb_for_prompt.organisms.batch_converter.ThreadPoolExecutor')
+    def test_process_batch_output_name_failure_fails_one_input(self, mock_executor_class):
+        """Test that an input whose output name cannot be reserved fails alone."""
+        valid_inputs = [
+            {'original': 'https://example.com', 'validated': 'https://example.com', 'type': 'url'},
+            {'original': 'https://test.com', 'validated': 'https://test.com', 'type': 'url'}
+        ]
+        mock_executor = mock_executor_class.return_value.__enter__.return_value
+        mock_future = MagicMock()
+        mock_future.result.return_value = {'success': True, 'output_path': '/output/dir/test_com.md'}
+        mock_executor.submit.return_value = mock_future
+        
+        def generate(validated, output_dir):
+            if validated == 'https://example.com':
+                raise FileIOError(message="Permission denied", file_path=str(output_dir), operation="write")
+            return output_dir / 'test_com.md'
+        
+        with patch('kb_for_prompt.organisms.batch_converter.generate_output_filename', side_effect=generate), \
+             patch('kb_for_prompt.organisms.batch_converter.concurrent.futures.wait', side_effect=lambda fs, **kwargs: (list(fs), set())), \
+             patch('kb_for_prompt.organisms.batch_converter.display_progress_bar'):
+            successful, failed = self.batch_converter._process_batch(valid_inputs, [], Path('/output/dir'))
+        
+        # The remaining input is still converted
+        mock_executor.submit.assert_called_once_with(
+            self.batch_converter._process_single_input, valid_inputs[1], Path('/output/dir')
+        )
+        assert [item['original'] for item in successful] == ['https://test.com']
+        assert failed == [{'original': 'https://example.com', 'error': 'Permission denied', 'type': 'url'}]
+    
+    def test_iter_completed_bounds_in_flight_tasks(self):
+        """Test that inputs are submitted lazily with a bounded number in flight."""
+        from concurrent.futures import ThreadPoolExecutor
+        from kb_for_prompt.organisms.batch_converter import _iter_completed
+        
+        in_flight = []
+        peak = []
+        
+        def task(n):
+            peak.append(len(in_flight))
+            return n * 2
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            def submit(n):
+                in_flight.append(n)
+                future = executor.submit(task, n)
+                future.add_done_callback(lambda _: in_flight.remove(n))
+                return future
+            
+            results = {n: future.result() for n, future in _iter_completed(submit, range(20), 3)}
+        
+        assert results == {n: n * 2 for n in range(20)}
+        assert max(peak) <= 3
+    
     def test_process_single_input_url(self):
         """Test processing a single URL input."""
         # Input data
@@ -314,7 +473,7 @@ class TestBatchConverter:
             with patch('kb_for_prompt.organisms.batch_converter.generate_output_filename') as mock_generate:
                 mock_generate.return_value = Path('/output/dir/example_com.md')
                 
-                with patch('builtins.open', mock_open()) as mock_file:
+                with patch.object(Path, 'write_bytes') as mock_write:
                     # Call the method under test
                     result = self.batch_converter._process_single_input(input_data, Path('/output/dir'))
         
@@ -324,6 +483,42 @@ class TestBatchConverter:
         assert result['type'] == 'url'
         assert result['output_path'] == '/output/dir/example_com.md'
         assert result['error'] is None
+        mock_write.assert_called_once_with('# Example.com\n\nThis is a test markdown content.'.encode('utf-8'))
+    
+    def test_retry_budget_default_and_configured(self):
+        """Test that inputs have no retry budget unless one is configured."""
+        input_data = {
+            'original': 'https://example.com',
+            'validated': 'https://example.com',
+            'type': 'url'
+        }
+        assert self.batch_converter.retry_budget is None
+        
+        batch_converter = BatchConverter(console=self.console, retry_budget=600.0)
+        with patch('kb_for_prompt.organisms.batch_converter.convert_url_to_markdown', return_value=('# Example', 'https://example.com')) as mock_convert, \
+             patch('kb_for_prompt.organisms.batch_converter.generate_output_filename', return_value=Path('/output/dir/example_com.md')), \
+             patch.object(Path, 'write_bytes'):
+            batch_converter._process_single_input(input_data, Path('/output/dir'))
+        
+        mock_convert.assert_called_once_with('https://example.com', max_retries=3, retry_budget=600.0)
+    
+    def test_process_single_input_uses_reserved_output_path(self):
+        """Test that a pre-assigned output path is used without generating a new one."""
+        input_data = {
+            'original': 'https://example.com',
+            'validated': 'https://example.com',
+            'type': 'url',
+            'output_path': Path('/output/dir/reserved.md')
+        }
+        
+        with patch('kb_for_prompt.organisms.batch_converter.convert_url_to_markdown', return_value=('# Example', 'https://example.com')), \
+             patch('kb_for_prompt.organisms.batch_converter.generate_output_filename') as mock_generate, \
+             patch.object(Path, 'write_bytes'):
+            result = self.batch_converter._process_single_input(input_data, Path('/output/dir'))
+        
+        assert result['success']
+        assert result['output_path'] == '/output/dir/reserved.md'
+        mock_generate.assert_not_called()
     
     def test_process_single_input_doc(self):
         """Test processing a single Word document input."""
@@ -342,7 +537,7 @@ class TestBatchConverter:
             with patch('kb_for_prompt.organisms.batch_converter.generate_output_filename') as mock_generate:
                 mock_generate.return_value = Path('/output/dir/document.md')
                 
-                with patch('builtins.open', mock_open()) as mock_file:
+                with patch.object(Path, 'write_bytes') as mock_write:
                     # Call the method under test
                     result = self.batch_converter._process_single_input(input_data, Path('/output/dir'))
         
@@ -352,6 +547,7 @@ class TestBatchConverter:
         assert result['type'] == 'docx'
         assert result['output_path'] == '/output/dir/document.md'
         assert result['error'] is None
+        mock_write.assert_called_once_with('# Document\n\nThis is a test markdown content.'.encode('utf-8'))
     
     def test_process_single_input_pdf(self):
         """Test processing a single PDF input."""
@@ -370,7 +566,7 @@ class TestBatchConverter:
             with patch('kb_for_prompt.organisms.batch_converter.generate_output_filename') as mock_generate:
                 mock_generate.return_value = Path('/output/dir/document.md')
                 
-                with patch('builtins.open', mock_open()) as mock_file:
+                with patch.object(Path, 'write_bytes') as mock_write:
                     # Call the method under test
                     result = self.batch_converter._process_single_input(input_data, Path('/output/dir'))
         
@@ -380,6 +576,7 @@ class TestBatchConverter:
         assert result['type'] == 'pdf'
         assert result['output_path'] == '/output/dir/document.md'
         assert result['error'] is None
+        mock_write.assert_called_once_with('# PDF Document\n\nThis is a test markdown content.'.encode('utf-8'))
     
     def test_process_single_input_error(self):
         """Test processing a single input that results in an error."""
@@ -419,28 +616,45 @@ class TestBatchConverter:
         assert 'test error' in result['error']['message']
 
     def test_display_input_summary(self):
-        """Test displaying a summary of inputs."""
-        inputs = [
-            'https://example.com',
-            'https://test.com',
-            '/path/to/document.pdf',
-            '/path/to/other.docx'
+        """Test displaying a summary of inputs from their validation results."""
+        valid_inputs = [
+            {'original': 'https://example.com', 'validated': 'https://example.com', 'type': 'url'},
+            {'original': 'https://test.com', 'validated': 'https://test.com', 'type': 'url'},
+            {'original': '/path/to/document.pdf', 'validated': '/path/to/document.pdf', 'type': 'pdf'},
+            {'original': '/path/to/other.docx', 'validated': '/path/to/other.docx', 'type': 'docx'}
         ]
+        invalid_inputs = [{'original': 'nonexistent.pdf', 'error': 'File not found', 'details': None}]
         
-        # Mock is_url function
-        with patch('kb_for_prompt.organisms.batch_converter.is_url') as mock_is_url:
-            mock_is_url.side_effect = lambda x: x.startswith('http')
-            
-            # Mock display_processing_update
-            with patch('kb_for_prompt.organisms.batch_converter.display_processing_update') as mock_display:
-                # Call the method under test
-                self.batch_converter._display_input_summary(inputs)
+        # URLs are counted from the validated types, without classifying again
+        with patch('kb_for_prompt.organisms.batch_converter.display_processing_update') as mock_display:
+            # Call the method under test
+            self.batch_converter._display_input_summary(valid_inputs, invalid_inputs)
         
         # Check the results
-        mock_display.assert_called_once()
-        call_args, call_kwargs = mock_display.call_args
-        assert "Loaded 4 inputs" in call_args[0]
+        assert mock_display.call_count == 2
+        call_args, call_kwargs = mock_display.call_args_list[0]
+        assert "Loaded 5 inputs" in call_args[0]
         assert "2 URLs" in call_args[0]
         assert "2 files" in call_args[0]
+        assert "1 invalid" in call_args[0]
         assert call_kwargs['status'] == 'info'
         assert call_kwargs['console'] == self.console
+        
+        # Validation errors are reported up front
+        warning_args, warning_kwargs = mock_display.call_args_list[1]
+        assert warning_args[0] == "Skipping nonexistent.pdf: File not found"
+        assert warning_kwargs['status'] == 'warning'
+    
+    def test_display_input_summary_truncates_invalid_inputs(self):
+        """Test that only the first invalid inputs are listed individually."""
+        invalid_inputs = [
+            {'original': f'missing{i}.pdf', 'error': 'File not found', 'details': None}
+            for i in range(15)
+        ]
+        
+        with patch('kb_for_prompt.organisms.batch_converter.display_processing_update') as mock_display:
+            self.batch_converter._display_input_summary([], invalid_inputs)
+        
+        # Summary line, ten listed inputs and one line counting the rest
+        assert mock_display.call_count == 12
+        assert mock_display.call_args[0][0] == "...and 5 more invalid inputs"
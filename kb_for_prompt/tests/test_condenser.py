@@ -6,9 +6,14 @@
 # ]
 # ///
 
+import asyncio
+import json
+import os
+import stat
+import threading
 import pytest
 import logging
-from unittest.mock import patch, MagicMock, ANY
+from unittest.mock import patch, AsyncMock, MagicMock, ANY
 from pathlib import Path
 import sys
 
@@ -18,7 +23,12 @@ import sys
 
 # Import the function and constants to be tested
 try:
-    from kb_for_prompt.organisms.condenser import condense_knowledge_base, CONDENSE_PROMPT, CONDENSE_MODEL
+    from kb_for_prompt.organisms.condenser import (
+        condense_knowledge_base, condense_many, acondense_knowledge_base, _read_text_mapped, _split_markdown_by_headings,
+        _dedupe_paragraphs, CONDENSE_RESPONSE_FORMAT,
+        CONDENSE_SYSTEM_PROMPT, CONDENSE_USER_PROMPT, CONDENSE_MODEL, CONDENSE_MODEL_DRAFT,
+        SECTION_CONDENSE_SYSTEM_PROMPT, SECTION_CONDENSE_USER_PROMPT
+    )
     CONDENSER_AVAILABLE = True
 except ImportError as e:
     # This might happen if condenser.py itself has an issue unrelated to litellm
@@ -28,11 +38,15 @@ except ImportError as e:
 
 # --- Fixtures ---
 
+# stat results for a regular file and a directory
+REGULAR_FILE_STAT = os.stat_result((stat.S_IFREG | 0o644, 0, 0, 1, 0, 0, 128, 0, 0, 0))
+DIRECTORY_STAT = os.stat_result((stat.S_IFDIR | 0o755, 0, 0, 1, 0, 0, 4096, 0, 0, 0))
+
 @pytest.fixture
 def mock_llm_client_instance():
     """Provides a mock instance of LiteLlmClient."""
     client = MagicMock()
-    client.invoke = MagicMock()
+    client.invoke_stream = MagicMock()
     return client
 
 @pytest.fixture
@@ -68,49 +82,48 @@ class TestCondenseKnowledgeBase:
 
     @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
     @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
-    @patch('pathlib.Path.is_file')
-    @patch('pathlib.Path.read_text')
-    @patch('pathlib.Path.write_text')
     def test_condense_success(
         self,
-        mock_write_text,
-        mock_read_text,
-        mock_is_file,
         MockLiteLlmClient,
         mock_llm_client_instance, # Use the instance fixture
-        test_file_path,
-        expected_output_path,
+        tmp_path,
         sample_kb_content,
         sample_condensed_content,
         caplog
     ):
         """Test successful condensation of a knowledge base file."""
         # Arrange
-        mock_is_file.return_value = True
-        mock_read_text.return_value = sample_kb_content
+        kb_file_path = tmp_path / "dummy_kb.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        expected_output_path = tmp_path / "knowledge_base_condensed.md"
         MockLiteLlmClient.return_value = mock_llm_client_instance # Make constructor return our mock instance
-        mock_llm_client_instance.invoke.return_value = sample_condensed_content
+        # Stream the response in two pieces
+        half = len(sample_condensed_content) // 2
+        mock_llm_client_instance.invoke_stream.return_value = iter(
+            [sample_condensed_content[:half], sample_condensed_content[half:]]
+        )
 
-        expected_full_prompt = CONDENSE_PROMPT.format(knowledge_base_content=sample_kb_content)
+        expected_full_prompt = CONDENSE_USER_PROMPT.format(knowledge_base_content=sample_kb_content)
 
         # Act
         with caplog.at_level(logging.INFO):
-            result_path = condense_knowledge_base(test_file_path)
+            result_path = condense_knowledge_base(kb_file_path, quality="best")
 
         # Assert
         assert result_path == expected_output_path
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8')
-        MockLiteLlmClient.assert_called_once_with() # Check client instantiation
-        mock_llm_client_instance.invoke.assert_called_once_with(
+        assert expected_output_path.read_text(encoding='utf-8') == sample_condensed_content
+        assert not (tmp_path / "knowledge_base_condensed.md.part").exists()
+        MockLiteLlmClient.assert_called_once_with(cache_dir=tmp_path / ".kb_cache") # Check client instantiation
+        mock_llm_client_instance.invoke_stream.assert_called_once_with(
             prompt=expected_full_prompt,
-            model=CONDENSE_MODEL
+            model=CONDENSE_MODEL,
+            latency_optimized=True,
+            system_prompt=CONDENSE_SYSTEM_PROMPT
         )
-        mock_write_text.assert_called_once_with(sample_condensed_content, encoding='utf-8')
 
         # Check logs
-        assert f"Starting condensation process for: {test_file_path}" in caplog.text
-        assert f"Reading content from {test_file_path}" in caplog.text
+        assert f"Starting condensation process for: {kb_file_path}" in caplog.text
+        assert f"Reading content from {kb_file_path}" in caplog.text
         assert "LiteLlmClient instantiated successfully." in caplog.text
         assert f"Sending request to LLM model: {CONDENSE_MODEL}" in caplog.text
         assert "Received condensed content from LLM." in caplog.text
@@ -119,12 +132,11 @@ class TestCondenseKnowledgeBase:
 
     # --- Input File Error Handling ---
 
-    @patch('pathlib.Path.is_file', return_value=False)
-    @patch('pathlib.Path.exists', return_value=False) # Simulate file truly not existing
-    def test_condense_input_file_not_found(self, mock_exists, mock_is_file, test_file_path, caplog):
+    @patch('pathlib.Path.stat', side_effect=FileNotFoundError("No such file")) # Simulate file truly not existing
+    def test_condense_input_file_not_found(self, mock_stat, test_file_path, caplog):
         """Test handling when the input file does not exist."""
         # Arrange
-        # is_file and exists are patched
+        # stat is patched
 
         # Act
         with caplog.at_level(logging.ERROR):
@@ -132,16 +144,14 @@ class TestCondenseKnowledgeBase:
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_exists.assert_called_once_with() # Check that exists() was called after is_file() failed
+        mock_stat.assert_called_once_with() # A single stat distinguishes missing from non-file paths
         assert f"Input file not found: {test_file_path}" in caplog.text
 
-    @patch('pathlib.Path.is_file', return_value=False)
-    @patch('pathlib.Path.exists', return_value=True) # Simulate path exists but is not a file
-    def test_condense_input_path_is_directory(self, mock_exists, mock_is_file, test_file_path, caplog):
+    @patch('pathlib.Path.stat', return_value=DIRECTORY_STAT) # Simulate path exists but is not a file
+    def test_condense_input_path_is_directory(self, mock_stat, test_file_path, caplog):
         """Test handling when the input path is a directory."""
         # Arrange
-        # is_file and exists are patched
+        # stat is patched
 
         # Act
         with caplog.at_level(logging.ERROR):
@@ -149,16 +159,15 @@ class TestCondenseKnowledgeBase:
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_exists.assert_called_once_with()
+        mock_stat.assert_called_once_with()
         assert f"Input path exists but is not a file: {test_file_path}" in caplog.text
 
-    @patch('pathlib.Path.is_file', return_value=True)
-    @patch('pathlib.Path.read_text', side_effect=IOError("Permission denied"))
-    def test_condense_read_error(self, mock_read_text, mock_is_file, test_file_path, caplog):
+    @patch('pathlib.Path.stat', return_value=REGULAR_FILE_STAT)
+    @patch('kb_for_prompt.organisms.condenser._read_text_mapped', side_effect=IOError("Permission denied"))
+    def test_condense_read_error(self, mock_read_text, mock_stat, test_file_path, caplog):
         """Test handling of IOError during file reading."""
         # Arrange
-        # is_file and read_text are patched
+        # stat and the file read are patched
 
         # Act
         with caplog.at_level(logging.ERROR):
@@ -166,16 +175,16 @@ class TestCondenseKnowledgeBase:
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8')
+        mock_stat.assert_called_once_with()
+        mock_read_text.assert_called_once_with(test_file_path)
         assert f"Error reading file {test_file_path}: Permission denied" in caplog.text
 
     # --- LLM Client / Prerequisite Error Handling ---
 
     @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', False)
-    @patch('pathlib.Path.is_file', return_value=True)
-    @patch('pathlib.Path.read_text') # Need to mock read_text even if not used after check
-    def test_condense_litellm_not_available(self, mock_read_text, mock_is_file, test_file_path, sample_kb_content, caplog):
+    @patch('pathlib.Path.stat', return_value=REGULAR_FILE_STAT)
+    @patch('kb_for_prompt.organisms.condenser._read_text_mapped') # Need to mock the read even if not used after check
+    def test_condense_litellm_not_available(self, mock_read_text, mock_stat, test_file_path, sample_kb_content, caplog):
         """Test handling when the litellm library is not available."""
         # Arrange
         mock_read_text.return_value = sample_kb_content # Set return value even if not reached after check
@@ -186,15 +195,15 @@ class TestCondenseKnowledgeBase:
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8') # Read happens before check
+        mock_stat.assert_called_once_with()
+        mock_read_text.assert_called_once_with(test_file_path) # Read happens before check
         assert "Cannot condense knowledge base: The 'litellm' library is not installed or failed to load." in caplog.text
 
     @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
     @patch('kb_for_prompt.organisms.condenser.LiteLlmClient', side_effect=ImportError("Mock LLM Client Init Error"))
-    @patch('pathlib.Path.is_file', return_value=True)
-    @patch('pathlib.Path.read_text')
-    def test_condense_llm_client_init_error(self, mock_read_text, mock_is_file, MockLiteLlmClient, test_file_path, sample_kb_content, caplog):
+    @patch('pathlib.Path.stat', return_value=REGULAR_FILE_STAT)
+    @patch('kb_for_prompt.organisms.condenser._read_text_mapped')
+    def test_condense_llm_client_init_error(self, mock_read_text, mock_stat, MockLiteLlmClient, test_file_path, sample_kb_content, caplog):
         """Test handling when LiteLlmClient instantiation fails."""
         # Arrange
         mock_read_text.return_value = sample_kb_content
@@ -205,147 +214,140 @@ class TestCondenseKnowledgeBase:
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8')
-        MockLiteLlmClient.assert_called_once_with() # Attempted instantiation
+        mock_stat.assert_called_once_with()
+        mock_read_text.assert_called_once_with(test_file_path)
+        MockLiteLlmClient.assert_called_once_with(cache_dir=test_file_path.parent / ".kb_cache") # Attempted instantiation
         assert "Failed to instantiate LiteLlmClient: Mock LLM Client Init Error" in caplog.text
 
     @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
     @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
-    @patch('pathlib.Path.is_file', return_value=True)
-    @patch('pathlib.Path.read_text')
+    @patch('pathlib.Path.stat', return_value=REGULAR_FILE_STAT)
+    @patch('kb_for_prompt.organisms.condenser._read_text_mapped')
     def test_condense_llm_invoke_error(
         self,
         mock_read_text,
-        mock_is_file,
+        mock_stat,
         MockLiteLlmClient,
         mock_llm_client_instance, # Use the instance fixture
         test_file_path,
         sample_kb_content,
         caplog
     ):
-        """Test handling when the LLM client's invoke method raises an error."""
+        """Test handling when the LLM client's invoke_stream method raises an error."""
         # Arrange
-        mock_is_file.return_value = True
         mock_read_text.return_value = sample_kb_content
         MockLiteLlmClient.return_value = mock_llm_client_instance
         # Simulate an error during the invoke call (e.g., APIError, Timeout)
         # Using a generic Exception here as LiteLlmClient should catch specific ones
-        mock_llm_client_instance.invoke.side_effect = Exception("LLM API Error")
+        mock_llm_client_instance.invoke_stream.side_effect = Exception("LLM API Error")
 
-        expected_full_prompt = CONDENSE_PROMPT.format(knowledge_base_content=sample_kb_content)
+        expected_full_prompt = CONDENSE_USER_PROMPT.format(knowledge_base_content=sample_kb_content)
 
         # Act
         # Note: The internal invoke method might log its own error. We check for the condenser's log.
         with caplog.at_level(logging.ERROR):
-            result_path = condense_knowledge_base(test_file_path)
+            result_path = condense_knowledge_base(test_file_path, quality="best")
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8')
-        MockLiteLlmClient.assert_called_once_with()
-        mock_llm_client_instance.invoke.assert_called_once_with(
+        mock_stat.assert_called_once_with()
+        mock_read_text.assert_called_once_with(test_file_path)
+        MockLiteLlmClient.assert_called_once_with(cache_dir=test_file_path.parent / ".kb_cache")
+        mock_llm_client_instance.invoke_stream.assert_called_once_with(
             prompt=expected_full_prompt,
-            model=CONDENSE_MODEL
+            model=CONDENSE_MODEL,
+            latency_optimized=True,
+            system_prompt=CONDENSE_SYSTEM_PROMPT
         )
-        # Check if the error from invoke was caught and logged by condense_knowledge_base
-        # This depends on whether invoke itself raises or returns None on error.
-        # Assuming invoke *raises* an exception that condense_knowledge_base catches:
+        # invoke_stream raises rather than returning None, so condense_knowledge_base logs the error
         assert "An unexpected error occurred during the LLM invoke call: LLM API Error" in caplog.text
-        # OR, if invoke returns None on error and logs internally:
-        # assert f"LLM call failed or returned empty content for model {CONDENSE_MODEL}" in caplog.text
 
 
     @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
     @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
-    @patch('pathlib.Path.is_file', return_value=True)
-    @patch('pathlib.Path.read_text')
-    def test_condense_llm_returns_none(
+    def test_condense_llm_stream_fails_midway(
         self,
-        mock_read_text,
-        mock_is_file,
         MockLiteLlmClient,
         mock_llm_client_instance,
-        test_file_path,
+        tmp_path,
         sample_kb_content,
         caplog
     ):
-        """Test handling when the LLM client's invoke method returns None."""
+        """Test that a stream failing part-way leaves no condensed file behind."""
         # Arrange
-        mock_is_file.return_value = True
-        mock_read_text.return_value = sample_kb_content
+        kb_file_path = tmp_path / "dummy_kb.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
         MockLiteLlmClient.return_value = mock_llm_client_instance
-        mock_llm_client_instance.invoke.return_value = None # Simulate LLM returning None
 
-        expected_full_prompt = CONDENSE_PROMPT.format(knowledge_base_content=sample_kb_content)
+        def failing_stream():
+            yield "## Summary\n"
+            raise Exception("Connection reset")
+
+        mock_llm_client_instance.invoke_stream.return_value = failing_stream()
 
         # Act
         with caplog.at_level(logging.ERROR):
-            result_path = condense_knowledge_base(test_file_path)
+            result_path = condense_knowledge_base(kb_file_path)
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8')
-        MockLiteLlmClient.assert_called_once_with()
-        mock_llm_client_instance.invoke.assert_called_once_with(
-            prompt=expected_full_prompt,
-            model=CONDENSE_MODEL
-        )
-        assert f"LLM call failed or returned empty content for model {CONDENSE_MODEL}" in caplog.text
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["dummy_kb.md"]
+        assert "An unexpected error occurred during the LLM invoke call: Connection reset" in caplog.text
 
     @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
     @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
-    @patch('pathlib.Path.is_file', return_value=True)
-    @patch('pathlib.Path.read_text')
+    @patch('pathlib.Path.stat', return_value=REGULAR_FILE_STAT)
+    @patch('kb_for_prompt.organisms.condenser._read_text_mapped')
     def test_condense_llm_returns_empty(
         self,
         mock_read_text,
-        mock_is_file,
+        mock_stat,
         MockLiteLlmClient,
         mock_llm_client_instance,
-        test_file_path,
+        tmp_path,
         sample_kb_content,
         caplog
     ):
-        """Test handling when the LLM client's invoke method returns an empty string."""
+        """Test handling when the LLM client's invoke_stream method yields no content."""
         # Arrange
-        mock_is_file.return_value = True
         mock_read_text.return_value = sample_kb_content
         MockLiteLlmClient.return_value = mock_llm_client_instance
-        mock_llm_client_instance.invoke.return_value = "" # Simulate LLM returning empty string
+        mock_llm_client_instance.invoke_stream.return_value = iter([]) # Simulate LLM returning no content
+        test_file_path = tmp_path / "dummy_kb.md"
 
-        expected_full_prompt = CONDENSE_PROMPT.format(knowledge_base_content=sample_kb_content)
+        expected_full_prompt = CONDENSE_USER_PROMPT.format(knowledge_base_content=sample_kb_content)
 
         # Act
         with caplog.at_level(logging.ERROR): # Error is logged when content is falsey
-            result_path = condense_knowledge_base(test_file_path)
+            result_path = condense_knowledge_base(test_file_path, quality="best")
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8')
-        MockLiteLlmClient.assert_called_once_with()
-        mock_llm_client_instance.invoke.assert_called_once_with(
+        mock_stat.assert_called_once_with()
+        mock_read_text.assert_called_once_with(test_file_path)
+        MockLiteLlmClient.assert_called_once_with(cache_dir=test_file_path.parent / ".kb_cache")
+        mock_llm_client_instance.invoke_stream.assert_called_once_with(
             prompt=expected_full_prompt,
-            model=CONDENSE_MODEL
+            model=CONDENSE_MODEL,
+            latency_optimized=True,
+            system_prompt=CONDENSE_SYSTEM_PROMPT
         )
         assert f"LLM call failed or returned empty content for model {CONDENSE_MODEL}" in caplog.text
+        assert list(tmp_path.iterdir()) == []
 
 
     # --- Output File Error Handling ---
 
     @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
     @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
-    @patch('pathlib.Path.is_file', return_value=True)
-    @patch('pathlib.Path.read_text')
-    @patch('pathlib.Path.write_text', side_effect=IOError("Disk full"))
+    @patch('pathlib.Path.stat', return_value=REGULAR_FILE_STAT)
+    @patch('kb_for_prompt.organisms.condenser._read_text_mapped')
+    @patch('pathlib.Path.open', side_effect=IOError("Disk full"))
     def test_condense_write_error(
         self,
-        mock_write_text,
+        mock_open_path,
         mock_read_text,
-        mock_is_file,
+        mock_stat,
         MockLiteLlmClient,
         mock_llm_client_instance,
         test_file_path,
@@ -356,26 +358,586 @@ class TestCondenseKnowledgeBase:
     ):
         """Test handling of IOError during file writing."""
         # Arrange
-        mock_is_file.return_value = True
         mock_read_text.return_value = sample_kb_content
         MockLiteLlmClient.return_value = mock_llm_client_instance
-        mock_llm_client_instance.invoke.return_value = sample_condensed_content
+        mock_llm_client_instance.invoke_stream.return_value = iter([sample_condensed_content])
 
-        expected_full_prompt = CONDENSE_PROMPT.format(knowledge_base_content=sample_kb_content)
+        expected_full_prompt = CONDENSE_USER_PROMPT.format(knowledge_base_content=sample_kb_content)
 
         # Act
         with caplog.at_level(logging.ERROR):
-            result_path = condense_knowledge_base(test_file_path)
+            result_path = condense_knowledge_base(test_file_path, quality="best")
 
         # Assert
         assert result_path is None
-        mock_is_file.assert_called_once_with()
-        mock_read_text.assert_called_once_with(encoding='utf-8')
-        MockLiteLlmClient.assert_called_once_with()
-        mock_llm_client_instance.invoke.assert_called_once_with(
+        mock_stat.assert_called_once_with()
+        mock_read_text.assert_called_once_with(test_file_path)
+        MockLiteLlmClient.assert_called_once_with(cache_dir=test_file_path.parent / ".kb_cache")
+        mock_llm_client_instance.invoke_stream.assert_called_once_with(
             prompt=expected_full_prompt,
-            model=CONDENSE_MODEL
+            model=CONDENSE_MODEL,
+            latency_optimized=True,
+            system_prompt=CONDENSE_SYSTEM_PROMPT
         )
-        mock_write_text.assert_called_once_with(sample_condensed_content, encoding='utf-8')
+        mock_open_path.assert_called_once_with("w", encoding='utf-8')
         assert f"Error writing condensed file {expected_output_path}: Disk full" in caplog.text
 
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestReadTextMapped:
+    """Tests for reading knowledge base files through a memory map."""
+
+    def test_reads_utf8_content(self, tmp_path):
+        """Test that the decoded content matches the file."""
+        kb_file_path = tmp_path / "kb.md"
+        kb_file_path.write_text("# Café\n\nNaïve résumé ✓\n", encoding='utf-8')
+
+        assert _read_text_mapped(kb_file_path) == "# Café\n\nNaïve résumé ✓\n"
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file, which cannot be mapped, reads as empty."""
+        kb_file_path = tmp_path / "kb.md"
+        kb_file_path.touch()
+
+        assert _read_text_mapped(kb_file_path) == ""
+
+    def test_translates_newlines_like_read_text(self, tmp_path):
+        """Test that CRLF and CR line endings become LF."""
+        kb_file_path = tmp_path / "kb.md"
+        kb_file_path.write_bytes(b"a\r\nb\rc\n")
+
+        assert _read_text_mapped(kb_file_path) == kb_file_path.read_text(encoding='utf-8') == "a\nb\nc\n"
+
+    def test_invalid_utf8_raises(self, tmp_path):
+        """Test that undecodable files raise rather than being silently mangled."""
+        kb_file_path = tmp_path / "kb.md"
+        kb_file_path.write_bytes(b"\xff\xfe bad")
+
+        with pytest.raises(UnicodeDecodeError):
+            _read_text_mapped(kb_file_path)
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestSplitMarkdownByHeadings:
+    """Tests for splitting large knowledge bases into sections."""
+
+    def test_short_text_is_one_chunk(self):
+        """Test that text within the limit is returned whole."""
+        assert _split_markdown_by_headings("# A\nshort", max_chars=100) == ["# A\nshort"]
+
+    def test_splits_at_top_level_headings(self):
+        """Test that chunks start at # and ## headings, not deeper ones."""
+        text = "# A\n" + "a" * 40 + "\n### A.1\n" + "a" * 10 + "\n## B\n" + "b" * 40 + "\n"
+
+        chunks = _split_markdown_by_headings(text, max_chars=70)
+
+        assert chunks == ["# A\n" + "a" * 40 + "\n### A.1\n" + "a" * 10 + "\n", "## B\n" + "b" * 40 + "\n"]
+
+    def test_ignores_headings_in_code_fences(self):
+        """Test that '#' lines inside fenced code blocks do not start sections."""
+        text = "# A\n```\n# comment\n```\n" + "a" * 40 + "\n# B\n" + "b" * 40
+
+        chunks = _split_markdown_by_headings(text, max_chars=70)
+
+        assert chunks == ["# A\n```\n# comment\n```\n" + "a" * 40 + "\n", "# B\n" + "b" * 40]
+
+    def test_oversized_section_is_cut_to_limit(self):
+        """Test that every chunk fits and the chunks rebuild the input."""
+        text = "# A\n" + "a" * 250 + "\n\nshort paragraph\n## B\n" + "b" * 30
+
+        chunks = _split_markdown_by_headings(text, max_chars=100)
+
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert "".join(chunks) == text
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestDedupeParagraphs:
+    """Tests for _dedupe_paragraphs."""
+
+    def test_keeps_first_copy_of_repeated_paragraph(self):
+        """Test that repeated boilerplate is kept only once."""
+        md = "Home | Docs\n\nFirst article.\n\nHome | Docs\n\nSecond article."
+        assert _dedupe_paragraphs(md) == "Home | Docs\n\nFirst article.\n\nSecond article."
+
+    def test_strips_comments_and_blank_line_runs(self):
+        """Test that HTML comments and extra blank lines are removed."""
+        md = "Intro<!-- nav\nstart -->\n\n\n\nBody"
+        assert _dedupe_paragraphs(md) == "Intro\n\nBody"
+
+    def test_keeps_repeated_headings(self):
+        """Test that each article keeps its own headings."""
+        md = "## Overview\n\nAlpha.\n\n## Overview\n\nBeta."
+        assert _dedupe_paragraphs(md) == md
+
+    def test_keeps_code_blocks(self):
+        """Test that paragraphs in fenced code blocks are never dropped."""
+        md = "x = 1\n\n```\nx = 1\n\nx = 1\n```\n\nx = 1"
+        assert _dedupe_paragraphs(md) == "x = 1\n\n```\nx = 1\n\nx = 1\n```"
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestCondenseLargeKnowledgeBase:
+    """Tests for the section-by-section condensation of large knowledge bases."""
+
+    @patch('kb_for_prompt.organisms.condenser.CONDENSE_CHUNK_CHARS', 50)
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_sections_are_summarized_then_merged(self, MockLiteLlmClient, tmp_path):
+        """Test that section summaries, not the raw KB, go to the final pass."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text("# A\n" + "a" * 40 + "\n# B\n" + "b" * 40 + "\n", encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_many.return_value = ["summary A", "summary B"]
+        client.invoke_stream.return_value = iter(["merged"])
+
+        result_path = condense_knowledge_base(kb_file_path, quality="best")
+
+        assert result_path.read_text(encoding='utf-8') == "merged"
+        prompts = client.invoke_many.call_args.args[0]
+        assert client.invoke_many.call_args.kwargs["system_prompt"] == SECTION_CONDENSE_SYSTEM_PROMPT
+        assert prompts == [
+            SECTION_CONDENSE_USER_PROMPT.format(section_content="# A\n" + "a" * 40 + "\n"),
+            SECTION_CONDENSE_USER_PROMPT.format(section_content="# B\n" + "b" * 40 + "\n"),
+        ]
+        client.invoke_stream.assert_called_once_with(
+            prompt=CONDENSE_USER_PROMPT.format(knowledge_base_content="summary A\n\nsummary B"),
+            model=CONDENSE_MODEL,
+            latency_optimized=True,
+            system_prompt=CONDENSE_SYSTEM_PROMPT
+        )
+
+    @patch('kb_for_prompt.organisms.condenser.CONDENSE_CHUNK_CHARS', 50)
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_failed_section_fails_condensation(self, MockLiteLlmClient, tmp_path, caplog):
+        """Test that a section the LLM could not summarize is not silently dropped."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text("# A\n" + "a" * 40 + "\n# B\n" + "b" * 40 + "\n", encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_many.return_value = ["summary A", None]
+
+        with caplog.at_level(logging.ERROR):
+            result_path = condense_knowledge_base(kb_file_path)
+
+        assert result_path is None
+        client.invoke_stream.assert_not_called()
+        assert "Failed to summarize 1 of 2 knowledge base sections" in caplog.text
+
+    @patch('kb_for_prompt.organisms.condenser.CONDENSE_CHUNK_CHARS', 50)
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_oversized_prompt_is_refused_before_sending(self, MockLiteLlmClient, tmp_path, caplog):
+        """Test that a final prompt over the model's input limit is never sent."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text("# A\n" + "a" * 40 + "\n# B\n" + "b" * 40 + "\n", encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_many.return_value = ["summary A", "summary B"]
+        client.fits_context.return_value = False
+
+        with caplog.at_level(logging.ERROR):
+            result_path = condense_knowledge_base(kb_file_path, quality="best")
+
+        assert result_path is None
+        client.fits_context.assert_called_once_with(
+            CONDENSE_USER_PROMPT.format(knowledge_base_content="summary A\n\nsummary B"),
+            CONDENSE_MODEL,
+            CONDENSE_SYSTEM_PROMPT
+        )
+        client.invoke_stream.assert_not_called()
+        assert f"Knowledge base is too large to condense with model {CONDENSE_MODEL}" in caplog.text
+
+    @patch('kb_for_prompt.organisms.condenser.CONDENSE_CHUNK_CHARS', 50)
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_async_sections_are_summarized_then_merged(self, MockLiteLlmClient, tmp_path):
+        """Test that acondense_knowledge_base also condenses large KBs by section."""
+        kb_dir = tmp_path / "kb"
+        kb_dir.mkdir()
+        kb_file_path = kb_dir / "knowledge_base.md"
+        kb_file_path.write_text("# A\n" + "a" * 40 + "\n# B\n" + "b" * 40 + "\n", encoding='utf-8')
+
+        async def fake_ainvoke(prompt, model, latency_optimized, system_prompt):
+            if system_prompt == SECTION_CONDENSE_SYSTEM_PROMPT:
+                return "summary " + prompt.strip()[-1]
+            return "merged: " + prompt.split("--- KNOWLEDGE BASE CONTENT ---")[1].strip()
+
+        MockLiteLlmClient.return_value.ainvoke = fake_ainvoke
+
+        [result_path] = asyncio.run(acondense_knowledge_base([kb_file_path]))
+
+        assert result_path.read_text(encoding='utf-8') == "merged: summary a\n\nsummary b"
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestCondenseQuality:
+    """Tests for the draft-first model selection of condense_knowledge_base."""
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_good_draft_is_kept(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that a draft with topic headings is kept without calling the large model."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        # The heading marker is split across deltas
+        client.invoke_stream.return_value = iter(["Overview\n#", "# Topic A\n", "Details about A."])
+
+        result_path = condense_knowledge_base(kb_file_path)
+
+        assert result_path.read_text(encoding='utf-8') == "Overview\n## Topic A\nDetails about A."
+        client.invoke_stream.assert_called_once()
+        assert client.invoke_stream.call_args.kwargs["model"] == CONDENSE_MODEL_DRAFT
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_failed_draft_escalates(self, MockLiteLlmClient, tmp_path, sample_kb_content, caplog):
+        """Test that a draft without topic headings is replaced by the large model's output."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_stream.side_effect = [
+            iter(["Topics A and B are covered in detail."]),
+            iter(["## Topic A\nDetails about A."]),
+        ]
+
+        with caplog.at_level(logging.INFO):
+            result_path = condense_knowledge_base(kb_file_path, quality="balanced")
+
+        assert result_path.read_text(encoding='utf-8') == "## Topic A\nDetails about A."
+        assert not (tmp_path / "knowledge_base_condensed.md.part").exists()
+        assert [c.kwargs["model"] for c in client.invoke_stream.call_args_list] == [CONDENSE_MODEL_DRAFT, CONDENSE_MODEL]
+        assert f"Condensed content from model {CONDENSE_MODEL_DRAFT} failed the draft check" in caplog.text
+        assert f"Escalating condensation to model: {CONDENSE_MODEL}" in caplog.text
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_draft_error_escalates(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that the large model is tried when the draft model call fails."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_stream.side_effect = [Exception("quota exceeded"), iter(["## Topic A"])]
+
+        result_path = condense_knowledge_base(kb_file_path)
+
+        assert result_path.read_text(encoding='utf-8') == "## Topic A"
+        assert client.invoke_stream.call_args.kwargs["model"] == CONDENSE_MODEL
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_fast_keeps_draft_unchecked(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that quality="fast" never escalates to the large model."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_stream.return_value = iter(["short"])
+
+        result_path = condense_knowledge_base(kb_file_path, quality="fast")
+
+        assert result_path.read_text(encoding='utf-8') == "short"
+        client.invoke_stream.assert_called_once()
+        assert client.invoke_stream.call_args.kwargs["model"] == CONDENSE_MODEL_DRAFT
+
+    def test_unknown_quality_raises(self, tmp_path):
+        """Test that an unknown quality setting is rejected."""
+        with pytest.raises(ValueError):
+            condense_knowledge_base(tmp_path / "knowledge_base.md", quality="cheap")
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_async_failed_draft_escalates(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that acondense_knowledge_base also escalates a failed draft."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.ainvoke = AsyncMock(side_effect=["too short", "## Topic A\nDetails about A."])
+
+        [result_path] = asyncio.run(acondense_knowledge_base([kb_file_path]))
+
+        assert result_path.read_text(encoding='utf-8') == "## Topic A\nDetails about A."
+        assert [c.kwargs["model"] for c in client.ainvoke.await_args_list] == [CONDENSE_MODEL_DRAFT, CONDENSE_MODEL]
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestCondenseStructured:
+    """Tests for structured (JSON) condensation."""
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_writes_json_and_rendered_markdown(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that the JSON and its markdown rendering are both written."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        condensed = {"topics": [
+            {"name": "Topic A", "summary": "Details about A.", "sources": ["a.md"]},
+            {"name": "Topic B", "summary": "Details about B.", "sources": []},
+        ]}
+        client = MockLiteLlmClient.return_value
+        client.invoke.return_value = json.dumps(condensed)
+
+        result_path = condense_knowledge_base(kb_file_path, quality="best", structured=True)
+
+        assert result_path == tmp_path / "knowledge_base_condensed.md"
+        assert result_path.read_text(encoding='utf-8') == (
+            "## Topic A\n\nDetails about A.\n\nSources: a.md\n\n## Topic B\n\nDetails about B.\n"
+        )
+        assert json.loads((tmp_path / "knowledge_base_condensed.json").read_text(encoding='utf-8')) == condensed
+        assert client.invoke.call_args.kwargs["response_format"] == CONDENSE_RESPONSE_FORMAT
+        client.invoke_stream.assert_not_called()
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_invalid_json_escalates(self, MockLiteLlmClient, tmp_path, sample_kb_content, caplog):
+        """Test that a draft that is not valid JSON is replaced by the large model's output."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke.side_effect = [
+            "## Topic A",
+            json.dumps({"topics": [{"name": "Topic A", "summary": "Details about A.", "sources": []}]}),
+        ]
+
+        with caplog.at_level(logging.ERROR):
+            result_path = condense_knowledge_base(kb_file_path, structured=True)
+
+        assert result_path.read_text(encoding='utf-8') == "## Topic A\n\nDetails about A.\n"
+        assert [c.kwargs["model"] for c in client.invoke.call_args_list] == [CONDENSE_MODEL_DRAFT, CONDENSE_MODEL]
+        assert f"LLM returned invalid structured content for model {CONDENSE_MODEL_DRAFT}" in caplog.text
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestCondenseCheckpoint:
+    """Tests for skipping knowledge bases whose condensed file is up to date."""
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_unchanged_input_is_not_condensed_again(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that a rerun on the same content reuses the condensed file."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_stream.return_value = iter(["condensed"])
+
+        first = condense_knowledge_base(kb_file_path, quality="best")
+        second = condense_knowledge_base(kb_file_path, quality="best")
+
+        assert first == second == tmp_path / "knowledge_base_condensed.md"
+        client.invoke_stream.assert_called_once()
+        checkpoint = json.loads((tmp_path / "knowledge_base_condensed.md.meta.json").read_text(encoding='utf-8'))
+        assert checkpoint["model"] == CONDENSE_MODEL
+        assert checkpoint["structured"] is False
+        assert "completed_at" in checkpoint
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_changed_input_is_condensed_again(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that editing the knowledge base invalidates the checkpoint."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_stream.side_effect = [iter(["first"]), iter(["second"])]
+
+        condense_knowledge_base(kb_file_path, quality="best")
+        kb_file_path.write_text(sample_kb_content + "\n\n## Topic C\nDetails about C.", encoding='utf-8')
+        result_path = condense_knowledge_base(kb_file_path, quality="best")
+
+        assert result_path.read_text(encoding='utf-8') == "second"
+        assert client.invoke_stream.call_count == 2
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_model_outside_quality_setting_is_condensed_again(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that a draft-model result does not satisfy a request for the best quality."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.invoke_stream.side_effect = [iter(["draft"]), iter(["best"])]
+
+        condense_knowledge_base(kb_file_path, quality="fast")
+        result_path = condense_knowledge_base(kb_file_path, quality="best")
+
+        assert result_path.read_text(encoding='utf-8') == "best"
+        assert client.invoke_stream.call_args.kwargs["model"] == CONDENSE_MODEL
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_async_unchanged_input_is_not_condensed_again(self, MockLiteLlmClient, tmp_path, sample_kb_content):
+        """Test that acondense_knowledge_base also honours checkpoints."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text(sample_kb_content, encoding='utf-8')
+        client = MockLiteLlmClient.return_value
+        client.ainvoke = AsyncMock(return_value="condensed")
+
+        asyncio.run(acondense_knowledge_base([kb_file_path], quality="best"))
+        [result_path] = asyncio.run(acondense_knowledge_base([kb_file_path], quality="best"))
+
+        assert result_path == tmp_path / "knowledge_base_condensed.md"
+        assert client.ainvoke.await_count == 1
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestCondenseMany:
+    """Tests for the condense_many batch function."""
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_condenses_each_file_with_shared_client(self, MockLiteLlmClient, tmp_path, caplog):
+        """Test that results keep input order and all files share one client."""
+        paths = []
+        for name in ("a", "b", "c"):
+            kb_dir = tmp_path / name
+            kb_dir.mkdir()
+            kb_path = kb_dir / "knowledge_base.md"
+            kb_path.write_text(f"# KB {name}", encoding='utf-8')
+            paths.append(kb_path)
+        client = MockLiteLlmClient.return_value
+        client.invoke_stream.side_effect = lambda prompt, **kwargs: iter([f"condensed {prompt.strip()[-4:]}"])
+
+        with caplog.at_level(logging.INFO):
+            results = condense_many(paths, max_concurrency=2, cache_dir=tmp_path / "cache", quality="best")
+
+        assert results == [p.parent / "knowledge_base_condensed.md" for p in paths]
+        assert [r.read_text(encoding='utf-8') for r in results] == ["condensed KB a", "condensed KB b", "condensed KB c"]
+        MockLiteLlmClient.assert_called_once_with(cache_dir=tmp_path / "cache")
+        assert "Finished 3 of 3 knowledge bases" in caplog.text
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_failed_file_does_not_fail_others(self, MockLiteLlmClient, tmp_path):
+        """Test that a missing file yields None without affecting the rest."""
+        kb_path = tmp_path / "knowledge_base.md"
+        kb_path.write_text("# KB", encoding='utf-8')
+        MockLiteLlmClient.return_value.invoke_stream.return_value = iter(["condensed"])
+
+        results = condense_many([tmp_path / "missing.md", kb_path], quality="best")
+
+        assert results == [None, tmp_path / "knowledge_base_condensed.md"]
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_default_cache_shared_by_all_inputs(self, MockLiteLlmClient, tmp_path):
+        """Test that without a cache_dir the inputs share one cache in their common directory."""
+        paths = []
+        for name in ("a", "b"):
+            kb_dir = tmp_path / name
+            kb_dir.mkdir()
+            kb_path = kb_dir / "knowledge_base.md"
+            kb_path.write_text(f"# KB {name}", encoding='utf-8')
+            paths.append(kb_path)
+        MockLiteLlmClient.return_value.invoke_stream.side_effect = lambda prompt, **kwargs: iter(["condensed"])
+
+        condense_many(paths, quality="best")
+
+        MockLiteLlmClient.assert_called_once_with(cache_dir=tmp_path / ".kb_cache")
+
+    def test_rejects_zero_concurrency(self, tmp_path):
+        """Test that max_concurrency below 1 is rejected."""
+        with pytest.raises(ValueError):
+            condense_many([tmp_path / "knowledge_base.md"], max_concurrency=0)
+
+
+@pytest.mark.skipif(not CONDENSER_AVAILABLE, reason="Condenser module not available for import")
+class TestAcondenseKnowledgeBase:
+    """Tests for the acondense_knowledge_base coroutine."""
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_condenses_each_file_with_shared_client(self, MockLiteLlmClient, tmp_path):
+        """Test that every file is condensed through one shared client."""
+        paths = []
+        for name in ("a", "b"):
+            kb_dir = tmp_path / name
+            kb_dir.mkdir()
+            kb_path = kb_dir / "knowledge_base.md"
+            kb_path.write_text(f"# KB {name}", encoding='utf-8')
+            paths.append(kb_path)
+
+        client = MockLiteLlmClient.return_value
+        client.ainvoke = AsyncMock(side_effect=lambda prompt, model, latency_optimized, system_prompt: f"condensed {prompt.strip()[-4:]}")
+
+        results = asyncio.run(acondense_knowledge_base(paths, quality="best"))
+
+        assert results == [p.parent / "knowledge_base_condensed.md" for p in paths]
+        assert results[0].read_text(encoding='utf-8') == "condensed KB a"
+        assert results[1].read_text(encoding='utf-8') == "condensed KB b"
+        MockLiteLlmClient.assert_called_once_with(cache_dir=None)
+        assert client.ainvoke.await_count == 2
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_concurrency_is_capped(self, MockLiteLlmClient, tmp_path):
+        """Test that no more than max_concurrency LLM calls run at once."""
+        paths = []
+        for index in range(5):
+            kb_dir = tmp_path / str(index)
+            kb_dir.mkdir()
+            kb_path = kb_dir / "knowledge_base.md"
+            kb_path.write_text("# KB", encoding='utf-8')
+            paths.append(kb_path)
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_ainvoke(prompt, model, latency_optimized, system_prompt):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "condensed"
+
+        MockLiteLlmClient.return_value.ainvoke = fake_ainvoke
+
+        results = asyncio.run(acondense_knowledge_base(paths, max_concurrency=2))
+
+        assert all(result is not None for result in results)
+        assert peak == 2
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_failed_file_does_not_fail_others(self, MockLiteLlmClient, tmp_path):
+        """Test that a missing file yields None without affecting the rest."""
+        kb_path = tmp_path / "knowledge_base.md"
+        kb_path.write_text("# KB", encoding='utf-8')
+        MockLiteLlmClient.return_value.ainvoke = AsyncMock(return_value="condensed")
+
+        results = asyncio.run(acondense_knowledge_base([tmp_path / "missing.md", kb_path]))
+
+        assert results == [None, tmp_path / "knowledge_base_condensed.md"]
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', True)
+    @patch('kb_for_prompt.organisms.condenser.LiteLlmClient')
+    def test_file_io_runs_off_the_event_loop(self, MockLiteLlmClient, tmp_path):
+        """Test that reading and writing happen on worker threads, not the loop's thread."""
+        kb_file_path = tmp_path / "knowledge_base.md"
+        kb_file_path.write_text("# KB", encoding='utf-8')
+        MockLiteLlmClient.return_value.ainvoke = AsyncMock(return_value="condensed")
+        loop_thread = threading.get_ident()
+        io_threads = []
+
+        from kb_for_prompt.organisms import condenser
+        real_read, real_write = condenser._read_knowledge_base, condenser._write_condensed
+
+        def recording_read(path):
+            io_threads.append(threading.get_ident())
+            return real_read(path)
+
+        def recording_write(path, content, model):
+            io_threads.append(threading.get_ident())
+            return real_write(path, content, model)
+
+        with patch.object(condenser, '_read_knowledge_base', recording_read), \
+             patch.object(condenser, '_write_condensed', recording_write):
+            results = asyncio.run(acondense_knowledge_base([kb_file_path], quality="best"))
+
+        assert results == [tmp_path / "knowledge_base_condensed.md"]
+        assert len(io_threads) == 2
+        assert loop_thread not in io_threads
+
+    @patch('kb_for_prompt.organisms.condenser.LITELLM_AVAILABLE', False)
+    def test_litellm_not_available(self, tmp_path):
+        """Test that every entry is None when litellm is unavailable."""
+        results = asyncio.run(acondense_knowledge_base([tmp_path / "a.md", tmp_path / "b.md"]))
+
+        assert results == [None, None]
@@ -0,0 +1,67 @@
+"""Unit tests for the on-disk conversion cache."""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add project root to Python path to ensure imports work properly
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from kb_for_prompt.molecules.conversion_cache import (
+    file_cache_key,
+    url_cache_key,
+    load_cached_markdown,
+    store_cached_markdown,
+)
+
+
+class TestConversionCache:
+    """Tests for the conversion cache helpers."""
+    
+    @pytest.fixture
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Enable the cache in a temporary directory."""
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("KBFP_CACHE_DIR", str(cache_dir))
+        return cache_dir
+    
+    def test_disabled_without_cache_dir(self, tmp_path, monkeypatch):
+        """Test that nothing is keyed or stored when KBFP_CACHE_DIR is unset."""
+        monkeypatch.delenv("KBFP_CACHE_DIR", raising=False)
+        document = tmp_path / "document.pdf"
+        document.write_bytes(b"%PDF-1.4")
+        
+        assert file_cache_key(document, "pypdfium") is None
+        assert url_cache_key("https://example.com", {"ETag": '"abc"'}) is None
+        assert load_cached_markdown("abc") is None
+    
+    def test_file_key_tracks_content_and_settings(self, cache_dir, tmp_path):
+        """Test that file keys change with the bytes and the conversion settings."""
+        document = tmp_path / "document.pdf"
+        document.write_bytes(b"%PDF-1.4 first")
+        first = file_cache_key(document, "pypdfium", False)
+        
+        assert file_cache_key(document, "pypdfium", False) == first
+        assert file_cache_key(document, "pypdfium", True) != first
+        
+        document.write_bytes(b"%PDF-1.4 second")
+        assert file_cache_key(document, "pypdfium", False) != first
+        
+        assert file_cache_key(tmp_path / "missing.pdf") is None
+    
+    def test_url_key_requires_validator_header(self, cache_dir):
+        """Test that URLs are only keyed when the server sends ETag or Last-Modified."""
+        url = "https://example.com/page"
+        
+        assert url_cache_key(url, {}) is None
+        assert url_cache_key(url, {"ETag": '"v1"'}) != url_cache_key(url, {"ETag": '"v2"'})
+        assert url_cache_key(url, {"Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"})
+    
+    def test_store_and_load_round_trip(self, cache_dir):
+        """Test that stored markdown is returned for the same key."""
+        assert load_cached_markdown("abc") is None
+        
+        store_cached_markdown("abc", "# Cached\n")
+        
+        assert load_cached_markdown("abc") == "# Cached\n"
+        assert [p.name for p in cache_dir.iterdir()] == ["abc.md"]
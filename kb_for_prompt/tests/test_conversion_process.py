@@ -0,0 +1,86 @@
+"""Unit tests for running conversions in a killable child process."""
+
+import operator
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+import pytest
+
+# Add project root to Python path to ensure imports work properly
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from kb_for_prompt.molecules.conversion_process import ExportedResult, IsolatedConverter
+
+
+class TestExportedResult:
+    """Tests for ExportedResult."""
+    
+    def test_from_result_exports_markdown(self):
+        """Test that the document is reduced to its markdown."""
+        result = Mock()
+        result.document.export_to_markdown.return_value = '# Doc'
+        result.status = 'success'
+        result.errors = None
+        
+        exported = ExportedResult.from_result(result)
+        
+        assert exported.document.export_to_markdown() == '# Doc'
+        assert exported.status == 'success'
+        assert exported.errors == []
+    
+    def test_from_result_without_document(self):
+        """Test that a missing document stays missing."""
+        result = Mock(document=None, status='failure', errors=['bad page'])
+        
+        exported = ExportedResult.from_result(result)
+        
+        assert exported.document is None
+        assert exported.errors == ['bad page']
+
+
+class TestIsolatedConverter:
+    """Tests for IsolatedConverter."""
+    
+    def test_call_returns_result_and_reuses_process(self):
+        """Test that calls run in one child process and return their results."""
+        worker = IsolatedConverter(time.sleep, (0,))
+        try:
+            assert worker.call(operator.add, (1, 2), timeout=30) == 3
+            first_process = worker._process
+            assert worker.call(operator.add, (3, 4), timeout=30) == 7
+            assert worker._process is first_process
+        finally:
+            worker.close()
+    
+    def test_call_raises_child_errors(self):
+        """Test that an exception in the child is raised in the caller."""
+        worker = IsolatedConverter(time.sleep, (0,))
+        try:
+            with pytest.raises(ValueError):
+                worker.call(int, ('not a number',), timeout=30)
+        finally:
+            worker.close()
+    
+    def test_timeout_kills_the_child(self):
+        """Test that an overrunning call is stopped and the next call gets a new child."""
+        worker = IsolatedConverter(time.sleep, (0,))
+        try:
+            assert worker.call(operator.add, (1, 1), timeout=30) == 2
+            process = worker._process
+            
+            with pytest.raises(TimeoutError):
+                worker.call(time.sleep, (30,), timeout=0.2)
+            
+            assert not process.is_alive()
+            assert worker.call(operator.add, (2, 2), timeout=30) == 4
+        finally:
+            worker.close()
+    
+    def test_initializer_is_not_timed(self):
+        """Test that a slow initializer does not count against the call's timeout."""
+        worker = IsolatedConverter(time.sleep, (1,))
+        try:
+            assert worker.call(operator.add, (1, 2), timeout=0.5) == 3
+        finally:
+            worker.close()
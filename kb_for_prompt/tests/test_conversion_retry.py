@@ -0,0 +1,89 @@
+"""Unit tests for the shared conversion retry loop."""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+import pytest
+
+# Add project root to Python path to ensure imports work properly
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from kb_for_prompt.molecules.conversion_retry import convert_with_retry
+from kb_for_prompt.atoms.error_utils import ConversionError
+
+
+def _result(markdown):
+    """Build a mock docling ConversionResult holding the given markdown."""
+    result = Mock()
+    result.document.export_to_markdown.return_value = markdown
+    result.status = 'success'
+    return result
+
+
+class TestConvertWithRetry:
+    """Tests for convert_with_retry."""
+    
+    def _convert(self, attempt, **kwargs):
+        """Call convert_with_retry with the arguments shared by these tests."""
+        return convert_with_retry(
+            attempt,
+            input_path='/path/to/document.pdf',
+            conversion_type='pdf',
+            failure_message='Failed to convert pdf document',
+            transient_errors=(OSError,),
+            transient_label='File access error',
+            transient_key='os_error',
+            **kwargs
+        )
+    
+    def test_returns_markdown(self):
+        """Test that a successful attempt returns its markdown."""
+        assert self._convert(lambda attempt_timeout: _result('# Doc'), timeout=5) == '# Doc'
+    
+    @patch('kb_for_prompt.molecules.conversion_retry.time.sleep')
+    def test_transient_error_is_retried(self, mock_sleep):
+        """Test that transient errors are retried until an attempt succeeds."""
+        attempt = Mock(side_effect=[OSError("Device busy"), _result('# Doc')])
+        
+        assert self._convert(attempt, max_retries=2) == '# Doc'
+        assert attempt.call_count == 2
+        mock_sleep.assert_called_once()
+    
+    @patch('kb_for_prompt.molecules.conversion_retry.time.sleep')
+    def test_attempt_timeout_is_passed_and_retryable(self, mock_sleep):
+        """Test that attempts get the timeout and a TimeoutError is retried."""
+        attempt = Mock(side_effect=TimeoutError("Conversion timed out after 5 seconds"))
+        
+        with pytest.raises(ConversionError) as excinfo:
+            self._convert(attempt, max_retries=1, timeout=5)
+        
+        assert 'Conversion timed out' in str(excinfo.value)
+        assert excinfo.value.details['timeout'] == 5
+        assert excinfo.value.details['retries'] == 1
+        assert attempt.call_args_list == [((5,),), ((5,),)]
+        mock_sleep.assert_called_once()
+    
+    @patch('kb_for_prompt.molecules.conversion_retry.time.sleep')
+    @patch('kb_for_prompt.molecules.conversion_retry.random.uniform', return_value=5.0)
+    @patch('kb_for_prompt.molecules.conversion_retry.time.monotonic')
+    def test_retry_budget_stops_retries(self, mock_monotonic, mock_uniform, mock_sleep):
+        """Test that no retry starts once the backoff would overrun the budget."""
+        mock_monotonic.side_effect = [100.0, 100.0, 101.0, 106.0, 106.0, 108.0]
+        attempt = Mock(side_effect=OSError("Device busy"))
+        
+        with pytest.raises(ConversionError) as excinfo:
+            self._convert(attempt, max_retries=5, retry_budget=10.0)
+        
+        # First delay ends at 106 (< 110); the second would end at 113, past the budget
+        assert attempt.call_count == 2
+        mock_sleep.assert_called_once_with(5.0)
+        assert excinfo.value.details['retries'] == 1
+        assert excinfo.value.details['retry_budget'] == 10.0
+    
+    def test_retry_budget_clips_attempt_timeout(self):
+        """Test that an attempt is given no more time than the budget has left."""
+        attempt = Mock(return_value=_result('# Doc'))
+        
+        self._convert(attempt, timeout=30, retry_budget=5.0)
+        
+        assert attempt.call_args.args[0] <= 5.0
@@ -30,14 +30,17 @@ from kb_for_prompt.atoms.error_utils import ConversionError, ValidationError
 class TestDocConverter:
     """Tests for the Word document converter module."""
 
+    @pytest.fixture(autouse=True)
+    def reset_shared_converter(self, monkeypatch):
+        """Ensure each test builds its converter from the patched DocumentConverter."""
+        monkeypatch.setattr("kb_for_prompt.molecules.doc_converter._converter", None)
+
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.doc_converter.create_file_url')
     @patch('kb_for_prompt.molecules.doc_converter.DocumentConverter')
     def test_convert_doc_to_markdown_success(
             self, 
             mock_document_converter, 
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -45,7 +48,6 @@ class TestDocConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.docx')
         mock_validate_file_type.return_value = 'docx'
-        mock_create_file_url.return_value = 'file:///path/to/document.docx'
         
         # Mock docling DocumentConverter
         mock_result = Mock()
@@ -68,8 +70,7 @@ class TestDocConverter:
         mock_validate_file_type.assert_called_once_with(
             Path('/path/to/document.docx'), allowed_types=["doc", "docx"]
         )
-        mock_create_file_url.assert_called_once_with(Path('/path/to/document.docx'))
-        mock_converter.convert.assert_called_once_with('file:///path/to/document.docx')
+        mock_converter.convert.assert_called_once_with('/path/to/document.docx')
 
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_path')
     def test_convert_doc_to_markdown_validation_error(self, mock_validate_file_path):
@@ -89,12 +90,10 @@ class TestDocConverter:
 
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.doc_converter.create_file_url')
     @patch('kb_for_prompt.molecules.doc_converter.DocumentConverter')
     def test_convert_doc_to_markdown_empty_result(
             self, 
             mock_document_converter, 
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -102,7 +101,6 @@ class TestDocConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.doc')
         mock_validate_file_type.return_value = 'doc'
-        mock_create_file_url.return_value = 'file:///path/to/document.doc'
         
         # Mock docling DocumentConverter with empty result
         mock_result = Mock()
@@ -124,12 +122,10 @@ class TestDocConverter:
 
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.doc_converter.create_file_url')
     @patch('kb_for_prompt.molecules.doc_converter.DocumentConverter')
     def test_convert_doc_to_markdown_no_document(
             self, 
             mock_document_converter, 
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -137,7 +133,6 @@ class TestDocConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.docx')
         mock_validate_file_type.return_value = 'docx'
-        mock_create_file_url.return_value = 'file:///path/to/document.docx'
         
         # Mock docling DocumentConverter with no document
         mock_result = Mock()
@@ -159,14 +154,12 @@ class TestDocConverter:
 
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.doc_converter.create_file_url')
     @patch('kb_for_prompt.molecules.doc_converter.DocumentConverter')
     @patch('time.sleep')
     def test_convert_doc_to_markdown_with_retry(
             self, 
             mock_sleep,
             mock_document_converter,
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -174,7 +167,6 @@ class TestDocConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.docx')
         mock_validate_file_type.return_value = 'docx'
-        mock_create_file_url.return_value = 'file:///path/to/document.docx'
         
         # Mock success result for second attempt
         mock_success_result = Mock()
@@ -202,14 +194,12 @@ class TestDocConverter:
         
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.doc_converter.create_file_url')
     @patch('kb_for_prompt.molecules.doc_converter.DocumentConverter')
     @patch('time.sleep')
     def test_convert_doc_to_markdown_max_retries_exceeded(
             self,
             mock_sleep,
             mock_document_converter,
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -217,7 +207,6 @@ class TestDocConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.docx')
         mock_validate_file_type.return_value = 'docx'
-        mock_create_file_url.return_value = 'file:///path/to/document.docx'
         
         # Mock converter with repeated failures
         mock_converter = Mock()
@@ -242,12 +231,10 @@ class TestDocConverter:
 
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.doc_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.doc_converter.create_file_url')
     @patch('kb_for_prompt.molecules.doc_converter.DocumentConverter')
     def test_convert_doc_to_markdown_file_access_error(
             self,
             mock_document_converter,
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -255,7 +242,6 @@ class TestDocConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.docx')
         mock_validate_file_type.return_value = 'docx'
-        mock_create_file_url.return_value = 'file:///path/to/document.docx'
         
         # Mock converter with file access error
         mock_converter = Mock()
@@ -9,7 +9,8 @@ from kb_for_prompt.atoms.error_utils import (
     ConversionError, 
     FileIOError,
     format_error_message,
-    create_error_details
+    create_error_details,
+    is_retryable_error
 )
 
 
@@ -136,4 +137,31 @@ def test_create_error_details():
         "error_message": "Invalid value",
         "context": "testing",
         "line": 42
-    }
\ No newline at end of file
+    }
+
+def test_is_retryable_error():
+    """Test is_retryable_error classification."""
+    from unittest.mock import Mock
+    
+    # Validation failures never succeed on retry
+    assert not is_retryable_error(ValidationError("Invalid URL"))
+    
+    # Permanent HTTP statuses, raw or wrapped in details
+    http_error = Exception("404 Client Error")
+    http_error.response = Mock(status_code=404)
+    assert not is_retryable_error(http_error)
+    assert not is_retryable_error(
+        ConversionError("HTTP request failed", details={"status_code": 410})
+    )
+    
+    # Hard parser failures from docling
+    assert not is_retryable_error(
+        ConversionError("Failed", details={"status": "ConversionStatus.FAILURE"})
+    )
+    
+    # Transient errors are retried
+    http_error.response = Mock(status_code=503)
+    assert is_retryable_error(http_error)
+    assert is_retryable_error(TimeoutError("timed out"))
+    assert is_retryable_error(ConversionError("Empty", details={"status": "success"}))
+    assert is_retryable_error(ConversionError("File access error", details={}))
@@ -14,7 +14,10 @@ from kb_for_prompt.atoms.input_validator import (
     validate_file_path,
     validate_file_type,
     validate_directory_path,
-    validate_input_item
+    validate_input_item,
+    validate_input_items,
+    clear_url_cache,
+    FILE_VALIDATION_CHUNK_SIZE
 )
 from kb_for_prompt.atoms.error_utils import ValidationError
 
@@ -22,6 +25,10 @@ from kb_for_prompt.atoms.error_utils import ValidationError
 class TestValidateUrlFunction:
     """Tests for validate_url function."""
     
+    def setup_method(self):
+        """Reset cached connection checks between tests."""
+        clear_url_cache()
+    
     def test_valid_http_url(self):
         """Test with valid HTTP URL."""
         assert validate_url("http://example.com") is True
@@ -81,7 +88,7 @@ class TestValidateUrlFunction:
     
     def test_url_connection_check_success(self):
         """Test URL connection check success."""
-        with patch("requests.head") as mock_head:
+        with patch("requests.Session.head") as mock_head:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_head.return_value = mock_response
@@ -90,7 +97,7 @@ class TestValidateUrlFunction:
     
     def test_url_connection_check_http_error(self):
         """Test URL connection check with HTTP error."""
-        with patch("requests.head") as mock_head:
+        with patch("requests.Session.head") as mock_head:
             mock_response = MagicMock()
             mock_response.status_code = 404
             mock_head.return_value = mock_response
@@ -103,7 +110,7 @@ class TestValidateUrlFunction:
         """Test URL connection check with request exception."""
         # First, ensure is_url returns True to bypass the first check
         with patch("kb_for_prompt.atoms.input_validator.is_url", return_value=True):
-            with patch("requests.head") as mock_head, \
+            with patch("requests.Session.head") as mock_head, \
                  patch("requests.RequestException", Exception):  # Make any Exception a RequestException
                 
                 mock_head.side_effect = Exception("Connection refused")
@@ -111,7 +118,32 @@ class TestValidateUrlFunction:
                 with pytest.raises(ValidationError) as excinfo:
                     validate_url("https://example.com", check_connection=True)
                 assert "Failed to connect to URL" in str(excinfo.value)
+    
+    def test_url_connection_check_cached(self):
+        """Test that repeated connection checks reuse the cached status."""
+        with patch("requests.Session.head") as mock_head:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_head.return_value = mock_response
+            
+            assert validate_url("https://example.com", check_connection=True) is True
+            assert validate_url("https://example.com", check_connection=True) is True
+            assert mock_head.call_count == 1
+            
+            clear_url_cache()
+            assert validate_url("https://example.com", check_connection=True) is True
+            assert mock_head.call_count == 2
 
+    
+    def test_connection_check_session_pool_matches_concurrency(self):
+        """Test that the shared session keeps a connection per concurrent check."""
+        from kb_for_prompt.atoms import input_validator
+        
+        with patch.object(input_validator, "_session", None):
+            session = input_validator._get_session()
+            assert input_validator._get_session() is session
+            adapter = session.get_adapter("https://example.com")
+            assert adapter._pool_maxsize == input_validator.MAX_VALIDATION_WORKERS
 
 class TestValidateFilePathFunction:
     """Tests for validate_file_path function."""
@@ -299,4 +331,74 @@ class TestValidateInputItemFunction:
             
             with pytest.raises(ValidationError) as excinfo:
                 validate_input_item(self.file_path)
-            assert "Unsupported file type" in str(excinfo.value)
\ No newline at end of file
+            assert "Unsupported file type" in str(excinfo.value)
+
+
+class TestValidateInputItemsFunction:
+    """Tests for validate_input_items function."""
+    
+    def setup_method(self):
+        """Set up test environment."""
+        clear_url_cache()
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "test_file.pdf")
+        
+        # Create a test file
+        with open(self.file_path, "w") as f:
+            f.write("Test content")
+    
+    def teardown_method(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_mixed_inputs_preserve_order(self):
+        """Test that results are returned in input order with errors captured."""
+        missing = os.path.join(self.temp_dir, "missing.pdf")
+        results = validate_input_items(["https://example.com", self.file_path, missing])
+        
+        assert results[0] == ("url", "https://example.com")
+        assert results[1] == ("pdf", self.file_path)
+        assert results[2][0] == "file"
+        assert isinstance(results[2][1], ValidationError)
+        assert "File does not exist" in str(results[2][1])
+    
+    def test_concurrent_connection_checks(self):
+        """Test URL connection checks with success and error statuses."""
+        def fake_head(url, **kwargs):
+            response = MagicMock()
+            response.status_code = 404 if "missing" in url else 200
+            return response
+        
+        with patch("requests.Session.head", side_effect=fake_head) as mock_head:
+            results = validate_input_items(
+                ["https://example.com/a", "https://example.com/missing", self.file_path],
+                check_connection=True,
+                max_workers=2
+            )
+        
+        assert mock_head.call_count == 2
+        assert results[0] == ("url", "https://example.com/a")
+        assert results[1][0] == "url"
+        assert "URL returned error status: 404" in str(results[1][1])
+        assert results[2] == ("pdf", self.file_path)
+    
+    def test_many_files_in_chunks(self):
+        """Test that file inputs spanning several validation chunks keep their order."""
+        file_paths = []
+        for i in range(FILE_VALIDATION_CHUNK_SIZE * 2 + 5):
+            file_path = os.path.join(self.temp_dir, f"doc_{i}.pdf")
+            with open(file_path, "w") as f:
+                f.write("Test content")
+            file_paths.append(file_path)
+        file_paths.insert(10, os.path.join(self.temp_dir, "missing.pdf"))
+        
+        results = validate_input_items(file_paths, max_workers=4)
+        
+        assert len(results) == len(file_paths)
+        for file_path, (kind, result) in zip(file_paths, results):
+            if file_path.endswith("missing.pdf"):
+                assert kind == "file"
+                assert isinstance(result, ValidationError)
+            else:
+                assert kind == "pdf"
+                assert result == file_path
@@ -7,9 +7,10 @@
 # ]
 # ///
 
+import asyncio
 import pytest
 import logging
-from unittest.mock import patch, MagicMock, ANY
+from unittest.mock import patch, AsyncMock, MagicMock, ANY
 import sys
 from typing import Optional, List, Dict, Any, Type
 
@@ -39,7 +40,7 @@ except ImportError:
 # This ensures the client module can be imported even if litellm is missing,
 # allowing us to test the ImportError handling during instantiation.
 try:
-    from kb_for_prompt.organisms.llm_client import LiteLlmClient
+    from kb_for_prompt.organisms.llm_client import LiteLlmClient, SimpleLlmClient, get_default_client
 except ImportError as e:
     # If the client itself fails to import (e.g., due to syntax errors), re-raise
     if "litellm" not in str(e): # Check if the import error is *not* about litellm
@@ -140,6 +141,62 @@ class TestLiteLlmClientWithLiteLLM:
             # No api_key argument expected here
         )
 
+    @pytest.mark.parametrize(
+        "model, expected_extra",
+        [
+            ("bedrock/anthropic.claude-3-haiku", {"performanceConfig": {"latency": "optimized"}}),
+            ("openai/gpt-4o", {"service_tier": "priority"}),
+            ("gemini/gemini-pro", {}),
+            ("gpt-4o", {}),
+        ],
+        ids=["Bedrock", "OpenAI", "NoLatencyOption", "UnprefixedModel"]
+    )
+    def test_invoke_latency_optimized(self, mock_litellm_completion, model, expected_extra):
+        """Test that latency_optimized adds only the provider's own low-latency options."""
+        mock_litellm_completion.return_value = create_mock_litellm_response("ok")
+
+        LiteLlmClient().invoke("prompt", model, latency_optimized=True)
+
+        mock_litellm_completion.assert_called_once_with(
+            model=model,
+            messages=[{"role": "user", "content": "prompt"}],
+            **expected_extra
+        )
+
+    def test_invoke_system_prompt_is_marked_cacheable_for_claude(self, mock_litellm_completion):
+        """Test that Claude models get the instructions marked with cache_control."""
+        mock_litellm_completion.return_value = create_mock_litellm_response("ok")
+
+        LiteLlmClient().invoke("kb", "anthropic/claude-3-5-sonnet", system_prompt="Condense this.")
+
+        assert mock_litellm_completion.call_args.kwargs["messages"] == [
+            {
+                "role": "system",
+                "content": [{"type": "text", "text": "Condense this.", "cache_control": {"type": "ephemeral"}}],
+            },
+            {"role": "user", "content": "kb"},
+        ]
+
+    def test_invoke_system_prompt_is_plain_for_other_models(self, mock_litellm_completion):
+        """Test that other providers get a plain system message."""
+        mock_litellm_completion.return_value = create_mock_litellm_response("ok")
+
+        LiteLlmClient().invoke("kb", "gemini/gemini-pro", system_prompt="Condense this.")
+
+        assert mock_litellm_completion.call_args.kwargs["messages"] == [
+            {"role": "system", "content": "Condense this."},
+            {"role": "user", "content": "kb"},
+        ]
+
+    def test_invoke_response_format(self, mock_litellm_completion):
+        """Test that a response_format is passed through to litellm."""
+        mock_litellm_completion.return_value = create_mock_litellm_response("{}")
+        response_format = {"type": "json_object"}
+
+        LiteLlmClient().invoke("prompt", "gemini/gemini-pro", response_format=response_format)
+
+        assert mock_litellm_completion.call_args.kwargs["response_format"] == response_format
+
     # --- Individual Exception Handling Tests ---
 
     def test_api_error_handling(self, mock_litellm_completion, caplog):
@@ -310,6 +367,311 @@ class TestLiteLlmClientWithLiteLLM:
         assert "returned an unexpected response structure" in caplog.text.lower()
 
 
+@pytest.mark.skipif(not LITELLM_AVAILABLE, reason="litellm library not installed")
+class TestLiteLlmClientAsync:
+    """Tests for LiteLlmClient.ainvoke."""
+
+    def test_ainvoke_success(self):
+        """Test that ainvoke awaits acompletion and returns its content."""
+        mock_response = create_mock_litellm_response("Async response")
+        with patch('kb_for_prompt.organisms.llm_client.acompletion', new_callable=AsyncMock) as mock_acompletion:
+            mock_acompletion.return_value = mock_response
+
+            client = LiteLlmClient(api_key="my-api-key")
+            result = asyncio.run(client.ainvoke("prompt", "gemini/gemini-pro"))
+
+        assert result == "Async response"
+        mock_acompletion.assert_awaited_once_with(
+            model="gemini/gemini-pro",
+            messages=[{"role": "user", "content": "prompt"}],
+            api_key="my-api-key"
+        )
+
+    def test_ainvoke_error_returns_none(self, caplog):
+        """Test that ainvoke logs errors and returns None like invoke."""
+        with patch('kb_for_prompt.organisms.llm_client.acompletion', new_callable=AsyncMock) as mock_acompletion:
+            mock_acompletion.side_effect = Exception("Connection reset")
+
+            client = LiteLlmClient()
+            with caplog.at_level(logging.ERROR):
+                result = asyncio.run(client.ainvoke("prompt", "model"))
+
+        assert result is None
+        assert "Connection reset" in caplog.text
+
+
+def _rate_limit_error(retry_after: Optional[str] = None) -> "RateLimitError":
+    """Build a litellm RateLimitError, optionally carrying a Retry-After header."""
+    error = RateLimitError("Too many requests", llm_provider="gemini", model="gemini-pro")
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    error.response = MagicMock(headers=headers)
+    return error
+
+
+@pytest.mark.skipif(not LITELLM_AVAILABLE, reason="litellm library not installed")
+class TestLiteLlmClientRetries:
+    """Tests for retrying rate limited calls and for invoke_many."""
+
+    @patch('kb_for_prompt.organisms.llm_client.time.sleep')
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_rate_limit_is_retried_after_retry_after(self, mock_completion, mock_sleep):
+        """Test that a rate limited call waits for Retry-After and is retried."""
+        mock_completion.side_effect = [_rate_limit_error("3"), create_mock_litellm_response("ok")]
+
+        result = LiteLlmClient().invoke("prompt", "model")
+
+        assert result == "ok"
+        assert mock_completion.call_count == 2
+        mock_sleep.assert_called_once_with(3.0)
+
+    @patch('kb_for_prompt.organisms.llm_client.time.sleep')
+    @patch('kb_for_prompt.organisms.llm_client.random.uniform', return_value=0.5)
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_gives_up_after_max_retries(self, mock_completion, mock_uniform, mock_sleep, caplog):
+        """Test that retries stop after max_retries and the call returns None."""
+        mock_completion.side_effect = _rate_limit_error()
+
+        with caplog.at_level(logging.ERROR):
+            result = LiteLlmClient(max_retries=2).invoke("prompt", "model")
+
+        assert result is None
+        assert mock_completion.call_count == 3
+        assert mock_sleep.call_count == 2
+        assert "api error" in caplog.text.lower()
+
+    @patch('kb_for_prompt.organisms.llm_client.time.sleep')
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_retry_after_is_capped(self, mock_completion, mock_sleep):
+        """Test that an excessive Retry-After is capped at the maximum backoff."""
+        mock_completion.side_effect = [_rate_limit_error("3600"), create_mock_litellm_response("ok")]
+
+        LiteLlmClient().invoke("prompt", "model")
+
+        mock_sleep.assert_called_once_with(30.0)
+
+    @patch('kb_for_prompt.organisms.llm_client.time.sleep')
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_non_retryable_error_is_not_retried(self, mock_completion, mock_sleep):
+        """Test that errors other than throttling and outages fail immediately."""
+        mock_completion.side_effect = ValueError("bad prompt")
+
+        assert LiteLlmClient().invoke("prompt", "model") is None
+        mock_completion.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch('kb_for_prompt.organisms.llm_client.time.sleep')
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_invoke_stream_yields_deltas(self, mock_completion, mock_sleep):
+        """Test that invoke_stream retries opening the stream and yields its content."""
+        def chunk(content):
+            return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+        mock_completion.side_effect = [
+            _rate_limit_error("1"),
+            iter([chunk("Hello"), chunk(None), MagicMock(choices=[]), chunk(" world")]),
+        ]
+
+        deltas = list(LiteLlmClient().invoke_stream("prompt", "model"))
+
+        assert deltas == ["Hello", " world"]
+        assert mock_completion.call_args.kwargs["stream"] is True
+        mock_sleep.assert_called_once_with(1.0)
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_invoke_many_preserves_order(self, mock_completion):
+        """Test that invoke_many returns one response per prompt, in order."""
+        mock_completion.side_effect = lambda **kwargs: create_mock_litellm_response(
+            kwargs["messages"][0]["content"].upper()
+        )
+
+        results = LiteLlmClient().invoke_many(["a", "b", "c"], "model", max_concurrency=2)
+
+        assert results == ["A", "B", "C"]
+        assert mock_completion.call_count == 3
+
+    def test_invoke_many_rejects_zero_concurrency(self):
+        """Test that invoke_many requires at least one worker."""
+        with pytest.raises(ValueError):
+            LiteLlmClient().invoke_many(["a"], "model", max_concurrency=0)
+
+
+@pytest.mark.skipif(not LITELLM_AVAILABLE, reason="litellm library not installed")
+class TestLiteLlmClientFitsContext:
+    """Tests for the local context window check."""
+
+    @patch('kb_for_prompt.organisms.llm_client.litellm.token_counter')
+    @patch('kb_for_prompt.organisms.llm_client.litellm.get_model_info', return_value={"max_input_tokens": 5000})
+    def test_short_prompt_skips_counting(self, mock_info, mock_counter):
+        """Test that prompts shorter in UTF-8 bytes than the limit are not tokenized."""
+        assert LiteLlmClient().fits_context("short", "model") is True
+        mock_counter.assert_not_called()
+
+    @patch('kb_for_prompt.organisms.llm_client.litellm.token_counter', return_value=4500)
+    @patch('kb_for_prompt.organisms.llm_client.litellm.get_model_info', return_value={"max_input_tokens": 5000})
+    def test_non_ascii_prompt_is_counted(self, mock_info, mock_counter):
+        """Test that a prompt short in characters but long in bytes is tokenized."""
+        assert LiteLlmClient().fits_context("\u6f22" * 2000, "model") is False
+        mock_counter.assert_called_once()
+
+    @patch('kb_for_prompt.organisms.llm_client.litellm.token_counter', return_value=4500)
+    @patch('kb_for_prompt.organisms.llm_client.litellm.get_model_info', return_value={"max_input_tokens": 5000})
+    def test_prompt_over_limit_does_not_fit(self, mock_info, mock_counter):
+        """Test that the margin below the input limit is kept free."""
+        assert LiteLlmClient().fits_context("x" * 10000, "model", system_prompt="rules") is False
+        mock_counter.assert_called_once_with(
+            model="model",
+            messages=[{"role": "system", "content": "rules"}, {"role": "user", "content": "x" * 10000}]
+        )
+
+    @patch('kb_for_prompt.organisms.llm_client.litellm.token_counter', return_value=3000)
+    @patch('kb_for_prompt.organisms.llm_client.litellm.get_model_info', return_value={"max_input_tokens": 5000})
+    def test_prompt_within_limit_fits(self, mock_info, mock_counter):
+        """Test that a long prompt with few enough tokens fits."""
+        assert LiteLlmClient().fits_context("x" * 10000, "model") is True
+
+    @patch('kb_for_prompt.organisms.llm_client.litellm.token_counter')
+    @patch('kb_for_prompt.organisms.llm_client.litellm.get_model_info', side_effect=Exception("not mapped"))
+    def test_unknown_model_fits(self, mock_info, mock_counter):
+        """Test that the check passes when litellm does not know the model's limit."""
+        assert LiteLlmClient().fits_context("x" * 10000, "unknown/model") is True
+        mock_counter.assert_not_called()
+
+
+@pytest.mark.skipif(not LITELLM_AVAILABLE, reason="litellm library not installed")
+class TestLiteLlmClientCache:
+    """Tests for the on-disk response cache."""
+
+    @staticmethod
+    def _chunk(content):
+        """Build a mock streaming chunk carrying one delta."""
+        return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_response_format_is_part_of_cache_key(self, mock_completion, tmp_path):
+        """Test that a markdown answer is not reused for a JSON request."""
+        mock_completion.side_effect = [create_mock_litellm_response("# md"), create_mock_litellm_response("{}")]
+        client = LiteLlmClient(cache_dir=tmp_path)
+
+        assert client.invoke("prompt", "model") == "# md"
+        assert client.invoke("prompt", "model", response_format={"type": "json_object"}) == "{}"
+        assert mock_completion.call_count == 2
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_invoke_reuses_cached_response(self, mock_completion, tmp_path):
+        """Test that an identical call is served from the cache."""
+        mock_completion.return_value = create_mock_litellm_response("cached answer")
+        client = LiteLlmClient(cache_dir=tmp_path / "cache")
+
+        assert client.invoke("prompt", "model") == "cached answer"
+        assert client.invoke("prompt", "model") == "cached answer"
+
+        mock_completion.assert_called_once()
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_cache_is_keyed_by_model_and_prompt(self, mock_completion, tmp_path):
+        """Test that a different model or prompt misses the cache."""
+        mock_completion.return_value = create_mock_litellm_response("answer")
+        client = LiteLlmClient(cache_dir=tmp_path)
+
+        client.invoke("prompt", "model-a")
+        client.invoke("prompt", "model-b")
+        client.invoke("other prompt", "model-a")
+
+        assert mock_completion.call_count == 3
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_cache_is_keyed_by_system_prompt(self, mock_completion, tmp_path):
+        """Test that the same prompt with different instructions misses the cache."""
+        mock_completion.return_value = create_mock_litellm_response("answer")
+        client = LiteLlmClient(cache_dir=tmp_path)
+
+        client.invoke("prompt", "model", system_prompt="Summarize.")
+        client.invoke("prompt", "model", system_prompt="Translate.")
+        client.invoke("prompt", "model", system_prompt="Summarize.")
+
+        assert mock_completion.call_count == 2
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_failed_call_is_not_cached(self, mock_completion, tmp_path):
+        """Test that errors and empty responses are not cached."""
+        mock_completion.return_value = create_mock_litellm_response(None)
+        client = LiteLlmClient(cache_dir=tmp_path)
+
+        assert client.invoke("prompt", "model") is None
+        assert list(tmp_path.iterdir()) == []
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_stream_is_cached_once_complete(self, mock_completion, tmp_path):
+        """Test that a completed stream is cached and replayed without a call."""
+        mock_completion.return_value = iter([self._chunk("Hello"), self._chunk(" world")])
+        client = LiteLlmClient(cache_dir=tmp_path)
+
+        assert list(client.invoke_stream("prompt", "model")) == ["Hello", " world"]
+        assert list(client.invoke_stream("prompt", "model")) == ["Hello world"]
+        mock_completion.assert_called_once()
+
+    @patch('kb_for_prompt.organisms.llm_client.completion')
+    def test_interrupted_stream_is_not_cached(self, mock_completion, tmp_path):
+        """Test that a stream failing part-way leaves no cache entry."""
+        def failing_stream():
+            yield self._chunk("Hello")
+            raise ConnectionError("reset")
+
+        mock_completion.return_value = failing_stream()
+        client = LiteLlmClient(cache_dir=tmp_path)
+
+        with pytest.raises(ConnectionError):
+            list(client.invoke_stream("prompt", "model"))
+        assert list(tmp_path.iterdir()) == []
+
+    def test_ainvoke_reuses_cached_response(self, tmp_path):
+        """Test that ainvoke shares the cache with invoke."""
+        with patch('kb_for_prompt.organisms.llm_client.completion') as mock_completion:
+            mock_completion.return_value = create_mock_litellm_response("answer")
+            client = LiteLlmClient(cache_dir=tmp_path)
+            client.invoke("prompt", "model")
+
+        with patch('kb_for_prompt.organisms.llm_client.acompletion', new_callable=AsyncMock) as mock_acompletion:
+            assert asyncio.run(client.ainvoke("prompt", "model")) == "answer"
+        mock_acompletion.assert_not_awaited()
+
+
+@pytest.mark.skipif(not LITELLM_AVAILABLE, reason="litellm library not installed")
+def test_get_default_client_is_shared():
+    """Test that the default client is created once and reused."""
+    get_default_client.cache_clear()
+    try:
+        client = get_default_client()
+        assert isinstance(client, LiteLlmClient)
+        assert get_default_client() is client
+    finally:
+        get_default_client.cache_clear()
+
+
+class TestSimpleLlmClient:
+    """Tests for the keyword dispatch of SimpleLlmClient."""
+
+    def test_table_of_contents_prompt(self):
+        """Test that the keyword is matched regardless of case."""
+        assert "Simulated Table of Contents" in SimpleLlmClient().invoke("Build a Table Of Contents", "model")
+
+    def test_knowledge_base_prompts(self):
+        """Test that either knowledge base keyword gives the knowledge base response."""
+        client = SimpleLlmClient()
+        assert "Simulated Knowledge Base" in client.invoke("Write the KNOWLEDGE BASE", "model")
+        assert "Simulated Knowledge Base" in client.invoke("Extract key information", "model")
+
+    def test_table_of_contents_takes_priority(self):
+        """Test that a later table of contents keyword wins over an earlier knowledge base one."""
+        response = SimpleLlmClient().invoke("From the knowledge base, write a table of contents", "model")
+        assert "Simulated Table of Contents" in response
+
+    def test_other_prompt(self):
+        """Test that prompts without a keyword get the generic response."""
+        assert SimpleLlmClient().invoke("Hello", "model") == "Simulated response for model model based on the provided prompt."
+
+
 # --- Test LiteLLM Not Installed Scenario ---
 
 # This test runs only if litellm is *not* available
@@ -1,5 +1,6 @@
 import pytest
 import logging
+import os
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 import xml.etree.ElementTree as ET
@@ -9,7 +10,7 @@ pytest.importorskip("rich")
 from rich.console import Console # noqa: E402 - Import after importorskip
 
 # Import the specific component being tested
-from kb_for_prompt.organisms.llm_generator import LlmGenerator, TEMPLATE_DIR # noqa: E402
+from kb_for_prompt.organisms.llm_generator import LlmGenerator, TEMPLATE_DIR, _read_markdown_file, _load_prompt_template_cached # noqa: E402
 from kb_for_prompt.atoms.error_utils import FileIOError # noqa: E402
 
 # Define sample test data to be used across tests
@@ -73,6 +74,13 @@ MOCK_TEMPLATE_PATH = TEMPLATE_DIR / "kb_extraction_prompt.md"
 
 # --- Tests for _load_prompt_template ---
 
+@pytest.fixture(autouse=True)
+def clear_template_cache():
+    """Start each test with an empty prompt template cache."""
+    _load_prompt_template_cached.cache_clear()
+    yield
+    _load_prompt_template_cached.cache_clear()
+
 @patch('pathlib.Path.is_file')
 @patch('pathlib.Path.read_text')
 def test_load_prompt_template_success(mock_read_text, mock_is_file, generator, sample_data):
@@ -117,6 +125,138 @@ def test_load_prompt_template_read_error(mock_read_text, mock_is_file, generator
     assert content is None
     assert f"Error reading prompt template file {template_path}: Permission denied" in caplog.text
 
+@patch('pathlib.Path.is_file')
+@patch('pathlib.Path.read_text')
+def test_load_prompt_template_is_cached(mock_read_text, mock_is_file, generator, sample_data):
+    """Test that a template is read from disk only once per path."""
+    mock_is_file.return_value = True
+    mock_read_text.return_value = sample_data["kb_template_content"]
+    template_path = Path("dummy/path/template.md")
+
+    assert generator._load_prompt_template(template_path) == sample_data["kb_template_content"]
+    assert generator._load_prompt_template(template_path) == sample_data["kb_template_content"]
+
+    mock_read_text.assert_called_once_with(encoding="utf-8")
+
+@patch('pathlib.Path.is_file')
+@patch('pathlib.Path.read_text', side_effect=[IOError("Busy"), "# Template"])
+def test_load_prompt_template_errors_are_not_cached(mock_read_text, mock_is_file, generator):
+    """Test that a failed read is retried on the next call."""
+    mock_is_file.return_value = True
+    template_path = Path("dummy/path/template.md")
+
+    assert generator._load_prompt_template(template_path) is None
+    assert generator._load_prompt_template(template_path) == "# Template"
+
+# --- Tests for scan_and_build_xml ---
+
+def test_scan_and_build_xml_reads_all_files_in_order(generator, tmp_path):
+    """Test that every markdown file is included, in the order rglob finds them."""
+    (tmp_path / "usage").mkdir()
+    (tmp_path / "intro.md").write_text("Introduction & overview.", encoding="utf-8")
+    (tmp_path / "usage" / "guide.md").write_text("Usage <guide>.", encoding="utf-8")
+    (tmp_path / "usage" / "empty.md").write_text("", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("Not markdown.", encoding="utf-8")
+
+    root = ET.fromstring(generator.scan_and_build_xml(tmp_path))
+
+    expected_paths = [p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.md")]
+    assert [doc.get("path") for doc in root] == expected_paths
+    texts = {doc.get("path"): doc.text or "" for doc in root}
+    assert texts == {
+        "intro.md": "Introduction & overview.",
+        "usage/guide.md": "Usage <guide>.",
+        "usage/empty.md": "",
+    }
+
+def test_scan_and_build_xml_matches_rglob_traversal(generator, tmp_path):
+    """Test that the walk visits the same files as rglob, without following directory symlinks."""
+    for directory in ("a/b/c", "a/d", "e"):
+        (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / directory / "doc.md").write_text(directory, encoding="utf-8")
+    (tmp_path / "a" / "top.md").write_text("top", encoding="utf-8")
+    (tmp_path / "linked").symlink_to(tmp_path / "a", target_is_directory=True)
+    (tmp_path / "alias.md").symlink_to(tmp_path / "e" / "doc.md")
+
+    root = ET.fromstring(generator.scan_and_build_xml(tmp_path))
+
+    expected_paths = [p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.md")]
+    assert [doc.get("path") for doc in root] == expected_paths
+    assert "alias.md" in expected_paths
+    assert not any(path.startswith("linked/") for path in expected_paths)
+
+def test_scan_and_build_xml_matches_elementtree_serialization(generator, tmp_path):
+    """Test that the XML is escaped and laid out exactly as ElementTree would write it."""
+    content = 'Tags <b>&amp; "quotes"\n\tindented > done'
+    (tmp_path / 'say "hi" & <go>.md').write_text(content, encoding="utf-8")
+    (tmp_path / "empty.md").write_text("", encoding="utf-8")
+
+    xml_data = generator.scan_and_build_xml(tmp_path)
+
+    expected_root = ET.Element("documents")
+    for path in tmp_path.rglob("*.md"):
+        doc = ET.SubElement(expected_root, "document", path=path.name)
+        doc.text = path.read_text(encoding="utf-8")
+    assert xml_data == ET.tostring(expected_root, encoding="unicode", short_empty_elements=False)
+
+def test_scan_and_build_xml_without_paths(generator, tmp_path):
+    """Test that include_paths=False leaves out the path attributes."""
+    (tmp_path / "a.md").write_text("A & B", encoding="utf-8")
+    assert generator.scan_and_build_xml(tmp_path, include_paths=False) == (
+        "<documents><document>A &amp; B</document></documents>"
+    )
+
+def test_scan_and_build_xml_empty_directory(generator, tmp_path):
+    """Test that a directory without markdown files gives an empty documents element."""
+    assert generator.scan_and_build_xml(tmp_path) == "<documents></documents>"
+
+def test_scan_and_build_xml_skips_unreadable_files(generator, tmp_path, caplog):
+    """Test that a file that cannot be decoded is skipped with a warning."""
+    (tmp_path / "good.md").write_text("Good content.", encoding="utf-8")
+    (tmp_path / "bad.md").write_bytes(b"\xff\xfe not utf-8")
+
+    with caplog.at_level(logging.WARNING):
+        root = ET.fromstring(generator.scan_and_build_xml(tmp_path))
+
+    assert [doc.get("path") for doc in root] == ["good.md"]
+    assert "Skipping file 'bad.md' due to error" in caplog.text
+
+def test_read_markdown_file_matches_text_mode(tmp_path):
+    """Test that raw reads return what a text-mode read would, newlines included."""
+    samples = {
+        "crlf.md": b"# Title\r\n\r\nBody\r\n",
+        "cr.md": b"old\rmac\r",
+        "mixed.md": "caf\u00e9\n\r\n\r".encode("utf-8"),
+        "empty.md": b"",
+        "large.md": b"x" * 200_000,
+    }
+    for name, data in samples.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        assert _read_markdown_file(path)[:2] == (path.read_text(encoding="utf-8"), None)
+
+def test_scan_and_build_xml_rereads_only_changed_files(generator, tmp_path):
+    """Test that a rescan reuses unchanged files and rereads changed ones."""
+    (tmp_path / "same.md").write_text("Same", encoding="utf-8")
+    changed = tmp_path / "changed.md"
+    changed.write_text("Before", encoding="utf-8")
+    generator.scan_and_build_xml(tmp_path)
+
+    changed.write_text("After!", encoding="utf-8")
+    os.utime(changed, ns=(0, 0))
+    (tmp_path / "new.md").write_text("New", encoding="utf-8")
+
+    with patch('kb_for_prompt.organisms.llm_generator.os.read', wraps=os.read) as mock_read:
+        root = ET.fromstring(generator.scan_and_build_xml(tmp_path, include_paths=False))
+
+    assert sorted(doc.text for doc in root) == ["After!", "New", "Same"]
+    assert mock_read.call_count == 2
+
+def test_scan_and_build_xml_missing_directory(generator, tmp_path):
+    """Test that scanning a missing directory raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        generator.scan_and_build_xml(tmp_path / "missing")
+
 # --- Tests for generate_toc ---
 
 @patch('kb_for_prompt.organisms.llm_generator.LlmGenerator.scan_and_build_xml')
@@ -226,14 +366,21 @@ def test_generate_toc_no_llm_client(caplog):
 @patch('kb_for_prompt.organisms.llm_generator.LlmGenerator.scan_and_build_xml')
 def test_generate_kb_success(mock_scan, mock_load_template, generator, mock_llm_client, sample_data):
     """Test successful KB generation."""
+    # Create XML without path attributes, as the scan builds it for KB generation
+    root = ET.fromstring(sample_data["xml_data"])
+    for doc in root.findall("document"):
+        if 'path' in doc.attrib:
+            del doc.attrib['path']
+    xml_without_paths = ET.tostring(root, encoding="unicode", xml_declaration=False, short_empty_elements=False)
+
     mock_load_template.return_value = sample_data["kb_template_content"]
-    mock_scan.return_value = sample_data["xml_data"]
+    mock_scan.return_value = xml_without_paths
     mock_llm_client.invoke.return_value = sample_data["kb_md"]
 
     kb = generator.generate_kb(Path("./test_output_dir"))
 
     mock_load_template.assert_called_once_with(MOCK_TEMPLATE_PATH)
-    mock_scan.assert_called_once()
+    mock_scan.assert_called_once_with(Path("./test_output_dir"), include_paths=False)
     mock_llm_client.invoke.assert_called_once()
     
     # Check prompt argument passed to invoke
@@ -241,14 +388,6 @@ def test_generate_kb_success(mock_scan, mock_load_template, generator, mock_llm_
     prompt_arg = call_args[0]
     assert isinstance(prompt_arg, str)
     
-    # Create XML without path attributes for comparison
-    # We're doing this because our new implementation removes path attributes
-    root = ET.fromstring(sample_data["xml_data"])
-    for doc in root.findall("document"):
-        if 'path' in doc.attrib:
-            del doc.attrib['path']
-    xml_without_paths = ET.tostring(root, encoding="unicode", xml_declaration=False, short_empty_elements=False)
-    
     expected_final_prompt = sample_data["kb_template_content"].replace("{{documents}}", xml_without_paths)
     assert prompt_arg == expected_final_prompt
     
@@ -4,7 +4,7 @@ Tests for path_utils.py
 
 import os
 import pytest
-from pathlib import Path
+from pathlib import Path, PureWindowsPath
 import tempfile
 import shutil
 from unittest.mock import patch, MagicMock
@@ -14,7 +14,8 @@ from kb_for_prompt.atoms.path_utils import (
     create_file_url,
     ensure_directory_exists,
     generate_output_filename,
-    is_same_file
+    is_same_file,
+    clear_path_caches
 )
 from kb_for_prompt.atoms.error_utils import FileIOError
 
@@ -46,6 +47,14 @@ class TestResolvePathFunction:
         # Test with a base path
         result = resolve_path("relative/path", "/base/path")
         assert result == Path("/base/path/relative/path")
+    
+    def test_cwd_change_not_cached(self):
+        # A changed working directory must not return a stale cached result
+        with patch("pathlib.Path.cwd") as mock_cwd:
+            mock_cwd.return_value = Path("/first/dir")
+            assert resolve_path("relative/path") == Path("/first/dir/relative/path")
+            mock_cwd.return_value = Path("/second/dir")
+            assert resolve_path("relative/path") == Path("/second/dir/relative/path")
 
 
 class TestCreateFileUrlFunction:
@@ -53,24 +62,27 @@ class TestCreateFileUrlFunction:
     
     def test_unix_path(self):
         # Test with a Unix-style path
-        with patch("os.name", "posix"), patch("kb_for_prompt.atoms.path_utils.resolve_path") as mock_resolve:
+        with patch("kb_for_prompt.atoms.path_utils.resolve_path") as mock_resolve:
             mock_resolve.return_value = Path("/path/to/file.txt")
             url = create_file_url("/path/to/file.txt")
             assert url == "file:///path/to/file.txt"
     
     def test_windows_path(self):
         # Test with a Windows-style path
-        with patch("os.name", "nt"), patch("kb_for_prompt.atoms.path_utils.resolve_path") as mock_resolve:
-            # Since we're on a non-Windows system, we need to create a regular Path
-            # and then mock its behavior to act like a Windows path
+        with patch("kb_for_prompt.atoms.path_utils.resolve_path") as mock_resolve:
+            # Since we're on a non-Windows system, return a pure Windows path
+            # from absolute() so the Windows URI rules apply
             mock_path = MagicMock()
             mock_resolve.return_value = mock_path
-            
-            # Mock the absolute() method to return a string
-            mock_path.absolute.return_value = "C:\\path\\to\\file.txt"
+            mock_path.absolute.return_value = PureWindowsPath("C:\\path\\to\\file.txt")
             
             url = create_file_url("C:\\path\\to\\file.txt")
             assert url == "file:///C:/path/to/file.txt"
+    
+    def test_special_characters_are_encoded(self):
+        # Test that characters outside the URI grammar are percent-encoded
+        url = create_file_url("/path/to/my file.txt")
+        assert url == "file:///path/to/my%20file.txt"
 
 
 class TestEnsureDirectoryExistsFunction:
@@ -107,6 +119,20 @@ class TestEnsureDirectoryExistsFunction:
         assert result.exists()
         assert result.is_dir()
     
+    def test_repeated_call_skips_mkdir(self):
+        # Test that a directory is only created once per process
+        new_dir = os.path.join(self.temp_dir, "repeated")
+        ensure_directory_exists(new_dir)
+        
+        with patch("pathlib.Path.mkdir") as mock_mkdir:
+            result = ensure_directory_exists(new_dir)
+            assert result == Path(new_dir)
+            mock_mkdir.assert_not_called()
+            
+            clear_path_caches()
+            ensure_directory_exists(new_dir)
+            mock_mkdir.assert_called_once()
+    
     def test_permission_error(self):
         # Test with a directory that can't be created
         with patch("pathlib.Path.mkdir") as mock_mkdir:
@@ -172,6 +198,38 @@ class TestGenerateOutputFilenameFunction:
         result = generate_output_filename(url, self.temp_dir)
         assert result.name == "example_com_page_2.md"
     
+    def test_repeated_input_without_writing(self):
+        # Names handed out earlier in the process are not reused
+        url = "https://example.com/page"
+        first = generate_output_filename(url, self.temp_dir)
+        second = generate_output_filename(url, self.temp_dir)
+        assert first.name == "example_com_page.md"
+        assert second.name == "example_com_page_1.md"
+    
+    def test_names_released_by_clear_path_caches(self):
+        # Once the caches are cleared, a name whose file is gone is handed out again
+        url = "https://example.com/page"
+        first = generate_output_filename(url, self.temp_dir)
+        first.write_text("Converted content")
+        first.unlink()
+        
+        clear_path_caches()
+        assert generate_output_filename(url, self.temp_dir) == first
+    
+    def test_special_characters(self):
+        # Runs of special characters collapse into a single underscore
+        url = "https://example.com/docs/page?id=1&lang=en"
+        result = generate_output_filename(url, self.temp_dir)
+        assert result.name == "example_com_docs_page.md"
+        
+        file_path = "/path/to/my report (final).pdf"
+        result = generate_output_filename(file_path, self.temp_dir)
+        assert result.name == "my_report_final.md"
+        
+        url = "https://example.com/Guide__Intro.HTML"
+        result = generate_output_filename(url, self.temp_dir)
+        assert result.name == "example_com_Guide_Intro.md"
+    
     def test_very_long_url(self):
         # Test with a very long URL
         long_url = "https://example.com/" + "a" * 200
@@ -184,6 +242,9 @@ class TestIsSameFileFunction:
     """Tests for is_same_file function."""
     
     def setup_method(self):
+        # Memoized resolutions from earlier tests must not leak into mocked ones
+        clear_path_caches()
+        
         # Create a temporary directory for testing
         self.temp_dir = tempfile.mkdtemp()
         self.file_path = os.path.join(self.temp_dir, "test_file.txt")
@@ -23,21 +23,30 @@ import pytest
 # Add project root to Python path to ensure imports work properly
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from kb_for_prompt.molecules.pdf_converter import convert_pdf_to_markdown
+from kb_for_prompt.molecules.pdf_converter import (
+    convert_pdf_to_markdown, convert_pdf_to_markdown_stream, convert_pdfs_to_markdown, convert_many
+)
 from kb_for_prompt.atoms.error_utils import ConversionError, ValidationError
+from docling.datamodel.settings import settings as docling_settings
 
 
 class TestPdfConverter:
     """Tests for the PDF document converter module."""
 
+    @pytest.fixture(autouse=True)
+    def reset_shared_converter(self, monkeypatch):
+        """Ensure each test builds its converter from the patched DocumentConverter."""
+        monkeypatch.setattr("kb_for_prompt.molecules.pdf_converter._converters", {})
+        monkeypatch.delenv("KBFP_PDF_BACKEND", raising=False)
+        monkeypatch.setattr(docling_settings.perf, "doc_batch_size", 1)
+        monkeypatch.setattr(docling_settings.perf, "doc_batch_concurrency", 1)
+
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.pdf_converter.create_file_url')
     @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
     def test_convert_pdf_to_markdown_success(
             self, 
             mock_document_converter, 
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -45,7 +54,6 @@ class TestPdfConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.pdf')
         mock_validate_file_type.return_value = 'pdf'
-        mock_create_file_url.return_value = 'file:///path/to/document.pdf'
         
         # Mock docling DocumentConverter
         mock_result = Mock()
@@ -68,8 +76,59 @@ class TestPdfConverter:
         mock_validate_file_type.assert_called_once_with(
             Path('/path/to/document.pdf'), allowed_types=["pdf"]
         )
-        mock_create_file_url.assert_called_once_with(Path('/path/to/document.pdf'))
-        mock_converter.convert.assert_called_once_with('file:///path/to/document.pdf')
+        mock_converter.convert.assert_called_once_with('/path/to/document.pdf')
+
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
+    @patch('kb_for_prompt.molecules.pdf_converter._get_isolated_converter')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_convert_pdf_to_markdown_timeout_uses_conversion_process(
+            self,
+            mock_document_converter,
+            mock_get_isolated,
+            mock_validate_file_type,
+            mock_validate_file_path
+        ):
+        """Test that timed attempts run in a killable conversion process."""
+        from kb_for_prompt.molecules.conversion_process import ExportedResult
+        from kb_for_prompt.molecules.pdf_converter import _convert_exported
+        
+        mock_validate_file_path.return_value = Path('/path/to/document.pdf')
+        mock_validate_file_type.return_value = 'pdf'
+        mock_worker = mock_get_isolated.return_value
+        mock_worker.call.return_value = ExportedResult('# Converted Markdown', 'SUCCESS', [])
+        
+        markdown_content, _ = convert_pdf_to_markdown('/path/to/document.pdf', timeout=60)
+        
+        assert markdown_content == '# Converted Markdown'
+        mock_get_isolated.assert_called_once_with('pypdfium', False, 'fast')
+        mock_worker.call.assert_called_once_with(
+            _convert_exported, ('/path/to/document.pdf', 'pypdfium', False, 'fast'), 60
+        )
+        mock_document_converter.assert_not_called()
+
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_converter_reused_across_calls(
+            self, 
+            mock_document_converter, 
+            mock_validate_file_type, 
+            mock_validate_file_path
+        ):
+        """Test that the DocumentConverter is only constructed once."""
+        mock_validate_file_path.return_value = Path('/path/to/document.pdf')
+        mock_validate_file_type.return_value = 'pdf'
+        
+        mock_result = Mock()
+        mock_result.document.export_to_markdown.return_value = '# Converted Markdown'
+        mock_document_converter.return_value.convert.return_value = mock_result
+        
+        convert_pdf_to_markdown('/path/to/document.pdf')
+        convert_pdf_to_markdown('/path/to/document.pdf')
+        
+        mock_document_converter.assert_called_once()
+        assert mock_document_converter.return_value.convert.call_count == 2
 
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
     def test_convert_pdf_to_markdown_validation_error(self, mock_validate_file_path):
@@ -89,12 +148,10 @@ class TestPdfConverter:
 
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.pdf_converter.create_file_url')
     @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
     def test_convert_pdf_to_markdown_empty_result(
             self, 
             mock_document_converter, 
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -102,7 +159,6 @@ class TestPdfConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.pdf')
         mock_validate_file_type.return_value = 'pdf'
-        mock_create_file_url.return_value = 'file:///path/to/document.pdf'
         
         # Mock docling DocumentConverter with empty result
         mock_result = Mock()
@@ -124,12 +180,33 @@ class TestPdfConverter:
 
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.pdf_converter.create_file_url')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_convert_pdf_to_markdown_whitespace_result(
+            self,
+            mock_document_converter,
+            mock_validate_file_type,
+            mock_validate_file_path
+        ):
+        """Test that whitespace-only markdown counts as empty."""
+        mock_validate_file_path.return_value = Path('/path/to/document.pdf')
+        mock_validate_file_type.return_value = 'pdf'
+        
+        mock_result = Mock()
+        mock_result.document.export_to_markdown.return_value = ' \n\t\n '
+        mock_result.status = 'SUCCESS'
+        mock_document_converter.return_value.convert.return_value = mock_result
+        
+        with pytest.raises(ConversionError) as excinfo:
+            convert_pdf_to_markdown('/path/to/document.pdf', max_retries=0)
+        
+        assert 'Conversion produced empty markdown content' in str(excinfo.value)
+
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
     @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
     def test_convert_pdf_to_markdown_no_document(
             self, 
             mock_document_converter, 
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -137,7 +214,6 @@ class TestPdfConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.pdf')
         mock_validate_file_type.return_value = 'pdf'
-        mock_create_file_url.return_value = 'file:///path/to/document.pdf'
         
         # Mock docling DocumentConverter with no document
         mock_result = Mock()
@@ -159,14 +235,12 @@ class TestPdfConverter:
 
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.pdf_converter.create_file_url')
     @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
     @patch('time.sleep')
     def test_convert_pdf_to_markdown_with_retry(
             self, 
             mock_sleep,
             mock_document_converter,
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -174,7 +248,6 @@ class TestPdfConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.pdf')
         mock_validate_file_type.return_value = 'pdf'
-        mock_create_file_url.return_value = 'file:///path/to/document.pdf'
         
         # Mock success result for second attempt
         mock_success_result = Mock()
@@ -202,14 +275,40 @@ class TestPdfConverter:
         
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.pdf_converter.create_file_url')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    @patch('kb_for_prompt.molecules.conversion_retry.random.uniform')
+    @patch('time.sleep')
+    def test_convert_pdf_to_markdown_backoff_is_capped_and_jittered(
+            self,
+            mock_sleep,
+            mock_uniform,
+            mock_document_converter,
+            mock_validate_file_type,
+            mock_validate_file_path
+        ):
+        """Test that retry delays are drawn with full jitter below max_backoff."""
+        mock_validate_file_path.return_value = Path('/path/to/document.pdf')
+        mock_validate_file_type.return_value = 'pdf'
+        mock_uniform.side_effect = lambda low, high: high / 2
+        mock_document_converter.return_value.convert.side_effect = Exception("Temporary failure")
+        
+        with pytest.raises(ConversionError):
+            convert_pdf_to_markdown(
+                '/path/to/document.pdf', max_retries=3, retry_delay=1.0, max_backoff=3.0
+            )
+        
+        # Uncapped delays would be 1, 2, 4 seconds; the cap limits the last to 3
+        assert [c.args for c in mock_uniform.call_args_list] == [(0, 1.0), (0, 2.0), (0, 3.0)]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0, 1.5]
+        
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
     @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
     @patch('time.sleep')
     def test_convert_pdf_to_markdown_max_retries_exceeded(
             self,
             mock_sleep,
             mock_document_converter,
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -217,7 +316,6 @@ class TestPdfConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.pdf')
         mock_validate_file_type.return_value = 'pdf'
-        mock_create_file_url.return_value = 'file:///path/to/document.pdf'
         
         # Mock converter with repeated failures
         mock_converter = Mock()
@@ -242,12 +340,10 @@ class TestPdfConverter:
 
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
     @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
-    @patch('kb_for_prompt.molecules.pdf_converter.create_file_url')
     @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
     def test_convert_pdf_to_markdown_file_access_error(
             self,
             mock_document_converter,
-            mock_create_file_url, 
             mock_validate_file_type, 
             mock_validate_file_path
         ):
@@ -255,7 +351,6 @@ class TestPdfConverter:
         # Set up the mocks
         mock_validate_file_path.return_value = Path('/path/to/document.pdf')
         mock_validate_file_type.return_value = 'pdf'
-        mock_create_file_url.return_value = 'file:///path/to/document.pdf'
         
         # Mock converter with file access error
         mock_converter = Mock()
@@ -269,4 +364,348 @@ class TestPdfConverter:
         
         # Assertions
         assert 'File access error' in str(excinfo.value)
-        assert 'Permission denied' in str(excinfo.value.details.get('os_error', ''))
\ No newline at end of file
+        assert 'Permission denied' in str(excinfo.value.details.get('os_error', ''))
+    @patch('kb_for_prompt.molecules.pdf_converter.os.path.getsize', return_value=1024)
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_convert_pdfs_to_markdown_batch(
+            self,
+            mock_document_converter,
+            mock_validate_file_type,
+            mock_validate_file_path,
+            mock_getsize
+        ):
+        """Test that several PDFs are converted with a single convert_all call."""
+        from docling.datamodel.base_models import ConversionStatus
+        
+        paths = [Path('/path/to/a.pdf'), Path('/path/to/b.pdf')]
+        mock_validate_file_path.side_effect = paths
+        mock_validate_file_type.return_value = 'pdf'
+        
+        results = []
+        for name in ('A', 'B'):
+            mock_result = Mock()
+            mock_result.status = ConversionStatus.SUCCESS
+            mock_result.document.export_to_markdown.return_value = f'# {name}'
+            results.append(mock_result)
+        batch_sizes = []
+        
+        def convert_all(sources, raises_on_error):
+            for result in results:
+                batch_sizes.append(docling_settings.perf.doc_batch_size)
+                yield result
+        
+        mock_converter = mock_document_converter.return_value
+        mock_converter.convert_all.side_effect = convert_all
+        
+        converted = convert_pdfs_to_markdown(['/path/to/a.pdf', '/path/to/b.pdf'])
+        
+        assert converted == [('# A', '/path/to/a.pdf'), ('# B', '/path/to/b.pdf')]
+        mock_converter.convert_all.assert_called_once_with(paths, raises_on_error=False)
+        mock_converter.convert.assert_not_called()
+        # Raised while the batch runs, then restored for later conversions
+        assert batch_sizes == [2, 2]
+        assert docling_settings.perf.doc_batch_size == 1
+        assert docling_settings.perf.doc_batch_concurrency == 1
+    
+    @patch('kb_for_prompt.molecules.pdf_converter.os.path.getsize', return_value=1024)
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_convert_pdfs_to_markdown_retries_failed_items(
+            self,
+            mock_document_converter,
+            mock_validate_file_type,
+            mock_validate_file_path,
+            mock_getsize
+        ):
+        """Test that documents failing in the batch fall back to single conversion."""
+        from docling.datamodel.base_models import ConversionStatus
+        
+        mock_validate_file_path.side_effect = lambda path: Path(path)
+        mock_validate_file_type.return_value = 'pdf'
+        
+        ok_result = Mock()
+        ok_result.status = ConversionStatus.SUCCESS
+        ok_result.document.export_to_markdown.return_value = '# A'
+        failed_result = Mock()
+        failed_result.status = ConversionStatus.FAILURE
+        failed_result.document = None
+        retry_result = Mock()
+        retry_result.document.export_to_markdown.return_value = '# B'
+        
+        mock_converter = mock_document_converter.return_value
+        mock_converter.convert_all.return_value = iter([ok_result, failed_result])
+        mock_converter.convert.return_value = retry_result
+        
+        converted = convert_pdfs_to_markdown(['/path/to/a.pdf', '/path/to/b.pdf'])
+        
+        assert converted == [('# A', '/path/to/a.pdf'), ('# B', '/path/to/b.pdf')]
+        mock_converter.convert.assert_called_once_with('/path/to/b.pdf')
+    
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_convert_pdfs_to_markdown_validates_before_converting(
+            self,
+            mock_document_converter,
+            mock_validate_file_path
+        ):
+        """Test that an invalid path aborts the batch before any conversion."""
+        mock_validate_file_path.side_effect = ValidationError(
+            message="File not found", input_value='/missing.pdf', validation_type="file_path"
+        )
+        
+        with pytest.raises(ValidationError):
+            convert_pdfs_to_markdown(['/missing.pdf'])
+        
+        mock_document_converter.assert_not_called()
+
+    @patch('kb_for_prompt.molecules.pdf_converter._validate_pdf_batch', side_effect=list)
+    @patch('kb_for_prompt.molecules.pdf_converter.convert_pdf_to_markdown')
+    def test_convert_many_single_worker_runs_inline(self, mock_convert, mock_validate_batch):
+        """Test that one worker converts in-process without a pool."""
+        mock_convert.side_effect = lambda path, **kwargs: ('# Doc', str(path))
+        
+        with patch('kb_for_prompt.molecules.pdf_converter.ProcessPoolExecutor') as mock_pool:
+            results = list(convert_many(['/a.pdf', '/b.pdf'], max_workers=1))
+        
+        assert results == [('# Doc', '/a.pdf'), ('# Doc', '/b.pdf')]
+        mock_pool.assert_not_called()
+    
+    @patch('kb_for_prompt.molecules.pdf_converter._validate_pdf_batch', side_effect=list)
+    @patch('kb_for_prompt.molecules.pdf_converter.os.cpu_count', return_value=8)
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    @patch('kb_for_prompt.molecules.pdf_converter.convert_pdf_to_markdown')
+    def test_convert_many_uses_worker_pool(
+            self,
+            mock_convert,
+            mock_document_converter,
+            mock_cpu_count,
+            mock_validate_batch
+        ):
+        """Test fan-out to a pool whose workers build their own converter."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        mock_convert.side_effect = lambda path, **kwargs: (f'# {path}', path)
+        
+        # Run the pool's workers as threads; ThreadPoolExecutor takes no mp_context
+        with patch(
+            'kb_for_prompt.molecules.pdf_converter.ProcessPoolExecutor',
+            side_effect=lambda mp_context, **kwargs: ThreadPoolExecutor(**kwargs)
+        ) as mock_pool, patch.dict(os.environ):
+            results = list(convert_many(['/a.pdf', '/b.pdf'], max_workers=2, ocr=True, table_mode='accurate'))
+            omp_threads = os.environ.get("OMP_NUM_THREADS")
+        
+        assert sorted(results) == [('# /a.pdf', '/a.pdf'), ('# /b.pdf', '/b.pdf')]
+        # Workers build and use a converter with the requested pipeline settings
+        assert mock_pool.call_args.kwargs['initargs'] == (4, 'pypdfium', True, 'accurate')
+        assert mock_convert.call_args.kwargs['ocr'] is True
+        assert mock_convert.call_args.kwargs['table_mode'] == 'accurate'
+        assert mock_pool.call_args.kwargs['max_workers'] == 2
+        assert mock_pool.call_args.kwargs['mp_context'].get_start_method() == 'spawn'
+        assert omp_threads == '4'
+        mock_document_converter.assert_called_once()
+
+    @patch('kb_for_prompt.molecules.pdf_converter.convert_pdf_to_markdown')
+    def test_convert_pdf_to_markdown_stream(self, mock_convert):
+        """Test that the markdown is written to the supplied stream."""
+        import io
+        
+        mock_convert.return_value = ('# Converted Markdown', '/path/to/document.pdf')
+        out = io.StringIO()
+        
+        original_path = convert_pdf_to_markdown_stream('/path/to/document.pdf', out, max_retries=1)
+        
+        assert original_path == '/path/to/document.pdf'
+        assert out.getvalue() == '# Converted Markdown'
+        mock_convert.assert_called_once_with(
+            '/path/to/document.pdf', max_retries=1, timeout=None, retry_delay=1.0, max_backoff=30.0,
+            retry_budget=None, backend=None, ocr=False, table_mode='fast'
+        )
+
+    @patch('kb_for_prompt.molecules.pdf_converter.convert_pdf_to_markdown')
+    def test_convert_many_reports_all_invalid_inputs_first(self, mock_convert, tmp_path):
+        """Test that every invalid input is reported before any conversion runs."""
+        valid = tmp_path / "valid.pdf"
+        valid.write_bytes(b"%PDF-1.4")
+        empty = tmp_path / "empty.pdf"
+        empty.touch()
+        missing = tmp_path / "missing.pdf"
+        
+        with pytest.raises(ValidationError) as excinfo:
+            list(convert_many([valid, empty, missing], max_workers=1))
+        
+        errors = excinfo.value.details["errors"]
+        assert [e["input"] for e in errors] == [str(empty), str(missing)]
+        assert errors[0]["validation_type"] == "file_empty"
+        assert "2 of 3 inputs failed validation" in str(excinfo.value)
+        mock_convert.assert_not_called()
+
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_pypdfium_backend_by_default(self, mock_document_converter):
+        """Test that the shared converter uses the pypdfium PDF backend by default."""
+        from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+        from docling.datamodel.base_models import InputFormat
+        from kb_for_prompt.molecules.pdf_converter import _get_converter
+        
+        _get_converter()
+        
+        format_options = mock_document_converter.call_args.kwargs['format_options']
+        assert format_options[InputFormat.PDF].backend is PyPdfiumDocumentBackend
+    
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_backend_from_environment(self, mock_document_converter, monkeypatch):
+        """Test that KBFP_PDF_BACKEND selects docling's own parser."""
+        from kb_for_prompt.molecules.pdf_converter import _get_converter
+        
+        from docling.datamodel.base_models import InputFormat
+        
+        monkeypatch.setenv("KBFP_PDF_BACKEND", "docling")
+        
+        assert _get_converter() is _get_converter("docling")
+        mock_document_converter.assert_called_once()
+        format_options = mock_document_converter.call_args.kwargs['format_options']
+        assert format_options[InputFormat.PDF].backend.__name__ != 'PyPdfiumDocumentBackend'
+    
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_unsupported_backend(
+            self,
+            mock_document_converter,
+            mock_validate_file_type,
+            mock_validate_file_path
+        ):
+        """Test that an unknown backend name is rejected before converting."""
+        mock_validate_file_path.return_value = Path('/path/to/document.pdf')
+        mock_validate_file_type.return_value = 'pdf'
+        
+        with pytest.raises(ValidationError) as excinfo:
+            convert_pdf_to_markdown('/path/to/document.pdf', backend='pdfminer')
+        
+        assert excinfo.value.validation_type == 'pdf_backend'
+        mock_document_converter.assert_not_called()
+
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_fast_pipeline_by_default(self, mock_document_converter):
+        """Test that OCR is off and tables use TableFormer's fast mode by default."""
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.pipeline_options import TableFormerMode
+        from kb_for_prompt.molecules.pdf_converter import _get_converter
+        
+        _get_converter()
+        
+        format_options = mock_document_converter.call_args.kwargs['format_options']
+        pipeline_options = format_options[InputFormat.PDF].pipeline_options
+        assert pipeline_options.do_ocr is False
+        assert pipeline_options.do_table_structure is True
+        assert pipeline_options.table_structure_options.mode == TableFormerMode.FAST
+    
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_ocr_and_accurate_tables_opt_in(
+            self,
+            mock_document_converter,
+            mock_validate_file_type,
+            mock_validate_file_path
+        ):
+        """Test that ocr and table_mode build a separate, matching converter."""
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.pipeline_options import TableFormerMode
+        
+        mock_validate_file_path.return_value = Path('/path/to/scan.pdf')
+        mock_validate_file_type.return_value = 'pdf'
+        mock_result = Mock()
+        mock_result.document.export_to_markdown.return_value = '# Scanned'
+        mock_document_converter.return_value.convert.return_value = mock_result
+        
+        convert_pdf_to_markdown('/path/to/scan.pdf')
+        convert_pdf_to_markdown('/path/to/scan.pdf', ocr=True, table_mode='accurate')
+        
+        assert mock_document_converter.call_count == 2
+        format_options = mock_document_converter.call_args.kwargs['format_options']
+        pipeline_options = format_options[InputFormat.PDF].pipeline_options
+        assert pipeline_options.do_ocr is True
+        assert pipeline_options.table_structure_options.mode == TableFormerMode.ACCURATE
+
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_conversion_cache_reuses_markdown(
+            self, mock_document_converter, tmp_path, monkeypatch
+        ):
+        """Test that an unchanged PDF is converted once when the cache is enabled."""
+        monkeypatch.setenv("KBFP_CACHE_DIR", str(tmp_path / "cache"))
+        document = tmp_path / "document.pdf"
+        document.write_bytes(b"%PDF-1.4 content")
+        
+        mock_result = Mock()
+        mock_result.document.export_to_markdown.return_value = '# Converted Markdown'
+        mock_document_converter.return_value.convert.return_value = mock_result
+        
+        first = convert_pdf_to_markdown(document)
+        second = convert_pdf_to_markdown(document)
+        
+        assert first == second == ('# Converted Markdown', str(document))
+        assert mock_document_converter.return_value.convert.call_count == 1
+
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_convert_pdfs_to_markdown_batch_uses_cache(
+            self, mock_document_converter, tmp_path, monkeypatch
+        ):
+        """Test that only PDFs without cached markdown are sent to the batch."""
+        from docling.datamodel.base_models import ConversionStatus
+        
+        monkeypatch.setenv("KBFP_CACHE_DIR", str(tmp_path / "cache"))
+        first = tmp_path / "first.pdf"
+        first.write_bytes(b"%PDF-1.4 first")
+        second = tmp_path / "second.pdf"
+        second.write_bytes(b"%PDF-1.4 second")
+        
+        def convert_all(sources, raises_on_error):
+            for source in sources:
+                mock_result = Mock()
+                mock_result.status = ConversionStatus.SUCCESS
+                mock_result.document.export_to_markdown.return_value = f'# {source.stem}'
+                yield mock_result
+        
+        mock_converter = mock_document_converter.return_value
+        mock_converter.convert_all.side_effect = convert_all
+        
+        convert_pdfs_to_markdown([first])
+        converted = convert_pdfs_to_markdown([first, second])
+        
+        assert converted == [('# first', str(first)), ('# second', str(second))]
+        assert mock_converter.convert_all.call_count == 2
+        assert mock_converter.convert_all.call_args.args[0] == [second]
+        mock_converter.convert.assert_not_called()
+
+    @patch('kb_for_prompt.molecules.pdf_converter.os.path.getsize', return_value=1024)
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_path')
+    @patch('kb_for_prompt.molecules.pdf_converter.validate_file_type')
+    @patch('kb_for_prompt.molecules.pdf_converter.DocumentConverter')
+    def test_convert_pdfs_to_markdown_ocr_and_accurate_tables_opt_in(
+            self,
+            mock_document_converter,
+            mock_validate_file_type,
+            mock_validate_file_path,
+            mock_getsize
+        ):
+        """Test that the batch converter is built with the requested pipeline settings."""
+        from docling.datamodel.base_models import ConversionStatus, InputFormat
+        from docling.datamodel.pipeline_options import TableFormerMode
+        
+        mock_validate_file_path.side_effect = lambda path: Path(path)
+        mock_validate_file_type.return_value = 'pdf'
+        mock_result = Mock()
+        mock_result.status = ConversionStatus.SUCCESS
+        mock_result.document.export_to_markdown.return_value = '# Scanned'
+        mock_document_converter.return_value.convert_all.return_value = iter([mock_result])
+        
+        converted = convert_pdfs_to_markdown(['/path/to/scan.pdf'], ocr=True, table_mode='accurate')
+        
+        assert converted == [('# Scanned', '/path/to/scan.pdf')]
+        format_options = mock_document_converter.call_args.kwargs['format_options']
+        pipeline_options = format_options[InputFormat.PDF].pipeline_options
+        assert pipeline_options.do_ocr is True
+        assert pipeline_options.table_structure_options.mode == TableFormerMode.ACCURATE
@@ -112,4 +112,47 @@ def test_readme_exists():
         assert "# KB for Prompt" in content, "Title missing in README.md"
         assert "Installation" in content, "Installation section missing in README.md"
         assert "Usage" in content, "Usage section missing in README.md"
-        assert "Project Structure" in content, "Project Structure section missing in README.md"
\ No newline at end of file
+        assert "Project Structure" in content, "Project Structure section missing in README.md"
+
+def test_molecules_import_does_not_load_docling():
+    """Test that importing the converters defers docling and requests to first use."""
+    import subprocess
+    
+    base_dir = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = (
+        "import sys, kb_for_prompt.molecules; "
+        "print(sorted(m for m in ('docling', 'requests') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=base_dir.parent, capture_output=True, text=True, check=True
+    )
+    
+    assert result.stdout.strip() == "[]"
+
+def test_templates_import_does_not_load_pandas():
+    """Test that importing the display templates does not pull in pandas."""
+    import subprocess
+    
+    base_dir = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = "import sys, kb_for_prompt.templates; print('pandas' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=base_dir.parent, capture_output=True, text=True, check=True
+    )
+    
+    assert result.stdout.strip() == "False"
+
+def test_condenser_import_does_not_configure_logging():
+    """Test that importing the condenser leaves the root logger unconfigured."""
+    import subprocess
+    
+    base_dir = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = "import logging, kb_for_prompt.organisms.condenser; print(logging.root.handlers)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=base_dir.parent, capture_output=True, text=True, check=True,
+        env={**os.environ, "LITELLM_LOCAL_MODEL_COST_MAP": "True"}
+    )
+    
+    assert result.stdout.strip() == "[]"
@@ -3,12 +3,15 @@ Tests for type_detector.py
 """
 
 import pytest
+import zipfile
 from pathlib import Path
 from unittest.mock import patch
+from urllib.parse import urlparse
 
 from kb_for_prompt.atoms.type_detector import (
     detect_input_type,
     detect_file_type,
+    detect_file_type_by_content,
     get_supported_extensions,
     is_url,
     is_file_path,
@@ -56,6 +59,14 @@ class TestDetectInputTypeFunction:
         """Test with Windows file path."""
         assert detect_input_type("C:\\path\\to\\file.txt") == "file"
         assert detect_input_type("C:/path/to/file.txt") == "file"
+    
+    def test_repeated_input_is_cached(self):
+        """Test that repeated inputs are classified without parsing again."""
+        with patch("kb_for_prompt.atoms.type_detector.urlparse", wraps=urlparse) as mock_urlparse:
+            assert detect_input_type("https://cached.example.com/page") == "url"
+            assert is_url("https://cached.example.com/page")
+            assert not is_file_path("https://cached.example.com/page")
+            assert mock_urlparse.call_count == 1
 
 
 class TestDetectFileTypeFunction:
@@ -94,6 +105,49 @@ class TestDetectFileTypeFunction:
         assert detect_file_type(Path("document")) is None
 
 
+class TestDetectFileTypeByContentFunction:
+    """Tests for detect_file_type_by_content function."""
+    
+    def test_pdf_content(self, tmp_path):
+        """Test with PDF magic bytes."""
+        file_path = tmp_path / "report.bin"
+        file_path.write_bytes(b"%PDF-1.7\n%binary")
+        assert detect_file_type_by_content(file_path) == "pdf"
+    
+    def test_doc_content(self, tmp_path):
+        """Test with OLE2 compound file magic bytes."""
+        file_path = tmp_path / "legacy.bin"
+        file_path.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 32)
+        assert detect_file_type_by_content(file_path) == "doc"
+    
+    def test_docx_content(self, tmp_path):
+        """Test with an Office Open XML package."""
+        file_path = tmp_path / "document.bin"
+        with zipfile.ZipFile(file_path, "w") as archive:
+            archive.writestr("[Content_Types].xml", "<Types/>")
+            archive.writestr("word/document.xml", "<document/>")
+        assert detect_file_type_by_content(file_path) == "docx"
+    
+    def test_zip_without_document_part(self, tmp_path):
+        """Test with a zip that is not a Word document."""
+        file_path = tmp_path / "archive.docx"
+        with zipfile.ZipFile(file_path, "w") as archive:
+            archive.writestr("readme.txt", "hello")
+        assert detect_file_type_by_content(file_path) is None
+    
+    def test_mislabeled_file(self, tmp_path):
+        """Test that the extension is ignored in favor of the content."""
+        file_path = tmp_path / "report.pdf"
+        file_path.write_text("just some text")
+        assert detect_file_type_by_content(file_path) is None
+        assert detect_file_type(file_path) == "pdf"
+        assert detect_file_type(file_path, strict=True) is None
+    
+    def test_missing_file(self, tmp_path):
+        """Test with a file that does not exist."""
+        assert detect_file_type_by_content(tmp_path / "missing.pdf") is None
+
+
 class TestGetSupportedExtensionsFunction:
     """Tests for get_supported_extensions function."""
     
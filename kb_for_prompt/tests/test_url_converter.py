@@ -38,10 +38,23 @@ from kb_for_prompt.atoms.error_utils import ValidationError
 
 class TestUrlConverter:
     """Test cases for the URL converter module."""
+
+    @pytest.fixture(autouse=True)
+    def reset_shared_converter(self, monkeypatch):
+        """Ensure each test builds its converter from the patched DocumentConverter."""
+        monkeypatch.setattr("kb_for_prompt.molecules.url_converter._converter", None)
+    
+    @pytest.fixture(autouse=True)
+    def mock_fetch_document(self):
+        """Keep tests off the network by stubbing the pooled HTTP fetch."""
+        with patch('kb_for_prompt.molecules.url_converter._fetch_document') as mock_fetch:
+            yield mock_fetch
     
     @patch('kb_for_prompt.molecules.url_converter.DocumentConverter')
     @patch('kb_for_prompt.molecules.url_converter.validate_url')
-    def test_convert_url_to_markdown_success(self, mock_validate_url, mock_converter_cls):
+    def test_convert_url_to_markdown_success(
+            self, mock_validate_url, mock_converter_cls, mock_fetch_document
+        ):
         """Test successful URL to markdown conversion."""
         # Setup mocks
         mock_validate_url.return_value = True
@@ -63,10 +76,26 @@ class TestUrlConverter:
         # Assertions
         mock_validate_url.assert_called_once_with(url)
         mock_converter_cls.assert_called_once()
-        mock_converter.convert.assert_called_once_with(url)
+        mock_fetch_document.assert_called_once_with(url, 30)
+        mock_converter.convert.assert_called_once_with(mock_fetch_document.return_value)
         assert content == "# Sample Markdown\n\nThis is a test."
         assert returned_url == url
     
+    @patch('kb_for_prompt.molecules.url_converter.DocumentConverter')
+    @patch('kb_for_prompt.molecules.url_converter.validate_url')
+    def test_fetch_timeout_clipped_to_retry_budget(
+            self, mock_validate_url, mock_converter_cls, mock_fetch_document
+        ):
+        """Test that the HTTP fetch never outlasts the retry budget."""
+        mock_result = MagicMock()
+        mock_result.document.export_to_markdown.return_value = "# Sample Markdown"
+        mock_converter_cls.return_value.convert.return_value = mock_result
+        
+        convert_url_to_markdown("https://example.com", timeout=30, retry_budget=5)
+        
+        fetch_timeout = mock_fetch_document.call_args.args[1]
+        assert 0 < fetch_timeout <= 5
+    
     @patch('kb_for_prompt.molecules.url_converter.DocumentConverter')
     @patch('kb_for_prompt.molecules.url_converter.validate_url')
     def test_invalid_url(self, mock_validate_url, mock_converter_cls):
@@ -136,7 +165,7 @@ class TestUrlConverter:
     
     @patch('kb_for_prompt.molecules.url_converter.DocumentConverter')
     @patch('kb_for_prompt.molecules.url_converter.validate_url')
-    @patch('kb_for_prompt.molecules.url_converter.time.sleep')
+    @patch('kb_for_prompt.molecules.conversion_retry.time.sleep')
     def test_retry_mechanism_success(self, mock_sleep, mock_validate_url, mock_converter_cls):
         """Test retry mechanism with eventual success."""
         # Setup mocks
@@ -175,7 +204,7 @@ class TestUrlConverter:
     
     @patch('kb_for_prompt.molecules.url_converter.DocumentConverter')
     @patch('kb_for_prompt.molecules.url_converter.validate_url')
-    @patch('kb_for_prompt.molecules.url_converter.time.sleep')
+    @patch('kb_for_prompt.molecules.conversion_retry.time.sleep')
     def test_retry_mechanism_max_retries_exhausted(self, mock_sleep, mock_validate_url, mock_converter_cls):
         """Test retry mechanism with all retries exhausted."""
         # Setup mocks
@@ -197,6 +226,26 @@ class TestUrlConverter:
         assert "retries" in exc_info.value.details
         assert exc_info.value.details["retries"] == 2
     
+    @patch('kb_for_prompt.molecules.url_converter.DocumentConverter')
+    @patch('kb_for_prompt.molecules.url_converter.validate_url')
+    @patch('kb_for_prompt.molecules.conversion_retry.time.sleep')
+    def test_permanent_http_error_not_retried(
+            self, mock_sleep, mock_validate_url, mock_converter_cls, mock_fetch_document
+        ):
+        """Test that a 404 response fails immediately without retries."""
+        mock_validate_url.return_value = True
+        mock_fetch_document.side_effect = requests.HTTPError(
+            "404 Client Error", response=MagicMock(status_code=404)
+        )
+        
+        with pytest.raises(ConversionError) as exc_info:
+            convert_url_to_markdown("https://example.com/missing", max_retries=3)
+        
+        assert mock_fetch_document.call_count == 1
+        mock_sleep.assert_not_called()
+        assert exc_info.value.details["status_code"] == 404
+        assert exc_info.value.details["retries"] == 0
+    
     @patch('kb_for_prompt.molecules.url_converter.DocumentConverter')
     @patch('kb_for_prompt.molecules.url_converter.validate_url')
     def test_unexpected_exception(self, mock_validate_url, mock_converter_cls):
@@ -215,4 +264,55 @@ class TestUrlConverter:
         
         # Assertions
         assert "Unexpected conversion error" in str(exc_info.value)
-        assert exc_info.value.details["error_type"] == "ValueError"
\ No newline at end of file
+        assert exc_info.value.details["error_type"] == "ValueError"
+
+class TestUrlFetching:
+    """Test cases for the pooled HTTP fetch used by the URL converter."""
+
+    @pytest.fixture(autouse=True)
+    def reset_shared_session(self, monkeypatch):
+        """Ensure each test builds a fresh shared session."""
+        monkeypatch.setattr("kb_for_prompt.molecules.url_converter._session", None)
+    
+    def test_session_is_shared_and_pooled(self):
+        """Test that one session with a pooled adapter is reused."""
+        from kb_for_prompt.molecules.url_converter import _get_session
+        
+        session = _get_session()
+        
+        assert _get_session() is session
+        adapter = session.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 100
+        assert adapter.max_retries.total == 0
+    
+    @patch('kb_for_prompt.molecules.url_converter._get_session')
+    def test_fetch_document_builds_stream(self, mock_get_session):
+        """Test that fetched content is wrapped in a named DocumentStream."""
+        from kb_for_prompt.molecules.url_converter import _fetch_document
+        
+        mock_response = MagicMock()
+        mock_response.url = "https://example.com/docs/"
+        mock_response.headers = {"Content-Type": "text/html; charset=utf-8"}
+        mock_response.content = b"<html><body>Hello</body></html>"
+        mock_get_session.return_value.get.return_value = mock_response
+        
+        stream = _fetch_document("https://example.com/docs/", 10)
+        
+        mock_get_session.return_value.get.assert_called_once_with(
+            "https://example.com/docs/", timeout=10
+        )
+        mock_response.raise_for_status.assert_called_once()
+        assert stream.name == "docs.html"
+        assert stream.stream.read() == b"<html><body>Hello</body></html>"
+    
+    @patch('kb_for_prompt.molecules.url_converter._get_session')
+    def test_fetch_document_raises_on_http_error(self, mock_get_session):
+        """Test that HTTP error statuses surface as RequestException."""
+        from kb_for_prompt.molecules.url_converter import _fetch_document
+        
+        mock_response = MagicMock()
+        mock_response.raise_for_status.side_effect = requests.HTTPError("503 Server Error")
+        mock_get_session.return_value.get.return_value = mock_response
+        
+        with pytest.raises(requests.RequestException):
+            _fetch_document("https://example.com", 10)